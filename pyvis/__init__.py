@@ -1,2 +1,3 @@
 from . import network
-from ._version import __version__
\ No newline at end of file
+from ._version import __version__
+from .batch import render_many
@@ -0,0 +1,643 @@
+# graph algorithms that operate on pyvis node and edge lists
+import heapq
+import random
+from collections import defaultdict, deque
+
+
+def edge_weight(edge, weight=None):
+    """
+    Return the numeric weight of an edge dictionary.
+
+    When `weight` names an attribute it is used directly, otherwise the
+    first of ``value``, ``width`` and ``weight`` present on the edge is
+    used. Edges without any weight count as 1.
+
+    :param edge: the edge options dictionary
+    :param weight: optional name of the attribute holding the weight
+
+    :type edge: dict
+    :type weight: str
+    """
+    if weight is not None:
+        return edge.get(weight, 1)
+    for key in ("value", "width", "weight"):
+        if key in edge:
+            return edge[key]
+    return 1
+
+
+class AdjacencyIndex(object):
+    """
+    Integer based adjacency structure built from the node and edge lists of
+    a network in a single O(N + E) pass. Node ids are mapped to positions
+    so the algorithms in this module can work on plain lists instead of
+    repeatedly scanning the edge list.
+
+    The index is always the undirected view of the graph: every edge is
+    recorded on both of its endpoints. Self loops are recorded once.
+    """
+
+    def __init__(self, nodes, edges, weight=None):
+        self.ids = [n["id"] for n in nodes]
+        self.position = {n_id: i for i, n_id in enumerate(self.ids)}
+        self.neighbors = [[] for _ in self.ids]
+        self.weights = [[] for _ in self.ids]
+        # position of the edge in the original edge list, per neighbor entry
+        self.edge_ids = [[] for _ in self.ids]
+        for k, e in enumerate(edges):
+            u = self.position[e["from"]]
+            v = self.position[e["to"]]
+            w = edge_weight(e, weight)
+            self.neighbors[u].append(v)
+            self.weights[u].append(w)
+            self.edge_ids[u].append(k)
+            if u != v:
+                self.neighbors[v].append(u)
+                self.weights[v].append(w)
+                self.edge_ids[v].append(k)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def degree(self, i):
+        """
+        Number of edges incident to the node at position `i`.
+        """
+        return len(self.neighbors[i])
+
+    def strength(self, i):
+        """
+        Sum of the weights of the edges incident to the node at position `i`.
+        """
+        return sum(self.weights[i])
+
+
+def label_propagation(index, max_iter=100, seed=None):
+    """
+    Detect communities by asynchronous label propagation. Every node starts
+    in its own community and repeatedly adopts the label carrying the most
+    edge weight among its neighbors until no label changes. Each sweep is
+    O(E).
+
+    :param index: the adjacency index of the graph
+    :param max_iter: upper bound on the number of sweeps
+    :param seed: seed for the random visiting order and tie breaking
+
+    :type index: AdjacencyIndex
+    :type max_iter: int
+    :type seed: int
+
+    :returns: list with the community label of every node position
+    """
+    rng = random.Random(seed)
+    labels = list(range(len(index)))
+    order = list(range(len(index)))
+    for _ in range(max_iter):
+        rng.shuffle(order)
+        changed = 0
+        for u in order:
+            if not index.neighbors[u]:
+                continue
+            counts = defaultdict(float)
+            for v, w in zip(index.neighbors[u], index.weights[u]):
+                counts[labels[v]] += w
+            best = max(counts.values())
+            candidates = [label for label, w in counts.items() if w == best]
+            if labels[u] in candidates:
+                continue
+            labels[u] = rng.choice(candidates)
+            changed += 1
+        if not changed:
+            break
+    return _relabel(labels)
+
+
+def louvain(index, resolution=1.0, max_passes=10, seed=None):
+    """
+    Detect communities with the Louvain modularity optimisation method.
+    Nodes are greedily moved into the neighboring community with the best
+    modularity gain, then every community is collapsed into a single node
+    and the process repeats on the smaller graph until nothing moves.
+
+    :param index: the adjacency index of the graph
+    :param resolution: values above 1 favour smaller communities
+    :param max_passes: upper bound on the number of aggregation levels
+    :param seed: seed for the node visiting order
+
+    :type index: AdjacencyIndex
+    :type resolution: float
+    :type max_passes: int
+    :type seed: int
+
+    :returns: list with the community label of every node position
+    """
+    rng = random.Random(seed)
+    # adjacency of the current level, self entries hold the internal weight
+    adj = [defaultdict(float) for _ in range(len(index))]
+    for u in range(len(index)):
+        for v, w in zip(index.neighbors[u], index.weights[u]):
+            if u != v:
+                adj[u][v] += w
+    membership = list(range(len(index)))
+
+    for _ in range(max_passes):
+        n = len(adj)
+        strength = [sum(a.values()) for a in adj]
+        total = float(sum(strength))
+        if total == 0:
+            break
+        community = list(range(n))
+        community_strength = strength[:]
+        order = list(range(n))
+        rng.shuffle(order)
+        moved = False
+        improved = True
+        sweeps = 0
+        while improved and sweeps < 100:
+            improved = False
+            sweeps += 1
+            for u in order:
+                current = community[u]
+                k = strength[u]
+                links = defaultdict(float)
+                for v, w in adj[u].items():
+                    if v != u:
+                        links[community[v]] += w
+                community_strength[current] -= k
+                best = current
+                best_gain = links.get(current, 0.0) - \
+                    resolution * community_strength[current] * k / total
+                for c, w in links.items():
+                    gain = w - resolution * community_strength[c] * k / total
+                    if gain > best_gain:
+                        best, best_gain = c, gain
+                community_strength[best] += k
+                if best != current:
+                    community[u] = best
+                    improved = True
+                    moved = True
+        if not moved:
+            break
+        community = _relabel(community)
+        membership = [community[c] for c in membership]
+        collapsed = [defaultdict(float) for _ in range(max(community) + 1)]
+        for u in range(n):
+            for v, w in adj[u].items():
+                collapsed[community[u]][community[v]] += w
+        adj = collapsed
+    return _relabel(membership)
+
+
+AGGREGATES = ("count", "sum", "min", "max")
+
+
+def edge_groups(edges, directed=False, weight=None):
+    """
+    Group parallel edges with a hashed group-by over their endpoints.
+    Endpoint order only matters for directed graphs.
+
+    :returns: dict mapping the endpoints to [first edge, (count, sum, min,
+              max)] in order of first appearance
+    """
+    groups = {}
+    for e in edges:
+        if directed:
+            key = (e["from"], e["to"])
+        else:
+            key = frozenset((e["from"], e["to"]))
+        w = edge_weight(e, weight)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [e, (1, w, w, w)]
+        else:
+            group[1] = combine_stats(group[1], (1, w, w, w))
+    return groups
+
+
+def combine_stats(a, b):
+    """
+    The (count, sum, min, max) of two groups of edges taken together.
+    """
+    return (a[0] + b[0], a[1] + b[1], min(a[2], b[2]), max(a[3], b[3]))
+
+
+def aggregate_edge(first, stats, weight=None, aggregate="sum",
+                   attribute="value", title=True):
+    """
+    The edge standing for a group of parallel edges. It keeps the
+    properties of `first`, with the weight attributes replaced by the
+    requested aggregate of `stats` stored under `attribute`, and a title
+    summarizing count, sum, min and max.
+
+    :param first: the first edge of the group
+    :param stats: (count, sum, min, max) of the group
+    """
+    e = dict(first)
+    for key in ([weight] if weight is not None else ["value", "width", "weight"]):
+        e.pop(key, None)
+    e[attribute] = aggregate_value(stats, aggregate)
+    if title:
+        e["title"] = aggregate_title(stats)
+    return e
+
+
+def aggregate_value(stats, aggregate):
+    return dict(zip(AGGREGATES, stats))[aggregate]
+
+
+def aggregate_title(stats):
+    count, total, low, high = stats
+    return "%d edge%s, sum %s, min %s, max %s" % (
+        count, "" if count == 1 else "s", total, low, high)
+
+
+def aggregate_edges(edges, directed=False, weight=None, aggregate="sum",
+                    attribute="value", title=True):
+    """
+    Collapse parallel edges into a single edge with a hashed group-by over
+    their endpoints. Endpoint order only matters for directed graphs.
+
+    The merged edge keeps the properties of the first edge of its group.
+    The weight attributes are replaced by the requested aggregate stored
+    under `attribute`, and the title summarizes count, sum, min and max.
+
+    :param edges: edge dictionaries, possibly holding parallel edges
+    :param directed: whether (a, b) and (b, a) are different edges
+    :param weight: name of the attribute holding the edge weight.
+                   Defaults to the first of value, width or weight.
+    :param aggregate: one of 'count', 'sum', 'min' or 'max'
+    :param attribute: the edge attribute receiving the aggregate, usually
+               'value' or 'width'
+    :param title: whether to write the summary into the edge title
+
+    :returns: list of merged edge dictionaries in order of first appearance
+    """
+    assert aggregate in AGGREGATES, "aggregate not in %s" % list(AGGREGATES)
+    return [aggregate_edge(first, stats, weight, aggregate, attribute, title)
+            for first, stats in edge_groups(edges, directed, weight).values()]
+
+
+def core_numbers(index):
+    """
+    Compute the core number of every node with the O(E) bucket algorithm
+    of Batagelj and Zaversnik. The core number of a node is the largest
+    `k` such that the node belongs to a subgraph in which every node has
+    degree of at least `k`.
+
+    :param index: the adjacency index of the graph
+    :type index: AdjacencyIndex
+
+    :returns: list with the core number of every node position
+    """
+    n = len(index)
+    degree = [index.degree(i) for i in range(n)]
+    max_degree = max(degree) if degree else 0
+    # nodes sorted by degree through counting sort, with bucket boundaries
+    bin_start = [0] * (max_degree + 2)
+    for d in degree:
+        bin_start[d + 1] += 1
+    for d in range(1, max_degree + 2):
+        bin_start[d] += bin_start[d - 1]
+    order = [0] * n
+    place = [0] * n
+    fill = bin_start[:]
+    for i, d in enumerate(degree):
+        place[i] = fill[d]
+        order[place[i]] = i
+        fill[d] += 1
+    for i in range(n):
+        u = order[i]
+        for v in index.neighbors[u]:
+            if degree[v] > degree[u]:
+                # move v to the front of its bucket and shrink its degree
+                dv = degree[v]
+                front = bin_start[dv]
+                w = order[front]
+                if w != v:
+                    order[place[v]], order[front] = w, v
+                    place[w], place[v] = place[v], front
+                bin_start[dv] += 1
+                degree[v] -= 1
+    return degree
+
+
+def k_core(index, k):
+    """
+    Positions of the nodes that belong to the `k`-core of the graph.
+    """
+    return [i for i, core in enumerate(core_numbers(index)) if core >= k]
+
+
+def top_k(index, k, by="degree"):
+    """
+    Positions of the `k` nodes with the highest degree, or with the highest
+    summed edge weight when `by` is 'weight'.
+    """
+    assert by in ("degree", "weight"), "by not in ['degree', 'weight']"
+    score = index.degree if by == "degree" else index.strength
+    return heapq.nlargest(k, range(len(index)), key=score)
+
+
+def neighborhood(index, seeds, hops=1, limit=None):
+    """
+    Positions of the nodes within `hops` edges of the `seeds` positions in
+    breadth first order, seeds first, stopping after `limit` nodes.
+    """
+    seen = set()
+    order = []
+    frontier = []
+    for i in seeds:
+        if limit is not None and len(order) >= limit:
+            return order
+        if i not in seen:
+            seen.add(i)
+            order.append(i)
+            frontier.append(i)
+    for _ in range(hops):
+        following = []
+        for u in frontier:
+            for v in index.neighbors[u]:
+                if v not in seen:
+                    if limit is not None and len(order) >= limit:
+                        return order
+                    seen.add(v)
+                    order.append(v)
+                    following.append(v)
+        frontier = following
+    return order
+
+
+def random_walk_sample(index, budget, restart=0.15, seed=None):
+    """
+    Sample up to `budget` node positions with a random walk that returns
+    to its start node with probability `restart` at each step and jumps to
+    a fresh random node whenever it stops discovering new nodes.
+    """
+    rng = random.Random(seed)
+    n = len(index)
+    budget = min(budget, n)
+    seen = set()
+    sample = []
+    start = current = rng.randrange(n) if n else None
+    stale = 0
+    while len(sample) < budget:
+        if current not in seen:
+            seen.add(current)
+            sample.append(current)
+            stale = 0
+        else:
+            stale += 1
+        neighbors = index.neighbors[current]
+        if stale > 100 or not neighbors:
+            start = current = rng.randrange(n)
+        elif rng.random() < restart:
+            current = start
+        else:
+            current = rng.choice(neighbors)
+    return sample
+
+
+def forest_fire_sample(index, budget, forward=0.7, seed=None):
+    """
+    Sample up to `budget` node positions with forest fire sampling. From a
+    random seed node the fire burns a geometrically distributed number of
+    unburnt neighbors, with mean forward / (1 - forward), and spreads from
+    each of them. A new seed is drawn whenever the fire dies out.
+    """
+    rng = random.Random(seed)
+    n = len(index)
+    budget = min(budget, n)
+    burnt = set()
+    sample = []
+    while len(sample) < budget:
+        seed_node = rng.randrange(n)
+        if seed_node in burnt:
+            continue
+        burnt.add(seed_node)
+        sample.append(seed_node)
+        queue = deque([seed_node])
+        while queue and len(sample) < budget:
+            u = queue.popleft()
+            spread = 0
+            while rng.random() < forward:
+                spread += 1
+            candidates = [v for v in set(index.neighbors[u]) if v not in burnt]
+            rng.shuffle(candidates)
+            for v in candidates[:spread]:
+                if len(sample) >= budget:
+                    break
+                burnt.add(v)
+                sample.append(v)
+                queue.append(v)
+    return sample
+
+
+SAMPLING_METHODS = {
+    "random_walk": random_walk_sample,
+    "forest_fire": forest_fire_sample,
+}
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("edge sparsification requires numpy, "
+                          "install it with 'pip install numpy'")
+    return numpy
+
+
+def edge_arrays(nodes, edges, weight=None):
+    """
+    Convert the edge list into numpy arrays of source positions, target
+    positions and weights, indexed like `edges`.
+
+    :returns: tuple of (sources, targets, weights, number of nodes)
+    """
+    np = _numpy()
+    position = {n["id"]: i for i, n in enumerate(nodes)}
+    count = len(edges)
+    sources = np.fromiter((position[e["from"]] for e in edges), np.int64, count)
+    targets = np.fromiter((position[e["to"]] for e in edges), np.int64, count)
+    weights = np.fromiter((edge_weight(e, weight) for e in edges),
+                          np.float64, count)
+    return sources, targets, weights, len(nodes)
+
+
+def top_k_edges(sources, targets, weights, n, k=5):
+    """
+    Mask of the edges that are among the `k` heaviest edges of at least one
+    of their endpoints.
+    """
+    np = _numpy()
+    endpoints = np.concatenate([sources, targets])
+    edge_ids = np.tile(np.arange(len(sources)), 2)
+    order = np.lexsort((-np.tile(weights, 2), endpoints))
+    endpoints = endpoints[order]
+    # rank of every incidence inside the group of its endpoint
+    starts = np.searchsorted(endpoints, endpoints, side="left")
+    rank = np.arange(len(endpoints)) - starts
+    keep = np.zeros(len(sources), dtype=bool)
+    keep[edge_ids[order][rank < k]] = True
+    return keep
+
+
+def disparity_filter(sources, targets, weights, n, alpha=0.05):
+    """
+    Mask of the edges in the disparity filter backbone of Serrano, Boguna
+    and Vespignani (2009). An edge is kept when its share of the strength
+    of at least one endpoint is significant at level `alpha` against a
+    uniform null model, i.e. when (1 - w / s) ** (k - 1) < alpha. Edges of
+    nodes with a single edge are always kept so no node becomes isolated.
+    """
+    np = _numpy()
+    strength = np.bincount(sources, weights, n) + \
+        np.bincount(targets, weights, n)
+    degree = np.bincount(sources, minlength=n) + \
+        np.bincount(targets, minlength=n)
+    keep = np.zeros(len(sources), dtype=bool)
+    for end in (sources, targets):
+        k = degree[end]
+        share = np.divide(weights, strength[end],
+                          out=np.zeros_like(weights), where=strength[end] > 0)
+        significance = np.power(1.0 - share, k - 1)
+        keep |= (significance < alpha) | (k <= 1)
+    return keep
+
+
+def maximum_spanning_forest(sources, targets, weights, n, k=0):
+    """
+    Mask of the edges of a maximum spanning forest, found with Kruskal's
+    algorithm, plus the `k` heaviest edges of every node.
+    """
+    np = _numpy()
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    keep = np.zeros(len(sources), dtype=bool)
+    for e in np.argsort(-weights, kind="stable").tolist():
+        root_u = find(int(sources[e]))
+        root_v = find(int(targets[e]))
+        if root_u != root_v:
+            parent[root_u] = root_v
+            keep[e] = True
+    if k:
+        keep |= top_k_edges(sources, targets, weights, n, k)
+    return keep
+
+
+SPARSIFY_METHODS = {
+    "top_k": top_k_edges,
+    "disparity": disparity_filter,
+    "spanning_forest": maximum_spanning_forest,
+}
+
+
+COMMUNITY_METHODS = {
+    "label_propagation": label_propagation,
+    "louvain": louvain,
+}
+
+
+def _relabel(labels):
+    """
+    Renumber arbitrary community labels to consecutive integers in order
+    of first appearance.
+    """
+    mapping = {}
+    return [mapping.setdefault(label, len(mapping)) for label in labels]
+
+
+def cluster_graph(nodes, edges, labels, min_size=2, prefix="pyvis:cluster:",
+                  directed=False):
+    """
+    Collapse every community into a single meta node.
+
+    Communities with fewer than `min_size` members keep their nodes as they
+    are. Edges between two collapsed groups are aggregated into one meta
+    edge whose ``value`` is the summed weight and whose ``title`` reports
+    how many edges it stands for. In a directed network edges in opposite
+    directions are aggregated separately and keep their ``arrows``.
+
+    :param nodes: node dictionaries of the network
+    :param edges: edge dictionaries of the network
+    :param labels: community label for every node, in the order of `nodes`
+    :param min_size: smallest community that is collapsed
+    :param prefix: prefix of the generated cluster node ids, reserved
+                   like the generated edge ids so they never match the
+                   ids of other nodes
+    :param directed: whether the direction of the edges is kept
+
+    :returns: tuple of (meta nodes, meta edges, cluster data) where the
+              cluster data maps every cluster node id to its member nodes,
+              the edges inside the cluster and the edges leaving it.
+    """
+    members = defaultdict(list)
+    for node, label in zip(nodes, labels):
+        members[label].append(node)
+
+    owner = {}
+    cluster_data = {}
+    meta_nodes = []
+    for label, group in members.items():
+        if len(group) < min_size:
+            for node in group:
+                meta_nodes.append(dict(node))
+            continue
+        cluster_id = prefix + str(label)
+        for node in group:
+            owner[node["id"]] = cluster_id
+        cluster_data[cluster_id] = {"nodes": group, "edges": [], "links": []}
+
+    degree = defaultdict(int)
+    for e in edges:
+        degree[e["from"]] += 1
+        degree[e["to"]] += 1
+
+    meta_edges = {}
+    for e in edges:
+        source = owner.get(e["from"], e["from"])
+        dest = owner.get(e["to"], e["to"])
+        if source == dest and source in cluster_data:
+            cluster_data[source]["edges"].append(e)
+            continue
+        if source in cluster_data:
+            cluster_data[source]["links"].append(e)
+        if dest in cluster_data:
+            cluster_data[dest]["links"].append(e)
+        if source not in cluster_data and dest not in cluster_data:
+            meta_edges[(e["from"], e["to"], len(meta_edges))] = dict(e)
+            continue
+        if directed or str(source) <= str(dest):
+            key = (source, dest)
+        else:
+            key = (dest, source)
+        agg = meta_edges.setdefault(key, {"from": key[0], "to": key[1],
+                                          "value": 0, "count": 0})
+        if directed and "arrows" in e:
+            agg.setdefault("arrows", e["arrows"])
+        agg["value"] += edge_weight(e)
+        agg["count"] += 1
+
+    for edge in meta_edges.values():
+        if "count" in edge:
+            count = edge.pop("count")
+            edge["title"] = "%d edge%s" % (count, "" if count == 1 else "s")
+
+    for cluster_id, data in cluster_data.items():
+        group = data["nodes"]
+        hub = max(group, key=lambda node: degree[node["id"]])
+        meta_nodes.append({
+            "id": cluster_id,
+            "label": "%s (+%d)" % (hub.get("label", hub["id"]), len(group) - 1),
+            "shape": "dot",
+            "value": len(group),
+            "title": "%d nodes, double click to expand" % len(group),
+            "color": hub.get("color", "#97c2fc"),
+        })
+    return meta_nodes, list(meta_edges.values()), cluster_data
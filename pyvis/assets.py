@@ -0,0 +1,141 @@
+# javascript and css files referenced by pages written with cdn_resources="local"
+import hashlib
+import os
+import shutil
+import tempfile
+
+LIB_DIR = os.path.join(os.path.dirname(__file__), "templates", "lib")
+
+# asset name -> file shipped in the templates lib directory
+ASSETS = {
+    "utils.js": "bindings/utils.js",
+    "webgl.js": "bindings/webgl.js",
+    "vis-network.css": "vis-9.1.2/vis-network.css",
+    "vis-network.min.js": "vis-9.1.2/vis-network.min.js",
+    "tom-select.css": "tom-select/tom-select.css",
+    "tom-select.complete.min.js": "tom-select/tom-select.complete.min.js",
+}
+
+# directories under the unhashed paths that custom templates written for
+# earlier versions reference, e.g. lib/vis-9.1.2/vis-network.min.js
+LEGACY_DIRS = ("bindings", "tom-select", "vis-9.1.2")
+
+_hashed_names = {}
+
+
+def hashed_name(name):
+    """
+    File name of the asset `name` with the first 16 hex digits of its
+    sha256 inserted before the extension, e.g.
+    ``vis-network.min.<digest>.js``. Computed once per process.
+    """
+    if name not in _hashed_names:
+        with open(os.path.join(LIB_DIR, ASSETS[name]), "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        stem, ext = os.path.splitext(name)
+        _hashed_names[name] = "%s.%s%s" % (stem, digest, ext)
+    return _hashed_names[name]
+
+
+class AssetStore(object):
+    """
+    A directory holding one copy of every asset under its content hashed
+    name, shared by all pages that reference it. Since the name changes
+    with the content, an existing file never needs to be compared or
+    refreshed, and files are moved into place atomically so an
+    interrupted copy is never mistaken for a complete one.
+
+    >>> net.assets = AssetStore("reports/lib", link=True)
+    >>> net.write_html("reports/2024/graph.html")
+    """
+
+    def __init__(self, directory, link=False):
+        """
+        :param directory: where the assets are kept
+        :param link: hard link the assets to the installed package files
+                     instead of copying them, falling back to a symbolic
+                     link and then to a copy where the filesystem does not
+                     allow it
+
+        :type directory: str
+        :type link: bool
+        """
+        self.directory = directory
+        self.link = link
+
+    def path(self, name):
+        return os.path.join(self.directory, hashed_name(name))
+
+    def publish(self):
+        """
+        Make sure every asset is present in the store.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        for name in ASSETS:
+            target = self.path(name)
+            if not os.path.exists(target):
+                self._place(os.path.join(LIB_DIR, ASSETS[name]), target)
+
+    def _place(self, source, target):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        os.close(fd)
+        try:
+            placed = False
+            if self.link:
+                os.remove(tmp)
+                for make_link in (os.link, os.symlink):
+                    try:
+                        make_link(os.path.abspath(source), tmp)
+                        placed = True
+                        break
+                    except OSError:
+                        continue
+            if not placed:
+                shutil.copyfile(source, tmp)
+            os.replace(tmp, target)
+        finally:
+            if os.path.lexists(tmp):
+                os.remove(tmp)
+
+    def urls(self, page):
+        """
+        Relative urls of the assets as seen from the page written to
+        `page`.
+
+        :param page: path of the html file referencing the assets
+
+        :returns: dict mapping asset names to urls
+        """
+        base = os.path.dirname(os.path.abspath(page))
+        return {
+            name: os.path.relpath(os.path.abspath(self.path(name)), base).replace(os.sep, "/")
+            for name in ASSETS}
+
+
+def package_files():
+    """
+    Hashed asset names mapped to the files shipped with the package, for
+    the local servers serving the assets without publishing them.
+    """
+    return {hashed_name(name): os.path.join(LIB_DIR, path)
+            for name, path in ASSETS.items()}
+
+
+def publish_legacy(page):
+    """
+    Copy the vendored asset directories to the `lib` directory next to
+    `page` under their unhashed paths, for custom templates that hard code
+    them. Directories already present are kept.
+    """
+    lib = os.path.join(os.path.dirname(page), "lib")
+    for name in LEGACY_DIRS:
+        target = os.path.join(lib, name)
+        if not os.path.exists(target):
+            shutil.copytree(os.path.join(LIB_DIR, name), target)
+
+
+def default_store(page):
+    """
+    The store in the `lib` directory next to `page`.
+    """
+    return AssetStore(os.path.join(os.path.dirname(page), "lib"))
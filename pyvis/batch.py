@@ -0,0 +1,204 @@
+# rendering many networks over a process pool
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .network import _shared_environment
+
+
+def _warm():
+    """
+    Compile the default template once per worker process.
+    """
+    directory = os.path.dirname(__file__) + "/templates/"
+    _shared_environment(directory).get_template("template.html")
+
+
+def _render_chunk(chunk, out_dir, options):
+    """
+    Render every (name, network or factory) pair of `chunk`, recording the
+    failure of an item instead of giving up on the rest of the chunk.
+
+    :returns: list of (name, seconds, error) where error is None or the
+              formatted traceback
+    """
+    results = []
+    for name, item in chunk:
+        start = time.perf_counter()
+        try:
+            net = item if hasattr(item, "write_html") else item()
+            path = os.path.join(out_dir, name)
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            net.write_html(path, **options)
+            error = None
+        except Exception:
+            error = traceback.format_exc()
+        results.append((name, time.perf_counter() - start, error))
+    return results
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _render_pool(items, out_dir, workers, chunksize, options, results):
+    """
+    Render `items` from a pool of `workers` processes, appending to
+    `results`. A chunk failing as a whole is sent again item by item. When
+    a worker process dies the pool is replaced, and the items running at
+    the time are rendered again one at a time, so only the item killing
+    its worker is reported as failed.
+    """
+    pool = ProcessPoolExecutor(workers, initializer=_warm)
+    # future -> its chunk
+    pending = {}
+    # chunks sent again item by item, and items running when a worker died
+    retry = []
+    suspects = []
+    broken = False
+
+    def collect(done):
+        nonlocal broken
+        for future in done:
+            chunk = pending.pop(future)
+            try:
+                results.extend(future.result())
+            except BrokenProcessPool:
+                broken = True
+                if len(chunk) > 1:
+                    retry.extend([item] for item in chunk)
+                else:
+                    suspects.append(chunk)
+            except Exception:
+                # the chunk as a whole failed, e.g. because one item could
+                # not be pickled, send the items alone
+                if len(chunk) > 1:
+                    retry.extend([item] for item in chunk)
+                else:
+                    results.append((chunk[0][0], 0.0, traceback.format_exc()))
+
+    def submit(chunk):
+        nonlocal broken
+        try:
+            pending[pool.submit(_render_chunk, chunk, out_dir, options)] = chunk
+        except BrokenProcessPool:
+            broken = True
+            retry.append(chunk)
+
+    def replace_pool():
+        nonlocal pool, broken
+        # every future of the broken pool fails right away
+        while pending:
+            collect(wait(pending)[0])
+        pool.shutdown(wait=True)
+        pool = ProcessPoolExecutor(workers, initializer=_warm)
+        broken = False
+        while suspects:
+            chunk = suspects.pop()
+            try:
+                results.extend(pool.submit(_render_chunk, chunk, out_dir, options).result())
+            except BrokenProcessPool:
+                results.append((chunk[0][0], 0.0,
+                                "the worker process died while rendering %s\n" % chunk[0][0]))
+                pool.shutdown(wait=True)
+                pool = ProcessPoolExecutor(workers, initializer=_warm)
+            except Exception:
+                results.append((chunk[0][0], 0.0, traceback.format_exc()))
+
+    try:
+        chunks = _chunks(items, chunksize)
+        while True:
+            if broken:
+                replace_pool()
+            chunk = retry.pop() if retry else next(chunks, None)
+            if chunk is None:
+                if not pending:
+                    break
+                collect(wait(pending, return_when=FIRST_COMPLETED)[0])
+                continue
+            submit(chunk)
+            if len(pending) >= 2 * workers:
+                collect(wait(pending, return_when=FIRST_COMPLETED)[0])
+    finally:
+        pool.shutdown(wait=True)
+
+
+def render_many(networks, out_dir, workers=None, chunksize=16, **options):
+    """
+    Write many networks with :py:meth:`pyvis.network.Network.write_html`
+    from a pool of worker processes. Items are sent to the workers in
+    chunks of `chunksize` to amortize pickling, and each worker keeps one
+    template environment, compiled once, for every network it renders.
+    Only a few chunks per worker are in flight at a time, so the networks
+    do not all have to be pickled upfront.
+
+    Items are either networks or picklable callables returning one, e.g.
+    module level functions or ``functools.partial`` objects, which build
+    the network in the worker and avoid pickling it altogether. A failing
+    item is reported and does not stop the others, even when it kills its
+    worker process.
+
+    >>> stats = pyvis.render_many(
+    ...     {"%d.html" % i: partial(build, i) for i in range(50000)},
+    ...     "out", workers=32, cdn_resources="remote")
+    >>> stats["rendered"], stats["per_second"]
+    (50000, 1210.4)
+
+    :param networks: dict mapping file names, relative to `out_dir`, to
+                     networks or factories, or a list of them written to
+                     "0.html", "1.html" and so on
+    :param out_dir: directory the pages are written to
+    :param workers: number of worker processes, all cores when None. With
+                    1 the networks are rendered in this process.
+    :param chunksize: number of items sent to a worker at once
+    :param options: passed on to write_html, e.g. cache or data
+
+    :type networks: dict or list
+    :type out_dir: str
+    :type workers: int
+    :type chunksize: int
+
+    :returns: dict with the number of rendered and failed items, the
+              tracebacks of the failures by name, the wall clock seconds,
+              the pages written per second, the items processed per second
+              including failures and the mean and max seconds per item
+    """
+    assert chunksize > 0
+    if isinstance(networks, dict):
+        items = networks.items()
+    else:
+        items = (("%d.html" % k, item) for k, item in enumerate(networks))
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    results = []
+    if workers == 1:
+        for chunk in _chunks(items, chunksize):
+            results.extend(_render_chunk(chunk, out_dir, options))
+    else:
+        _render_pool(items, out_dir, workers, chunksize, options, results)
+    elapsed = time.perf_counter() - start
+    errors = {name: error for name, _, error in results if error is not None}
+    seconds = [s for _, s, _ in results]
+    rendered = len(results) - len(errors)
+    return {"rendered": rendered,
+            "failed": len(errors),
+            "errors": errors,
+            "workers": workers,
+            "seconds": elapsed,
+            # failures are usually quick and would flatter the throughput
+            "per_second": rendered / elapsed if elapsed else 0.0,
+            "items_per_second": len(results) / elapsed if elapsed else 0.0,
+            "mean_seconds": sum(seconds) / len(seconds) if seconds else 0.0,
+            "max_seconds": max(seconds) if seconds else 0.0}
@@ -0,0 +1,284 @@
+# precomputed edge routing, emitted as static vis smooth settings
+import math
+from collections import defaultdict
+
+from .algorithms import _numpy
+
+
+def roundness_for_offset(offset, length):
+    """
+    Invert the geometry vis uses for curvedCW/curvedCCW edges. For a
+    roundness `f` vis places the quadratic control point so that its
+    distance from the straight line is (f / 2 + 1 / 2) * sin(f * pi / 2)
+    times the edge length, and the curve midpoint lies halfway between the
+    line and the control point. Returns the roundness whose curve midpoint
+    is `offset` away from the straight line, clipped to [0, 1].
+    """
+    np = _numpy()
+    target = np.clip(2.0 * np.abs(offset) / np.maximum(length, 1e-12), 0.0, 1.0)
+    low = np.zeros_like(target)
+    high = np.ones_like(target)
+    # the control point distance grows monotonically with f, so bisect
+    for _ in range(30):
+        mid = (low + high) / 2.0
+        below = (mid / 2.0 + 0.5) * np.sin(mid * math.pi / 2.0) < target
+        low = np.where(below, mid, low)
+        high = np.where(below, high, mid)
+    return (low + high) / 2.0
+
+
+def _search_radius(lengths, threshold):
+    """
+    Distance between edge midpoints beyond which two edges can not reach
+    `threshold`. The scale measure bounds the length of a compatible edge
+    to `ratio` times the length of the other, and the position measure
+    then bounds the distance of their midpoints.
+    """
+    np = _numpy()
+    if threshold <= 0:
+        return np.full(len(lengths), np.inf)
+    threshold = min(threshold, 1.0)
+    # scale >= threshold  <=>  u^2 + (4 - 4 / threshold) u - 4 <= 0, u = 1 + ratio
+    b = 4.0 - 4.0 / threshold
+    ratio = (-b + math.sqrt(b * b + 16.0)) / 2.0 - 1.0
+    return lengths * (1.0 + ratio) / 2.0 * (1.0 - threshold) / threshold
+
+
+def _candidate_blocks(mids, radius, block):
+    """
+    Group the edges by the grid cell of their midpoint and yield, for at
+    most `block` edges of a cell at a time, the edges whose midpoints lie
+    in the cells within the search radius of the group.
+    """
+    np = _numpy()
+    finite = radius[np.isfinite(radius)]
+    size = max(float(np.median(finite)) if len(finite) else 1.0, 1e-9)
+    cells = np.floor(mids / size).astype(np.int64)
+    buckets = defaultdict(list)
+    for k, (cx, cy) in enumerate(cells.tolist()):
+        buckets[(cx, cy)].append(k)
+    buckets = {key: np.array(members) for key, members in buckets.items()}
+    everything = np.arange(len(mids))
+    for (cx, cy), members in buckets.items():
+        for first in range(0, len(members), block):
+            rows = members[first:first + block]
+            reach = float(radius[rows].max())
+            if not np.isfinite(reach):
+                yield rows, everything
+                continue
+            reach = int(math.ceil(reach / size))
+            if (2 * reach + 1) ** 2 >= len(buckets):
+                near = [m for (x, y), m in buckets.items()
+                        if abs(x - cx) <= reach and abs(y - cy) <= reach]
+            else:
+                near = [buckets[(x, y)]
+                        for x in range(cx - reach, cx + reach + 1)
+                        for y in range(cy - reach, cy + reach + 1)
+                        if (x, y) in buckets]
+            yield rows, np.concatenate(near)
+
+
+def _compatibility(starts, ends, threshold, max_candidates=16, block=256):
+    """
+    Pairs of compatible edges, grouped by their first edge, as defined by Holten and van Wijk (2009),
+    using the angle, scale and position measures. Only edges whose
+    midpoints are close enough to reach `threshold` are compared, found
+    with a grid over the midpoints, and every edge keeps its
+    `max_candidates` most compatible partners. Memory stays linear in the
+    number of edges and time is about linear for evenly spread layouts.
+    """
+    np = _numpy()
+    vectors = ends - starts
+    lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+    mids = (starts + ends) / 2.0
+    radius = _search_radius(lengths, threshold)
+    rows, cols, weights, flips = [], [], [], []
+    for i, c in _candidate_blocks(mids, radius, block):
+        dot = vectors[i] @ vectors[c].T
+        li = lengths[i][:, None]
+        lc = lengths[c][None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            angle = np.abs(dot) / (li * lc)
+            average = (li + lc) / 2.0
+            scale = 2.0 / (average / np.minimum(li, lc) + np.maximum(li, lc) / average)
+            distance = np.hypot(mids[i, None, 0] - mids[None, c, 0],
+                                mids[i, None, 1] - mids[None, c, 1])
+            position = average / (average + distance)
+            score = np.nan_to_num(angle * scale * position)
+        score[i[:, None] == c[None, :]] = 0.0
+        score[score < threshold] = 0.0
+        if score.shape[1] > max_candidates:
+            # zero all but the best max_candidates scores of every row
+            weakest = np.argpartition(score, -max_candidates, axis=1)[:, :-max_candidates]
+            np.put_along_axis(score, weakest, 0.0, axis=1)
+        r, k = np.nonzero(score)
+        rows.append(i[r])
+        cols.append(c[k])
+        weights.append(score[r, k])
+        flips.append(dot[r, k] < 0)
+    if not rows:
+        empty = np.zeros(0)
+        return empty.astype(int), empty.astype(int), empty, empty.astype(bool)
+    return (np.concatenate(rows), np.concatenate(cols),
+            np.concatenate(weights), np.concatenate(flips))
+
+
+def _subdivide(points, count):
+    """
+    Resample every polyline in `points` to `count` interior points evenly
+    spaced along its length.
+    """
+    np = _numpy()
+    segments = np.diff(points, axis=1)
+    seg_length = np.hypot(segments[..., 0], segments[..., 1])
+    cumulative = np.concatenate(
+        [np.zeros((len(points), 1)), np.cumsum(seg_length, axis=1)], axis=1)
+    total = cumulative[:, -1:]
+    targets = total * (np.arange(1, count + 1) / (count + 1.0))[None, :]
+    result = np.empty((len(points), count + 2, 2))
+    result[:, 0] = points[:, 0]
+    result[:, -1] = points[:, -1]
+    for e in range(len(points)):
+        for axis in (0, 1):
+            result[e, 1:-1, axis] = np.interp(
+                targets[e], cumulative[e], points[e, :, axis])
+    return result
+
+
+def force_directed_bundling(nodes, edges, cycles=5, iterations=50, step=0.04,
+                            stiffness=0.1, threshold=0.6, max_candidates=16,
+                            pair_block=100000):
+    """
+    Bundle edges with force directed edge bundling (Holten and van Wijk,
+    2009) over the precomputed node positions. Each edge is modelled as a
+    polyline whose interior points are attracted by the matching points of
+    compatible edges and held together by springs. The number of points
+    doubles every cycle while the step size halves.
+
+    The bundled route of every edge is then reduced to the static
+    curvedCW or curvedCCW smooth setting whose midpoint matches the route,
+    since vis can not draw arbitrary polylines.
+
+    Every edge is only attracted by its `max_candidates` most compatible
+    edges among those with nearby midpoints, so each iteration costs
+    O(E * max_candidates * points) and memory stays linear in the number of
+    edges. Edges spanning most of the layout compare with many others when
+    looking for candidates, so sparsify dense graphs with long edges first.
+
+    :param nodes: node dictionaries, all holding `x` and `y`
+    :param edges: edge dictionaries
+    :param cycles: number of subdivision cycles
+    :param iterations: iterations of the first cycle, reduced by a third
+                       every following cycle
+    :param step: initial step size relative to the layout size
+    :param stiffness: global spring constant
+    :param threshold: minimum compatibility for two edges to attract
+    :param max_candidates: most compatible edges attracting every edge
+
+    :returns: list with the smooth setting of every edge, None for edges
+              that keep the global setting
+    """
+    np = _numpy()
+    assert all("x" in n and "y" in n for n in nodes), \
+        "edge bundling needs x and y positions on every node"
+    position = {n["id"]: (float(n["x"]), float(n["y"])) for n in nodes}
+    starts = np.array([position[e["from"]] for e in edges], dtype=float).reshape(-1, 2)
+    ends = np.array([position[e["to"]] for e in edges], dtype=float).reshape(-1, 2)
+    lengths = np.hypot(*(ends - starts).T)
+    smooth = [None] * len(edges)
+    active = np.nonzero(lengths > 0)[0]
+    if len(active) < 2:
+        return smooth
+
+    # work in a unit box so the step size does not depend on the layout scale
+    origin = np.minimum(starts[active].min(axis=0), ends[active].min(axis=0))
+    extent = max(float(np.max(np.maximum(starts[active], ends[active]) - origin)), 1e-12)
+    s = (starts[active] - origin) / extent
+    t = (ends[active] - origin) / extent
+    rows, cols, weights, flips = _compatibility(s, t, threshold, max_candidates)
+
+    points = np.stack([s, t], axis=1)
+    count = 1
+    for cycle in range(cycles):
+        points = _subdivide(points, count)
+        seg_count = count + 1
+        spring = stiffness / (np.hypot(*(t - s).T) * seg_count)
+        for _ in range(max(1, int(iterations * (2.0 / 3.0) ** cycle))):
+            inner = points[:, 1:-1]
+            force = spring[:, None, None] * (
+                points[:, :-2] + points[:, 2:] - 2.0 * inner)
+            for first in range(0, len(rows), pair_block):
+                i = rows[first:first + pair_block]
+                j = cols[first:first + pair_block]
+                other = points[j, 1:-1]
+                flip = flips[first:first + pair_block]
+                other[flip] = other[flip][:, ::-1]
+                diff = other - points[i, 1:-1]
+                dist2 = np.maximum(diff[..., :1] ** 2 + diff[..., 1:] ** 2, 1e-9)
+                pull = weights[first:first + pair_block, None, None] * diff / dist2
+                # the pairs of an edge are adjacent, sum them per edge
+                runs = np.flatnonzero(np.r_[True, i[1:] != i[:-1]])
+                force[i[runs]] += np.add.reduceat(pull, runs, axis=0)
+            # electrostatic forces are unbounded near contact, clip the move
+            move = step * force
+            norm = np.maximum(np.hypot(move[..., 0], move[..., 1]) / step, 1.0)
+            points[:, 1:-1] += move / norm[..., None]
+        step /= 2.0
+        count *= 2
+
+    middle = points.shape[1] - 1
+    route_mid = (points[:, middle // 2] + points[:, (middle + 1) // 2]) / 2.0
+    offset = route_mid - (s + t) / 2.0
+    direction = t - s
+    length = np.hypot(direction[:, 0], direction[:, 1])
+    # normal on the side vis bends curvedCW edges to, in canvas coordinates
+    normal = np.stack([direction[:, 1], -direction[:, 0]], axis=1) / length[:, None]
+    side = (offset * normal).sum(axis=1)
+    roundness = roundness_for_offset(side, length)
+    for k, e in enumerate(active.tolist()):
+        if roundness[k] < 0.02:
+            smooth[e] = {"enabled": False}
+        else:
+            smooth[e] = {"enabled": True,
+                         "type": "curvedCW" if side[k] > 0 else "curvedCCW",
+                         "roundness": round(float(roundness[k]), 3)}
+    return smooth
+
+
+def spread_parallel_edges(nodes, edges, spacing=0.15):
+    """
+    Give parallel edges between the same pair of nodes alternating static
+    curves of increasing roundness so they do not overlap. Needs no
+    positions and runs in O(E).
+
+    :param nodes: node dictionaries
+    :param edges: edge dictionaries
+    :param spacing: roundness added per pair of parallel edges
+
+    :returns: list with the smooth setting of every edge, None for edges
+              that keep the global setting
+    """
+    groups = defaultdict(list)
+    for k, e in enumerate(edges):
+        groups[frozenset((e["from"], e["to"]))].append(k)
+    smooth = [None] * len(edges)
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        for rank, k in enumerate(members):
+            level = (rank + 1) // 2
+            if level == 0:
+                smooth[k] = {"enabled": False}
+                continue
+            # opposite directions flip the meaning of clockwise
+            clockwise = (rank % 2 == 1) == (edges[k]["from"] == edges[members[0]]["from"])
+            smooth[k] = {"enabled": True,
+                         "type": "curvedCW" if clockwise else "curvedCCW",
+                         "roundness": min(1.0, spacing * level)}
+    return smooth
+
+
+BUNDLING_METHODS = {
+    "fdeb": force_directed_bundling,
+    "parallel": spread_parallel_edges,
+}
@@ -0,0 +1,120 @@
+# skipping pages whose inputs did not change since they were last written
+import hashlib
+import json
+import os
+
+from ._version import __version__
+
+DIGEST_PREFIX = "<!-- pyvis-digest: "
+DIGEST_SUFFIX = " -->\n"
+
+
+def render_digest(net, notebook=False, data="inline", encoding="json", backend="vis"):
+    """
+    Content hash over everything the page written by
+    :py:meth:`pyvis.network.Network.write_html` depends on: the canonical
+    node and edge data, the options, the page settings, the template
+    source and the cdn mode.
+
+    :param net: the network to hash
+    :param notebook: whether the page is rendered for a notebook
+    :param data: whether the data is inlined or written to external files
+    :param encoding: whether the data is encoded as json or binary columns
+    :param backend: the render backend drawing the page
+
+    :returns: hex digest
+    """
+    h = hashlib.sha256()
+
+    def feed(value):
+        h.update(json.dumps(value, sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\0")
+
+    env = net.templateEnv
+    source = env.loader.get_source(env, net.path)[0]
+    feed([__version__, net.template_dir, net.path, source, notebook, data,
+          encoding, backend])
+    if net.render_cache:
+        # the chunks are kept encoded between renders anyway
+        h.update(net._node_chunks.encode(net.nodes, sort_keys=True).text.encode("utf-8"))
+        h.update(net._edge_chunks.encode(net.edges, sort_keys=True).text.encode("utf-8"))
+    else:
+        feed(net.nodes)
+        feed(net.edges)
+    feed([net.get_network_data()[5], net.get_idle_governor().__dict__,
+          net.height, net.width, net.heading, net.bgcolor, net.conf,
+          net.use_DOT, net.dot_lang, net.widget, net.neighborhood_highlight,
+          net.select_menu, net.filter_menu, net.filter_max_values,
+          net.progressive, net.worker_decoding, net.tiling,
+          net.cluster_data, net.cdn_resources,
+          net.assets and net.assets.directory])
+    return h.hexdigest()
+
+
+def embed_digest(html, digest):
+    """
+    Append `digest` to the page as a trailing HTML comment.
+    """
+    return html + "\n" + DIGEST_PREFIX + digest + DIGEST_SUFFIX
+
+
+def read_digest(path):
+    """
+    The digest embedded at the end of the file at `path`, None when the
+    file does not exist or carries none. Only the tail of the file is read.
+    """
+    marker = DIGEST_PREFIX.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 256))
+            tail = f.read()
+    except OSError:
+        return None
+    start = tail.rfind(marker)
+    if start < 0 or not tail.endswith(DIGEST_SUFFIX.encode("utf-8")):
+        return None
+    return tail[start + len(marker):-len(DIGEST_SUFFIX)].decode("utf-8")
+
+
+class DiskCache(object):
+    """
+    Counts the pages :py:meth:`pyvis.network.Network.write_html` could
+    skip because the file on disk already holds the same digest. One
+    instance is usually shared by every network of a job.
+
+    >>> cache = DiskCache()
+    >>> for net in networks:
+    ...     net.write_html(net.heading + ".html", cache=cache)
+    >>> cache.stats()
+    {'hits': 950, 'misses': 50}
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, path, digest):
+        """
+        Whether the file at `path` was written from inputs with `digest`,
+        recording the hit or miss.
+        """
+        if read_digest(path) == digest:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def stats(self):
+        """
+        :returns: dict with the number of hits and misses
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+
+
+# used by write_html(cache=True)
+default_cache = DiskCache()
@@ -1,3 +1,6 @@
+from bisect import bisect_left, insort
+
+
 class Edge(object):
 
     def __init__(self, source, dest, directed=False, **options):
@@ -7,3 +10,68 @@ class Edge(object):
         if directed:
         	if 'arrows' not in self.options:
         		self.options["arrows"] = "to"
+
+
+class EdgeIndex(object):
+    """
+    Positions of the edges of a network by their endpoints, so edges are
+    found in O(1) rather than with a scan of the edge list. Positions are
+    kept as they were when the index was built, with the removed ones in a
+    sorted list, and the current position is the kept one minus the
+    removals before it. The index is built again once many edges were
+    removed.
+    """
+
+    def __init__(self, edges, directed=False, rebuild_after=1024):
+        """
+        :param edges: the edge list of the network, which the index
+                      follows as edges are appended and removed
+        :param directed: whether (a, b) and (b, a) are different edges
+        :param rebuild_after: number of removals after which positions are
+                              built again
+        """
+        self.directed = directed
+        self.rebuild_after = rebuild_after
+        self.build(edges)
+
+    def build(self, edges):
+        self.edges = edges
+        # endpoint key -> kept positions of its edges, in order
+        self.positions = {}
+        for k, e in enumerate(edges):
+            self.positions.setdefault(self.key(e["from"], e["to"]), []).append(k)
+        self.removed = []
+        self.next = len(edges)
+
+    def key(self, source, to):
+        return (source, to) if self.directed else frozenset((source, to))
+
+    def __len__(self):
+        return self.next - len(self.removed)
+
+    def find(self, source, to):
+        """
+        Position of the first edge from `source` to `to`, in either
+        direction for undirected networks, None when there is none.
+        """
+        kept = self.positions.get(self.key(source, to))
+        if not kept:
+            return None
+        return kept[0] - bisect_left(self.removed, kept[0])
+
+    def append(self, edge):
+        self.positions.setdefault(self.key(edge["from"], edge["to"]), []).append(self.next)
+        self.next += 1
+
+    def remove(self, source, to):
+        """
+        Forget the first edge from `source` to `to` after it was removed
+        from the edge list.
+        """
+        key = self.key(source, to)
+        kept = self.positions[key].pop(0)
+        if not self.positions[key]:
+            del self.positions[key]
+        insort(self.removed, kept)
+        if len(self.removed) > self.rebuild_after:
+            self.build(self.edges)
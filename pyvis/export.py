@@ -0,0 +1,188 @@
+# writing many networks at once
+import json
+import os
+
+from .assets import AssetStore, default_store
+from .network import _package_template
+
+# overrides a view may carry
+VIEW_KEYS = ("highlight", "hidden", "focus", "camera")
+
+
+def write_bundle(networks, directory, link=False, cache=False, data="inline"):
+    """
+    Write several networks below `directory`, all referencing a single
+    copy of the javascript and css assets in `directory/lib`. Networks
+    whose cdn_resources is not "local" are written as usual.
+
+    >>> write_bundle({"a.html": net_a, "2024/b.html": net_b}, "report")
+
+    :param networks: dict mapping file names, relative to `directory`, to
+                     networks
+    :param directory: root directory of the bundle
+    :param link: link the assets to the installed package files instead of
+                 copying them, see :py:class:`pyvis.assets.AssetStore`
+    :param cache: passed on to :py:meth:`pyvis.network.Network.write_html`
+    :param data: passed on to :py:meth:`pyvis.network.Network.write_html`,
+                 with "external" networks sharing data files when they are
+                 written to the same directory
+
+    :type networks: dict
+    :type directory: str
+    :type link: bool
+
+    :returns: list of the written paths
+    """
+    store = AssetStore(os.path.join(directory, "lib"), link=link)
+    paths = []
+    for name, net in networks.items():
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        previous = net.assets
+        net.assets = store
+        try:
+            net.write_html(path, cache=cache, data=data)
+        finally:
+            net.assets = previous
+        paths.append(path)
+    return paths
+
+
+def write_views(net, views, directory, link=False, encoding="json"):
+    """
+    Write one page per view over the same network. The nodes, edges and
+    options are written once to content hashed files in `directory/data`,
+    and every page only carries its view, applied once the shared data is
+    drawn:
+
+    - highlight: node ids drawn as usual while all other nodes are dimmed
+    - hidden: node ids that are hidden
+    - focus: id of the node the camera centers on
+    - camera: vis moveTo options, e.g. ``{"scale": 1.5}``, also used as
+      the options of the focus animation
+
+    As with ``data="external"``, the pages have to be served over http(s).
+
+    >>> write_views(net, {
+    ...     "alice.html": {"highlight": [0, 1, 2], "focus": 0},
+    ...     "bob.html": {"hidden": [4], "camera": {"position": {"x": 0, "y": 0}, "scale": 2}},
+    ... }, "report")
+
+    :param net: the network shared by every view
+    :param views: dict mapping file names, relative to `directory`, to the
+                  overrides of each view
+    :param directory: root directory of the pages
+    :param link: link the assets to the installed package files instead of
+                 copying them, see :py:class:`pyvis.assets.AssetStore`
+    :param encoding: encoding of the shared data, "json" or "binary"
+
+    :type views: dict
+    :type directory: str
+    :type link: bool
+
+    :returns: list of the written paths
+    """
+    for view in views.values():
+        unknown = set(view) - set(VIEW_KEYS)
+        assert not unknown, "unknown view keys %s" % sorted(unknown)
+    # the data files are written relative to a page at the root
+    root_files = net.write_data_files(os.path.join(directory, "index.html"),
+                                      encoding=encoding)
+    store = AssetStore(os.path.join(directory, "lib"), link=link)
+    if net.cdn_resources == "local":
+        store.publish()
+    previous = net.assets
+    net.assets = store
+    paths = []
+    try:
+        for name, view in views.items():
+            path = os.path.join(directory, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data_files = _rebase(root_files, os.path.abspath(directory),
+                                 os.path.dirname(os.path.abspath(path)))
+            html = net.generate_html(name=path, data_files=data_files, view=view)
+            with open(path, "w+") as out:
+                out.write(html)
+            paths.append(path)
+    finally:
+        net.assets = previous
+    return paths
+
+
+def _rebase(files, root, page_dir):
+    """
+    Data file urls relative to `root` made relative to `page_dir`.
+    """
+    result = {}
+    for key, value in files.items():
+        if isinstance(value, dict):
+            result[key] = _rebase(value, root, page_dir)
+        elif key == "dtype":
+            result[key] = value
+        else:
+            result[key] = os.path.relpath(os.path.join(root, value),
+                                          page_dir).replace(os.sep, "/")
+    return result
+
+
+def generate_page(networks, heading="", cdn_resources="remote", name="index.html"):
+    """
+    HTML of one page drawing several networks, e.g. the small graphs of a
+    dashboard. vis and the pyvis bindings are included once for the whole
+    page, each network keeps its own container and state, and a network
+    is only drawn once it scrolls into view. Every network keeps its
+    nodes, edges, options, size, background color and heading, while the
+    template specific features like the menus are left out.
+
+    >>> html = generate_page([net_a, net_b], heading="Services")
+
+    :param networks: the networks, in page order
+    :param heading: heading of the page
+    :param cdn_resources: "remote", "in_line" or "local", as for
+                          :py:class:`pyvis.network.Network`
+    :param name: path the page is written to, for the urls of local
+                 resources
+
+    :type networks: list
+    :type heading: str
+    :type cdn_resources: str
+
+    :returns: str
+    """
+    assert cdn_resources in ["local", "in_line", "remote"], \
+        "cdn_resources not in [local, in_line, remote]."
+    graphs = []
+    for k, net in enumerate(networks):
+        assert not net.use_DOT, "DOT networks are not supported on multi network pages"
+        nodes, edges, title, height, width, options = net.get_network_data()
+        graphs.append({"id": "pyvis-graph-%d" % k, "heading": title,
+                       "height": height, "width": width, "bgcolor": net.bgcolor,
+                       "data": {"nodes": nodes, "edges": edges,
+                                "options": json.loads(options)}})
+    if cdn_resources == "local":
+        assets = default_store(name).urls(name)
+    else:
+        assets = None
+    return _package_template("multi.html").render(
+        graphs=graphs, heading=heading, cdn_resources=cdn_resources,
+        assets=assets)
+
+
+def write_page(networks, name, heading="", cdn_resources="remote"):
+    """
+    Write the page of :py:func:`generate_page` to `name`, along with the
+    local resources in the lib directory next to it when cdn_resources is
+    "local".
+
+    >>> write_page([net_a, net_b], "dashboard.html", cdn_resources="in_line")
+
+    :returns: the path of the page
+    """
+    html = generate_page(networks, heading=heading,
+                         cdn_resources=cdn_resources, name=name)
+    if cdn_resources == "local":
+        default_store(name).publish()
+    with open(name, "w+") as out:
+        out.write(html)
+    return name
+
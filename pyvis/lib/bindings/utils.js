@@ -1,153 +1,133 @@
+// nodes highlighted by neighbourhoodHighlight, mapped to "first" or "second"
+// degree; every other node is dimmed while a highlight is active
+var highlightState = new Map();
+var highlightActive = false;
+
+function highlightStyle(nodeId, state) {
+  // the color and label a node is drawn with in the given highlight state
+  if (state === "dim") {
+    return { id: nodeId, color: "rgba(200,200,200,0.5)", label: undefined };
+  } else if (state === "second") {
+    return {
+      id: nodeId,
+      color: "rgba(150,150,150,0.75)",
+      label: nodeLabels[nodeId],
+    };
+  }
+  return { id: nodeId, color: nodeColors[nodeId], label: nodeLabels[nodeId] };
+}
+
 function neighbourhoodHighlight(params) {
-  // console.log("in nieghbourhoodhighlight");
-  allNodes = nodes.get({ returnType: "Object" });
-  // originalNodes = JSON.parse(JSON.stringify(allNodes));
-  // if something is selected:
+  // only the nodes whose highlight state changes are sent to the DataSet,
+  // in a single batched update
+  var updateArray = [];
   if (params.nodes.length > 0) {
-    highlightActive = true;
-    var i, j;
     var selectedNode = params.nodes[0];
-    var degrees = 2;
-
-    // mark all nodes as hard to read.
-    for (let nodeId in allNodes) {
-      // nodeColors[nodeId] = allNodes[nodeId].color;
-      allNodes[nodeId].color = "rgba(200,200,200,0.5)";
-      if (allNodes[nodeId].hiddenLabel === undefined) {
-        allNodes[nodeId].hiddenLabel = allNodes[nodeId].label;
-        allNodes[nodeId].label = undefined;
-      }
+    // ids coming from the select menu are strings
+    if (nodes.get(selectedNode) === null && nodes.get(Number(selectedNode)) !== null) {
+      selectedNode = Number(selectedNode);
     }
     var connectedNodes = network.getConnectedNodes(selectedNode);
-    var allConnectedNodes = [];
-
-    // get the second degree nodes
-    for (i = 1; i < degrees; i++) {
-      for (j = 0; j < connectedNodes.length; j++) {
-        allConnectedNodes = allConnectedNodes.concat(
-          network.getConnectedNodes(connectedNodes[j])
-        );
+    var state = new Map();
+    for (let i = 0; i < connectedNodes.length; i++) {
+      let secondDegree = network.getConnectedNodes(connectedNodes[i]);
+      for (let j = 0; j < secondDegree.length; j++) {
+        state.set(secondDegree[j], "second");
       }
     }
-
-    // all second degree nodes get a different color and their label back
-    for (i = 0; i < allConnectedNodes.length; i++) {
-      // allNodes[allConnectedNodes[i]].color = "pink";
-      allNodes[allConnectedNodes[i]].color = "rgba(150,150,150,0.75)";
-      if (allNodes[allConnectedNodes[i]].hiddenLabel !== undefined) {
-        allNodes[allConnectedNodes[i]].label =
-          allNodes[allConnectedNodes[i]].hiddenLabel;
-        allNodes[allConnectedNodes[i]].hiddenLabel = undefined;
-      }
+    for (let i = 0; i < connectedNodes.length; i++) {
+      state.set(connectedNodes[i], "first");
     }
+    state.set(selectedNode, "first");
 
-    // all first degree nodes get their own color and their label back
-    for (i = 0; i < connectedNodes.length; i++) {
-      // allNodes[connectedNodes[i]].color = undefined;
-      allNodes[connectedNodes[i]].color = nodeColors[connectedNodes[i]];
-      if (allNodes[connectedNodes[i]].hiddenLabel !== undefined) {
-        allNodes[connectedNodes[i]].label =
-          allNodes[connectedNodes[i]].hiddenLabel;
-        allNodes[connectedNodes[i]].hiddenLabel = undefined;
+    if (!highlightActive) {
+      // entering the highlight dims every node outside the neighbourhood
+      let ids = nodes.getIds();
+      for (let i = 0; i < ids.length; i++) {
+        updateArray.push(highlightStyle(ids[i], state.has(ids[i]) ? state.get(ids[i]) : "dim"));
+      }
+    } else {
+      for (let [nodeId, previous] of highlightState) {
+        if (!state.has(nodeId)) {
+          updateArray.push(highlightStyle(nodeId, "dim"));
+        } else if (state.get(nodeId) !== previous) {
+          updateArray.push(highlightStyle(nodeId, state.get(nodeId)));
+        }
+      }
+      for (let [nodeId, current] of state) {
+        if (!highlightState.has(nodeId)) {
+          updateArray.push(highlightStyle(nodeId, current));
+        }
       }
     }
-
-    // the main node gets its own color and its label back.
-    // allNodes[selectedNode].color = undefined;
-    allNodes[selectedNode].color = nodeColors[selectedNode];
-    if (allNodes[selectedNode].hiddenLabel !== undefined) {
-      allNodes[selectedNode].label = allNodes[selectedNode].hiddenLabel;
-      allNodes[selectedNode].hiddenLabel = undefined;
-    }
+    highlightState = state;
+    highlightActive = true;
   } else if (highlightActive === true) {
-    // console.log("highlightActive was true");
     // reset all nodes
-    for (let nodeId in allNodes) {
-      // allNodes[nodeId].color = "purple";
-      allNodes[nodeId].color = nodeColors[nodeId];
-      // delete allNodes[nodeId].color;
-      if (allNodes[nodeId].hiddenLabel !== undefined) {
-        allNodes[nodeId].label = allNodes[nodeId].hiddenLabel;
-        allNodes[nodeId].hiddenLabel = undefined;
+    let ids = nodes.getIds();
+    for (let i = 0; i < ids.length; i++) {
+      if (!highlightState.has(ids[i]) || highlightState.get(ids[i]) !== "first") {
+        updateArray.push(highlightStyle(ids[i], "first"));
       }
     }
+    highlightState = new Map();
     highlightActive = false;
   }
-
-  // transform the object into an array
-  var updateArray = [];
-  if (params.nodes.length > 0) {
-    for (let nodeId in allNodes) {
-      if (allNodes.hasOwnProperty(nodeId)) {
-        // console.log(allNodes[nodeId]);
-        updateArray.push(allNodes[nodeId]);
-      }
-    }
-    nodes.update(updateArray);
-  } else {
-    // console.log("Nothing was selected");
-    for (let nodeId in allNodes) {
-      if (allNodes.hasOwnProperty(nodeId)) {
-        // console.log(allNodes[nodeId]);
-        // allNodes[nodeId].color = {};
-        updateArray.push(allNodes[nodeId]);
-      }
-    }
+  if (updateArray.length > 0) {
     nodes.update(updateArray);
   }
 }
 
+// nodes left visible by the active filter, every other node is hidden
+var filterShown = new Set();
+var filterActive = false;
+
 function filterHighlight(params) {
-  allNodes = nodes.get({ returnType: "Object" });
-  // if something is selected:
+  // only nodes whose visibility changes are sent to the DataSet
+  var updateArray = [];
   if (params.nodes.length > 0) {
-    filterActive = true;
-    let selectedNodes = params.nodes;
-
-    // hiding all nodes and saving the label
-    for (let nodeId in allNodes) {
-      allNodes[nodeId].hidden = true;
-      if (allNodes[nodeId].savedLabel === undefined) {
-        allNodes[nodeId].savedLabel = allNodes[nodeId].label;
-        allNodes[nodeId].label = undefined;
+    let shown = new Set();
+    for (let i = 0; i < params.nodes.length; i++) {
+      let nodeId = params.nodes[i];
+      // ids collected from object keys are strings
+      if (nodes.get(nodeId) === null && nodes.get(Number(nodeId)) !== null) {
+        nodeId = Number(nodeId);
       }
+      shown.add(nodeId);
     }
-
-    for (let i=0; i < selectedNodes.length; i++) {
-      allNodes[selectedNodes[i]].hidden = false;
-      if (allNodes[selectedNodes[i]].savedLabel !== undefined) {
-        allNodes[selectedNodes[i]].label = allNodes[selectedNodes[i]].savedLabel;
-        allNodes[selectedNodes[i]].savedLabel = undefined;
+    if (!filterActive) {
+      let ids = nodes.getIds();
+      for (let i = 0; i < ids.length; i++) {
+        if (!shown.has(ids[i])) {
+          updateArray.push({ id: ids[i], hidden: true, label: undefined });
+        }
+      }
+    } else {
+      for (let nodeId of filterShown) {
+        if (!shown.has(nodeId)) {
+          updateArray.push({ id: nodeId, hidden: true, label: undefined });
+        }
+      }
+      for (let nodeId of shown) {
+        if (!filterShown.has(nodeId)) {
+          updateArray.push({ id: nodeId, hidden: false, label: nodeLabels[nodeId] });
+        }
       }
     }
-
+    filterShown = shown;
+    filterActive = true;
   } else if (filterActive === true) {
     // reset all nodes
-    for (let nodeId in allNodes) {
-      allNodes[nodeId].hidden = false;
-      if (allNodes[nodeId].savedLabel !== undefined) {
-        allNodes[nodeId].label = allNodes[nodeId].savedLabel;
-        allNodes[nodeId].savedLabel = undefined;
+    let ids = nodes.getIds();
+    for (let i = 0; i < ids.length; i++) {
+      if (!filterShown.has(ids[i])) {
+        updateArray.push({ id: ids[i], hidden: false, label: nodeLabels[ids[i]] });
       }
     }
+    filterShown = new Set();
     filterActive = false;
   }
-
-  // transform the object into an array
-  var updateArray = [];
-  if (params.nodes.length > 0) {
-    for (let nodeId in allNodes) {
-      if (allNodes.hasOwnProperty(nodeId)) {
-        updateArray.push(allNodes[nodeId]);
-      }
-    }
-    nodes.update(updateArray);
-  } else {
-    for (let nodeId in allNodes) {
-      if (allNodes.hasOwnProperty(nodeId)) {
-        updateArray.push(allNodes[nodeId]);
-      }
-    }
+  if (updateArray.length > 0) {
     nodes.update(updateArray);
   }
 }
@@ -167,7 +147,19 @@ function selectNodes(nodes) {
 function highlightFilter(filter) {
   let selectedNodes = []
   let selectedProp = filter['property']
-  if (filter['item'] === 'node') {
+  if (typeof filterIndex !== "undefined") {
+    // look the matching nodes up in the inverted index from python
+    let values = (filterIndex[filter['item']] || {})[selectedProp] || {};
+    let selected = new Set();
+    for (let i = 0; i < filter['value'].length; i++) {
+      let ids = values[filter['value'][i]] || [];
+      for (let j = 0; j < ids.length; j++) {
+        selected.add(ids[j]);
+      }
+    }
+    selectedNodes = Array.from(selected);
+  }
+  else if (filter['item'] === 'node') {
     let allNodes = nodes.get({ returnType: "Object" });
     for (let nodeId in allNodes) {
       if (allNodes[nodeId][selectedProp] && filter['value'].includes((allNodes[nodeId][selectedProp]).toString())) {
@@ -186,4 +178,564 @@ function highlightFilter(filter) {
     }
   }
   selectNodes(selectedNodes)
-}
\ No newline at end of file
+}
+
+var clusterOf = {};
+var expandedClusters = {};
+
+function indexClusters(data) {
+  // remember which collapsed cluster every member node belongs to
+  for (let clusterId in data) {
+    for (let i = 0; i < data[clusterId].nodes.length; i++) {
+      clusterOf[data[clusterId].nodes[i].id] = clusterId;
+    }
+  }
+}
+
+function clusterRepresentative(nodeId) {
+  // the node currently drawn for nodeId, either itself or its collapsed cluster
+  let clusterId = clusterOf[nodeId];
+  if (clusterId === undefined || expandedClusters[clusterId]) {
+    return nodeId;
+  }
+  return clusterId;
+}
+
+function linkWeight(edge) {
+  if (edge.value !== undefined) {
+    return edge.value;
+  } else if (edge.width !== undefined) {
+    return edge.width;
+  } else if (edge.weight !== undefined) {
+    return edge.weight;
+  }
+  return 1;
+}
+
+function expandCluster(clusterId, directed) {
+  let cluster = clusterData[clusterId];
+  if (cluster === undefined || expandedClusters[clusterId]) {
+    return;
+  }
+  expandedClusters[clusterId] = true;
+  let center = network.getPositions([clusterId])[clusterId];
+  edges.remove(network.getConnectedEdges(clusterId));
+  nodes.remove(clusterId);
+
+  // place the members on a ring around the position of the cluster
+  let radius = 20 * Math.sqrt(cluster.nodes.length);
+  let newNodes = [];
+  for (let i = 0; i < cluster.nodes.length; i++) {
+    let node = Object.assign({}, cluster.nodes[i]);
+    if (node.x === undefined && center !== undefined) {
+      let angle = (2 * Math.PI * i) / cluster.nodes.length;
+      node.x = center.x + radius * Math.cos(angle);
+      node.y = center.y + radius * Math.sin(angle);
+    }
+    if (nodeColors !== undefined) {
+      nodeColors[node.id] = node.color;
+      nodeLabels[node.id] = node.label;
+    }
+    newNodes.push(node);
+  }
+  nodes.add(newNodes);
+
+  // edges leaving the cluster attach to whatever now represents the other end
+  let newEdges = [];
+  for (let i = 0; i < cluster.edges.length; i++) {
+    newEdges.push(Object.assign({}, cluster.edges[i]));
+  }
+  let aggregated = {};
+  for (let i = 0; i < cluster.links.length; i++) {
+    let link = cluster.links[i];
+    let source = clusterRepresentative(link.from);
+    let dest = clusterRepresentative(link.to);
+    if (source === link.from && dest === link.to) {
+      newEdges.push(Object.assign({}, link));
+      continue;
+    }
+    if (!directed && String(dest) < String(source)) {
+      // both directions of an undirected pair share one meta edge
+      [source, dest] = [dest, source];
+    }
+    let key = JSON.stringify([source, dest]);
+    if (aggregated[key] === undefined) {
+      aggregated[key] = { from: source, to: dest, value: 0, count: 0 };
+    }
+    if (directed && link.arrows !== undefined && aggregated[key].arrows === undefined) {
+      aggregated[key].arrows = link.arrows;
+    }
+    aggregated[key].value += linkWeight(link);
+    aggregated[key].count += 1;
+  }
+  for (let key in aggregated) {
+    let count = aggregated[key].count;
+    aggregated[key].title = count + (count === 1 ? " edge" : " edges");
+    delete aggregated[key].count;
+    newEdges.push(aggregated[key]);
+  }
+  edges.add(newEdges);
+}
+
+function governFrames(maxFps, pauseHidden) {
+  // route animation frames through a timer so redraws are capped at maxFps,
+  // and at one frame per second while the page is hidden
+  if (!maxFps && !pauseHidden) {
+    return;
+  }
+  let nativeRequest = window.requestAnimationFrame.bind(window);
+  let nativeCancel = window.cancelAnimationFrame.bind(window);
+  let pending = {};
+  let counter = 0;
+  let last = 0;
+  window.requestAnimationFrame = function (callback) {
+    let interval = maxFps ? 1000 / maxFps : 0;
+    if (pauseHidden && document.hidden) {
+      interval = 1000;
+    }
+    let handle = ++counter;
+    let wait = Math.max(0, last + interval - performance.now());
+    pending[handle] = {
+      timer: setTimeout(function () {
+        pending[handle].frame = nativeRequest(function (time) {
+          delete pending[handle];
+          last = time;
+          callback(time);
+        });
+      }, wait),
+    };
+    return handle;
+  };
+  window.cancelAnimationFrame = function (handle) {
+    if (pending[handle] !== undefined) {
+      clearTimeout(pending[handle].timer);
+      if (pending[handle].frame !== undefined) {
+        nativeCancel(pending[handle].frame);
+      }
+      delete pending[handle];
+    }
+  };
+}
+
+function governIdle(network, freezePhysics, pauseHidden) {
+  if (freezePhysics) {
+    // physics only runs until the network settles and while nodes are dragged
+    network.on("stabilized", function () {
+      network.setOptions({ physics: { enabled: false } });
+    });
+    network.on("dragStart", function (params) {
+      if (params.nodes.length > 0) {
+        network.setOptions({ physics: { enabled: true } });
+      }
+    });
+  }
+  if (pauseHidden) {
+    document.addEventListener("visibilitychange", function () {
+      if (document.hidden) {
+        network.stopSimulation();
+      } else {
+        network.startSimulation();
+      }
+    });
+  }
+}
+
+function loadGraphData(files) {
+  // fetch the nodes, edges and options written next to the page, with the
+  // numeric columns of the binary encoding zipped into the nodes and edges
+  return fetchGraphData(files).then(function (data) {
+    for (let kind in data.columns) {
+      zipColumns(data[kind], data.columns[kind]);
+    }
+    return data;
+  });
+}
+
+function fetchGraphData(files) {
+  // the data files as they are, with the column buffers under `buffer`
+  var keys = Object.keys(files).filter(function (key) { return key !== "columns"; });
+  var columns = files.columns || {};
+  var buffers = [];
+  for (let kind in columns) {
+    for (let name in columns[kind]) {
+      let column = columns[kind][name];
+      buffers.push(fetchData(column.url, "arrayBuffer").then(function (buffer) {
+        column.buffer = buffer;
+      }));
+    }
+  }
+  return Promise.all(keys.map(function (key) {
+    return fetchData(files[key], "json");
+  }).concat(buffers)).then(function (values) {
+    var data = { columns: columns };
+    for (let i = 0; i < keys.length; i++) {
+      data[keys[i]] = values[i];
+    }
+    return data;
+  });
+}
+
+function fetchData(url, type) {
+  return fetch(url).then(function (response) {
+    if (!response.ok) {
+      throw new Error("could not load " + url + ": " + response.status);
+    }
+    return response[type]();
+  });
+}
+
+var columnTypes = { float32: Float32Array, int32: Int32Array };
+
+function base64Buffer(text) {
+  var bytes = atob(text);
+  var buffer = new Uint8Array(bytes.length);
+  for (let i = 0; i < bytes.length; i++) {
+    buffer[i] = bytes.charCodeAt(i);
+  }
+  return buffer.buffer;
+}
+
+function zipColumns(items, columns) {
+  // copy numeric properties packed in little endian typed arrays into the
+  // items, NaN marks items without the property
+  for (let name in columns) {
+    let column = columns[name];
+    let buffer = column.buffer || base64Buffer(column.base64);
+    let values = new columnTypes[column.dtype](buffer);
+    for (let i = 0; i < items.length; i++) {
+      if (!Number.isNaN(values[i])) {
+        items[i][name] = values[i];
+      }
+    }
+  }
+  return items;
+}
+
+function applyView(view) {
+  // per page overrides applied on top of data shared by several pages:
+  // highlighted and hidden node ids, a node to focus and a camera position
+  var updates = new Map();
+  if (view.highlight && view.highlight.length > 0) {
+    let highlight = new Set(view.highlight);
+    let ids = nodes.getIds();
+    for (let i = 0; i < ids.length; i++) {
+      let state = highlight.has(ids[i]) ? "first" : "dim";
+      highlightState.set(ids[i], state);
+      updates.set(ids[i], highlightStyle(ids[i], state));
+    }
+    highlightActive = true;
+  }
+  if (view.hidden) {
+    for (let i = 0; i < view.hidden.length; i++) {
+      let update = updates.get(view.hidden[i]) || { id: view.hidden[i] };
+      update.hidden = true;
+      updates.set(view.hidden[i], update);
+    }
+  }
+  if (updates.size > 0) {
+    nodes.update(Array.from(updates.values()));
+  }
+
+  function moveCamera() {
+    if (view.focus !== undefined && view.focus !== null) {
+      network.focus(view.focus, view.camera || {});
+    } else if (view.camera) {
+      network.moveTo(view.camera);
+    }
+  }
+  moveCamera();
+  // vis fits the whole graph once stabilized, move back afterwards
+  network.once("stabilizationIterationsDone", moveCamera);
+}
+
+function splitChunks(nodeItems, edgeItems, first, size) {
+  // split nodes ordered by degree into a first chunk and chunks of `size`,
+  // the edges are ordered by their later endpoint and go with the chunk
+  // completing them
+  var position = new Map();
+  for (let i = 0; i < nodeItems.length; i++) {
+    position.set(nodeItems[i].id, i);
+  }
+  function later(edge) {
+    // edges to unknown nodes sort last
+    var from = position.has(edge.from) ? position.get(edge.from) : Infinity;
+    var to = position.has(edge.to) ? position.get(edge.to) : Infinity;
+    return Math.max(from, to);
+  }
+  var chunks = { nodes: [], edges: [], total: nodeItems.length };
+  var start = 0;
+  var e = 0;
+  do {
+    let stop = Math.min(nodeItems.length, start + (start === 0 ? first : size));
+    let edgeStart = e;
+    while (e < edgeItems.length && later(edgeItems[e]) < stop) {
+      e++;
+    }
+    chunks.nodes.push(nodeItems.slice(start, stop));
+    chunks.edges.push(edgeItems.slice(edgeStart, e));
+    start = stop;
+  } while (start < nodeItems.length);
+  // the remaining edges go with the last chunk
+  var last = chunks.edges.length - 1;
+  chunks.edges[last] = chunks.edges[last].concat(edgeItems.slice(e));
+  return chunks;
+}
+
+function addChunks(chunks) {
+  // add the remaining chunks one per idle callback, keeping the page
+  // responsive, and report the progress in the loading bar
+  var schedule = window.requestIdleCallback || window.requestAnimationFrame;
+  var loaded = nodes.length;
+  var bar = document.getElementById("loadingBar");
+
+  function progress() {
+    if (!bar) {
+      return;
+    }
+    var fraction = chunks.total > 0 ? loaded / chunks.total : 1;
+    bar.removeAttribute("style");
+    document.getElementById("bar").style.width = Math.max(20, 496 * fraction) + "px";
+    document.getElementById("text").innerHTML = Math.round(fraction * 100) + "%";
+    if (loaded >= chunks.total) {
+      bar.style.opacity = 0;
+      setTimeout(function () { bar.style.display = "none"; }, 500);
+    }
+  }
+
+  function step() {
+    if (chunks.nodes.length === 0) {
+      return;
+    }
+    var nodeIds = nodes.add(chunks.nodes.shift());
+    var edgeIds = edges.add(chunks.edges.shift());
+    for (let i = 0; i < nodeIds.length; i++) {
+      let node = nodes.get(nodeIds[i]);
+      allNodes[node.id] = node;
+      nodeColors[node.id] = node.color;
+      nodeLabels[node.id] = node.label;
+    }
+    for (let i = 0; i < edgeIds.length; i++) {
+      allEdges[edgeIds[i]] = edges.get(edgeIds[i]);
+    }
+    loaded += nodeIds.length;
+    progress();
+    schedule(step);
+  }
+  progress();
+  schedule(step);
+}
+
+function expandNode(id, settings) {
+  // merge the neighbourhood of a node sent by the pyvis server, which
+  // only sends the edges to the new nodes and to the nodes posted as known
+  var url = settings.url + "?node=" + encodeURIComponent(id) +
+    "&hops=" + settings.hops + "&limit=" + settings.limit;
+  return fetch(url, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ known: nodes.getIds() })
+  }).then(function (response) {
+    if (!response.ok) {
+      throw new Error("could not load " + url + ": " + response.status);
+    }
+    return response.json();
+  }).then(function (data) {
+    var nodeIds = nodes.update(data.nodes);
+    for (let i = 0; i < nodeIds.length; i++) {
+      let node = nodes.get(nodeIds[i]);
+      allNodes[node.id] = node;
+      nodeColors[node.id] = node.color;
+      nodeLabels[node.id] = node.label;
+    }
+    var edgeIds = edges.update(data.edges.filter(function (edge) {
+      return nodes.get(edge.from) !== null && nodes.get(edge.to) !== null;
+    }));
+    for (let i = 0; i < edgeIds.length; i++) {
+      allEdges[edgeIds[i]] = edges.get(edgeIds[i]);
+    }
+    return data;
+  });
+}
+
+function followLive(settings) {
+  // apply the batches streamed by the pyvis live server, once per frame
+  var queue = [];
+  var scheduled = false;
+  var source = new EventSource(settings.url + "?since=" + settings.since);
+  source.onmessage = function (event) {
+    queue.push(JSON.parse(event.data));
+    if (!scheduled) {
+      scheduled = true;
+      window.requestAnimationFrame(function () {
+        scheduled = false;
+        var batches = queue;
+        queue = [];
+        batches.forEach(applyLiveBatch);
+      });
+    }
+  };
+  return source;
+}
+
+function applyLiveBatch(batch) {
+  // nodes are updated before the edges that may point to them, and
+  // removed after the edges attached to them
+  var replace = batch.replace;
+  if (replace) {
+    var nodeIds = new Set(replace.nodes.map(function (node) { return node.id; }));
+    var edgeIds = new Set(replace.edges.map(function (edge) { return edge.id; }));
+    batch = {
+      nodes: { update: replace.nodes, remove: nodes.getIds({ filter: function (node) { return !nodeIds.has(node.id); } }) },
+      edges: { update: replace.edges, remove: edges.getIds({ filter: function (edge) { return !edgeIds.has(edge.id); } }) },
+    };
+  }
+  var nodeChanges = batch.nodes || { update: [], remove: [] };
+  var edgeChanges = batch.edges || { update: [], remove: [] };
+  var updated = nodes.update(nodeChanges.update);
+  for (let i = 0; i < updated.length; i++) {
+    let node = nodes.get(updated[i]);
+    allNodes[node.id] = node;
+    nodeColors[node.id] = node.color;
+    nodeLabels[node.id] = node.label;
+  }
+  updated = edges.update(edgeChanges.update);
+  for (let i = 0; i < updated.length; i++) {
+    allEdges[updated[i]] = edges.get(updated[i]);
+  }
+  edges.remove(edgeChanges.remove);
+  for (let i = 0; i < edgeChanges.remove.length; i++) {
+    delete allEdges[edgeChanges.remove[i]];
+  }
+  nodes.remove(nodeChanges.remove);
+  for (let i = 0; i < nodeChanges.remove.length; i++) {
+    delete allNodes[nodeChanges.remove[i]];
+    delete nodeColors[nodeChanges.remove[i]];
+    delete nodeLabels[nodeChanges.remove[i]];
+  }
+}
+
+function drawWhenVisible(containers, graphs) {
+  // draw each graph of a multi network page once it scrolls into view,
+  // from the JSON next to its container, keeping its state in graphs
+  function draw(container) {
+    var data = JSON.parse(document.getElementById(container.id + "-data").textContent);
+    var graph = { nodes: new vis.DataSet(data.nodes), edges: new vis.DataSet(data.edges) };
+    graph.network = new vis.Network(container, { nodes: graph.nodes, edges: graph.edges }, data.options);
+    graphs[container.id] = graph;
+  }
+  containers = Array.prototype.slice.call(containers);
+  if (!("IntersectionObserver" in window)) {
+    containers.forEach(draw);
+    return;
+  }
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (entry.isIntersecting) {
+        observer.unobserve(entry.target);
+        draw(entry.target);
+      }
+    });
+  }, { rootMargin: "200px" });
+  containers.forEach(function (container) {
+    observer.observe(container);
+  });
+}
+
+function decodeGraphPayload(request) {
+  // parse the inlined payload or fetch the data files, decode the column
+  // buffers and precompute the colour and label maps and the chunks of
+  // progressive loading. Runs in the worker started by decodeInWorker.
+  var ready;
+  if (request.text !== undefined) {
+    ready = Promise.resolve(JSON.parse(request.text));
+  } else {
+    ready = fetchGraphData(request.files);
+  }
+  return ready.then(function (data) {
+    var buffers = [];
+    var columns = data.columns || {};
+    for (let kind in columns) {
+      for (let name in columns[kind]) {
+        let column = columns[kind][name];
+        if (column.buffer === undefined) {
+          column.buffer = base64Buffer(column.base64);
+          delete column.base64;
+        }
+        buffers.push(column.buffer);
+      }
+    }
+    data.nodeColors = {};
+    data.nodeLabels = {};
+    for (let i = 0; i < data.nodes.length; i++) {
+      data.nodeColors[data.nodes[i].id] = data.nodes[i].color;
+      data.nodeLabels[data.nodes[i].id] = data.nodes[i].label;
+    }
+    if (request.progressive) {
+      data.chunks = splitChunks(data.nodes, data.edges,
+                                request.progressive.first, request.progressive.chunk);
+    }
+    return { data: data, buffers: buffers };
+  });
+}
+
+function absoluteUrls(files) {
+  // blob workers resolve relative urls against the blob, not the page
+  var result = {};
+  for (let key in files) {
+    if (typeof files[key] === "object") {
+      result[key] = absoluteUrls(files[key]);
+    } else if (key === "dtype") {
+      result[key] = files[key];
+    } else {
+      result[key] = new URL(files[key], document.baseURI).href;
+    }
+  }
+  return result;
+}
+
+function decodeInWorker(request) {
+  // decode the payload in a worker created from an inline blob, which also
+  // works for pages opened from the file system. The column buffers are
+  // transferred back and only zipped into the items here.
+  function finish(result) {
+    var data = result.data;
+    for (let kind in data.columns) {
+      zipColumns(data[kind], data.columns[kind]);
+    }
+    return data;
+  }
+  var source = [base64Buffer, fetchData, fetchGraphData, splitChunks, decodeGraphPayload].join("\n") +
+    "\nself.onmessage = function (event) {\n" +
+    "  decodeGraphPayload(event.data).then(function (result) {\n" +
+    "    self.postMessage(result, result.buffers);\n" +
+    "  }, function (error) {\n" +
+    "    self.postMessage({ error: String(error) });\n" +
+    "  });\n" +
+    "};\n";
+  var url;
+  var worker;
+  try {
+    url = URL.createObjectURL(new Blob([source], { type: "text/javascript" }));
+    worker = new Worker(url);
+  } catch (error) {
+    // workers may be blocked, e.g. by a content security policy
+    return decodeGraphPayload(request).then(finish);
+  }
+  return new Promise(function (resolve, reject) {
+    worker.onmessage = function (event) {
+      worker.terminate();
+      URL.revokeObjectURL(url);
+      if (event.data.error !== undefined) {
+        reject(new Error(event.data.error));
+      } else {
+        resolve(finish(event.data));
+      }
+    };
+    worker.onerror = function (event) {
+      worker.terminate();
+      URL.revokeObjectURL(url);
+      reject(event);
+    };
+    worker.postMessage(request);
+  });
+}
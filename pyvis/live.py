@@ -0,0 +1,245 @@
+# pushing network mutations to open pages with server-sent events
+import json
+import logging
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .assets import package_files
+
+log = logging.getLogger(__name__)
+
+
+class LiveServer(object):
+    """
+    Local http server streaming the mutations of a network to every open
+    page as server-sent events. Nodes and edges added, updated or removed
+    with the Network methods are coalesced per id and sent in one batch
+    every `interval` seconds, which the page applies to its data sets once
+    per frame, keeping the camera and the physics state. Thousands of
+    mutations per second reach the page without re-rendering it.
+
+    Every batch carries a sequence number, so pages reconnecting after a
+    dropped connection receive the batches they missed, or the whole
+    network when those were already discarded.
+
+    The Network methods change the nodes and edges with :py:attr:`lock`
+    held, which the server threads take to read them, so a page never sees
+    a half done change.
+
+    Usually started with :py:meth:`pyvis.network.Network.serve_live`.
+
+    >>> server = LiveServer(net, port=8000)
+    >>> server.start()
+    >>> net.update_node("db", color="red")
+    """
+
+    def __init__(self, net, host="127.0.0.1", port=8000, interval=0.05,
+                 history=1000):
+        """
+        :param net: the network to stream
+        :param host: address the server listens on
+        :param port: port the server listens on, 0 for any free port
+        :param interval: seconds between two batches
+        :param history: number of batches kept for reconnecting pages
+
+        :type host: str
+        :type port: int
+        :type interval: float
+        :type history: int
+        """
+        assert not net.use_DOT, "DOT networks can not be served"
+        self.net = net
+        self.interval = interval
+        self.lock = threading.Condition()
+        # id -> latest mutation, per kind
+        self.pending = {"nodes": {}, "edges": {}}
+        self.replace = False
+        self.batches = deque(maxlen=history)
+        self.seq = 0
+        self.closed = False
+        # pages remove and update edges by id
+        net._ensure_edge_ids()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return "http://%s:%d/" % (host, port)
+
+    def publish(self, op, kind, item):
+        """
+        Record a mutation for the next batch.
+
+        :param op: "update", with the whole node or edge dict as `item`,
+                   or "remove", with its id
+        :param kind: "nodes" or "edges"
+        """
+        if op == "update":
+            if kind == "edges":
+                self.net._edge_id(item)
+            key, item = item["id"], dict(item)
+        else:
+            key = item
+        with self.lock:
+            self.pending[kind][key] = (op, item)
+
+    def reset(self):
+        """
+        Send the whole network with the next batch, for changes the
+        network could not record one by one.
+        """
+        for edge in self.net.edges:
+            self.net._edge_id(edge)
+        with self.lock:
+            self.replace = True
+
+    def flush(self):
+        """
+        Turn the pending mutations into a batch and wake the streams.
+        """
+        with self.lock:
+            if not self.replace and not any(self.pending.values()):
+                return
+            if self.replace:
+                batch = {"replace": self.snapshot()}
+            else:
+                batch = {}
+                for kind, mutations in self.pending.items():
+                    if mutations:
+                        batch[kind] = {
+                            "update": [item for op, item in mutations.values() if op == "update"],
+                            "remove": [item for op, item in mutations.values() if op == "remove"]}
+            self.pending = {"nodes": {}, "edges": {}}
+            self.replace = False
+            self.seq += 1
+            self.batches.append((self.seq, json.dumps(batch, default=str)))
+            self.lock.notify_all()
+
+    def snapshot(self):
+        """
+        The whole network, read with the lock held.
+        """
+        with self.lock:
+            return {"nodes": list(self.net.nodes), "edges": list(self.net.edges)}
+
+    def events(self, since, timeout=15.0):
+        """
+        The batches after the sequence number `since`, waiting up to
+        `timeout` seconds for one. A page that fell behind the history
+        gets the whole network instead.
+
+        :returns: list of (sequence number, JSON text)
+        """
+        with self.lock:
+            if self.seq <= since and not self.closed:
+                self.lock.wait_for(lambda: self.seq > since or self.closed, timeout)
+            if self.seq <= since:
+                return []
+            if not self.batches or self.batches[0][0] > since + 1:
+                return [(self.seq, json.dumps({"replace": self.snapshot()}, default=str))]
+            return [(seq, text) for seq, text in self.batches if seq > since]
+
+    def page(self):
+        """
+        The page drawing the current network and following its changes.
+        """
+        # batches flushed from here on may already be part of the page,
+        # applying them twice is harmless
+        with self.lock:
+            since = self.seq
+            nodes = [dict(n) for n in self.net.nodes]
+            edges = [dict(e) for e in self.net.edges]
+        net = self.net._derive(nodes, edges)
+        # the assets are served from the package, see _handler
+        net.assets = None
+        return net.generate_html(live={"url": "events", "since": since})
+
+    def _flush_loop(self):
+        while not self.closed:
+            try:
+                self.flush()
+            except Exception:
+                # a bad batch must not stop the updates for good
+                log.exception("could not flush the live batch")
+            with self.lock:
+                self.lock.wait_for(lambda: self.closed, self.interval)
+
+    def _handler(self):
+        server = self
+        assets = {"/lib/" + name: path for name, path in package_files().items()}
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path in ("/", "/index.html"):
+                    self._send(server.page().encode("utf-8"), "text/html")
+                elif url.path == "/events":
+                    self._stream(url)
+                elif url.path in assets:
+                    with open(assets[url.path], "rb") as f:
+                        content = f.read()
+                    kind = "text/css" if url.path.endswith(".css") else "text/javascript"
+                    self._send(content, kind)
+                else:
+                    self.send_error(404)
+
+            def _stream(self, url):
+                # EventSource sends the last id it saw when reconnecting
+                since = self.headers.get("Last-Event-ID") or \
+                    parse_qs(url.query).get("since", ["0"])[0]
+                try:
+                    since = int(since)
+                except ValueError:
+                    self.send_error(400, "since has to be an integer")
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    while not server.closed:
+                        batches = server.events(since)
+                        if not batches:
+                            # keeps proxies from closing an idle stream
+                            self.wfile.write(b": keepalive\n\n")
+                        for seq, text in batches:
+                            self.wfile.write(("id: %d\ndata: %s\n\n" % (seq, text)).encode("utf-8"))
+                            since = seq
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _send(self, content, kind):
+                self.send_response(200)
+                self.send_header("Content-Type", kind + "; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """
+        Serve and flush from daemon threads and return right away.
+        """
+        for target in (self.httpd.serve_forever, self._flush_loop):
+            threading.Thread(target=target, daemon=True).start()
+
+    def shutdown(self):
+        """
+        Stop serving and detach from the network.
+        """
+        with self.lock:
+            self.closed = True
+            self.lock.notify_all()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.net.live is self:
+            self.net.live = None
@@ -1,6 +1,8 @@
+import contextlib
+import copy
+import functools
 import json
 import os
-import shutil
 import tempfile
 import webbrowser
 from collections import defaultdict
@@ -10,12 +12,103 @@ import networkx as nx
 from IPython.display import IFrame
 from jinja2 import Environment, FileSystemLoader
 
-from .edge import Edge
+from . import algorithms
+from .assets import default_store, publish_legacy
+from .algorithms import (AdjacencyIndex, COMMUNITY_METHODS,
+                         SAMPLING_METHODS, SPARSIFY_METHODS, AGGREGATES,
+                         aggregate_edge, aggregate_edges, aggregate_title,
+                         aggregate_value, cluster_graph, combine_stats,
+                         edge_arrays, edge_groups, edge_weight)
+from .bundling import BUNDLING_METHODS
+from .cache import default_cache, embed_digest, render_digest
+from .edge import Edge, EdgeIndex
 from .node import Node
-from .options import Options, Configure
+from .options import (Options, Configure, Idle, SCALE_PROFILES, get_option,
+                      set_option)
+from .payload import (ChunkedJSON, NUMERIC_COLUMNS, dumps, filter_index,
+                      inline_columns, pack_columns, progressive_order,
+                      write_data_file)
+from .live import LiveServer
+from .notebook import NotebookView
+from .server import ExpansionServer
+from .tiles import build_tiles
 from .utils import check_html
 
 
+def _has_link(node):
+    """
+    Whether the hover title of a node holds a link, which needs the
+    template's click to open tooltip instead of the default hover one.
+    """
+    title = node.get("title", None)
+    return isinstance(title, str) and "href" in title
+
+
+def _template_environment(template_dir):
+    """
+    Jinja environment for the templates in `template_dir`, whose tojson
+    filter splices in pre-encoded node and edge chunks.
+    """
+    env = Environment(loader=FileSystemLoader(template_dir))
+    env.policies["json.dumps_function"] = dumps
+    return env
+
+
+_shared_envs = {}
+
+
+def _shared_environment(template_dir):
+    """
+    One environment per template directory and process, shared by every
+    network, also the unpickled ones, so a template is only compiled once
+    per process rather than once per network.
+    """
+    if template_dir not in _shared_envs:
+        _shared_envs[template_dir] = _template_environment(template_dir)
+    return _shared_envs[template_dir]
+
+
+# render backends other than the default vis one: name -> template in the
+# package templates directory
+BACKENDS = {"webgl": "webgl.html"}
+
+def _package_template(path):
+    """
+    The template `path` of the package templates directory, shared by
+    every network whatever its own template directory.
+    """
+    return _shared_environment(os.path.dirname(__file__) + "/templates/").get_template(path)
+
+
+def _backend_template(backend):
+    """
+    The template drawing the page with `backend`.
+    """
+    assert backend in BACKENDS, "backend not in %s." % (["vis"] + sorted(BACKENDS))
+    return _package_template(BACKENDS[backend])
+
+
+def _has_positions(nodes):
+    """
+    Whether every node carries numeric x and y coordinates.
+    """
+    return all(isinstance(n.get(axis), (int, float)) and not isinstance(n.get(axis), bool)
+               for n in nodes for axis in ("x", "y"))
+
+
+def _mutation(method):
+    """
+    Run a Network method changing the nodes or edges with the lock of the
+    live server held, if one is attached, so its threads never see a half
+    done change.
+    """
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._mutating():
+            return method(self, *args, **kwargs)
+    return locked
+
+
 class Network(object):
     """
     The Network class is the focus of this library. All viz functionality
@@ -38,7 +131,8 @@ class Network(object):
                  font_color=False,
                  layout=None,
                  heading="",
-                 cdn_resources="local"):
+                 cdn_resources="local",
+                 render_cache=False):
         """
         :param height: The height of the canvas
         :param width: The width of the canvas
@@ -55,6 +149,10 @@ class Network(object):
             remote: pull resources from hash checked cdns.
         :font_color: The color of the node labels text
         :layout: Use hierarchical layout if this is set
+        :param render_cache: Reuse the generated HTML while the network is
+            unchanged and only encode the nodes and edges changed since the
+            last render. Changes have to go through the Network methods,
+            call mark_dirty() after editing node or edge dictionaries in place.
 
         :type height: num or str
         :type width: num or str
@@ -66,6 +164,7 @@ class Network(object):
         :type font_color: str
         :type layout: bool
         :type cdn_resources: str
+        :type render_cache: bool
         """
         self.nodes = []
         self.edges = []
@@ -88,17 +187,51 @@ class Network(object):
         self.neighborhood_highlight = neighborhood_highlight
         self.select_menu = select_menu
         self.filter_menu = filter_menu
+        # distinct values listed per property in the filter menu
+        self.filter_max_values = 500
+        # chunk sizes when the page adds the nodes progressively
+        self.progressive = None
+        self.tiling = None
+        # the LiveServer streaming the mutations, see serve_live
+        self.live = None
+        # the view updated by display, and the source of generated edge ids
+        self.notebook_view = None
+        self._edge_counter = 0
+        # positions of the nodes by their ids, built on first use
+        self._node_positions = None
+        # positions of the edges by their endpoints, built on first use
+        self._edge_index = None
+        # endpoints -> (edge, (count, sum, min, max)) of aggregated edges
+        self._edge_aggregates = {}
+        # decode the data in a web worker instead of the page's main thread
+        self.worker_decoding = False
+        self.cluster_data = {}
+        self.scale_profile = None
+        self.scale_overrides = {}
+        # bumped on every change to the nodes or edges
+        self.version = 0
+        self.render_cache = render_cache
+        self._render_cache = None
+        self._filter_index_cache = None
+        # ids of the nodes with a link in their title
+        self._link_titles = set()
+        # encoded nodes and edges, only the changed chunks are encoded again
+        self._node_chunks = ChunkedJSON()
+        self._edge_chunks = ChunkedJSON()
         assert cdn_resources in ["local", "in_line", "remote"], "cdn_resources not in [local, in_line, remote]."
         # path is the root template located in the template_dir
         self.path = "template.html"
         self.template_dir = os.path.dirname(__file__) + "/templates/"
-        self.templateEnv = Environment(loader=FileSystemLoader(self.template_dir))
+        self.templateEnv = _shared_environment(self.template_dir)
 
         if cdn_resources == "local" and notebook == True:
             print("Warning: When  cdn_resources is 'local' jupyter notebook has issues displaying graphics on chrome/safari."
                   " Use cdn_resources='in_line' or cdn_resources='remote' if you have issues "
                   "viewing graphics in a notebook.")
         self.cdn_resources = cdn_resources
+        # shared AssetStore for cdn_resources="local", defaults to the lib
+        # directory next to the written page
+        self.assets = None
 
         if notebook:
             self.prep_notebook()
@@ -125,6 +258,32 @@ class Network(object):
             self.__class__, self.num_nodes(), self.num_edges()
         )
 
+    def __getstate__(self):
+        """
+        Pickle without the template environment, the rendered caches, the
+        live server and the notebook view, e.g. to render in worker
+        processes.
+        """
+        state = dict(self.__dict__)
+        state["templateEnv"] = None
+        state["template"] = self.template is not None
+        state["live"] = None
+        state["notebook_view"] = None
+        state["html"] = ""
+        state["_render_cache"] = None
+        state["_node_positions"] = None
+        state["_edge_index"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.templateEnv = _shared_environment(self.template_dir)
+        if self.template:
+            self.template = self.templateEnv.get_template(self.path)
+        else:
+            self.template = None
+
+    @_mutation
     def add_node(self, n_id, label=None, shape="dot", color='#97c2fc', **options):
         """
         This method adds a node to the network, given a mandatory node ID.
@@ -238,7 +397,7 @@ class Network(object):
             node_label = label
         else:
             node_label = n_id
-        if n_id not in self.node_ids:
+        if n_id not in self.node_map:
             if "group" in options:
                 n = Node(n_id, shape, label=node_label, font_color=self.font_color, **options)
             else:
@@ -246,6 +405,129 @@ class Network(object):
             self.nodes.append(n.options)
             self.node_ids.append(n_id)
             self.node_map[n_id] = n.options
+            if self._node_positions is not None:
+                self._node_positions[n_id] = len(self.node_ids) - 1
+            if _has_link(n.options):
+                self._link_titles.add(n_id)
+            self._node_chunks.invalidate(len(self.nodes) - 1)
+            self._changed()
+            self._emit("update", "nodes", n.options)
+
+    @_mutation
+    def update_node(self, n_id, **options):
+        """
+        Update the properties of an existing node.
+
+        >>> nt.update_node(0, color="red", title="updated")
+
+        :param n_id: The id of the node
+        :type n_id: str or int
+        """
+        assert n_id in self.node_map, "non existent node '" + str(n_id) + "'"
+        node = self.node_map[n_id]
+        node.update(options)
+        if _has_link(node):
+            self._link_titles.add(n_id)
+        else:
+            self._link_titles.discard(n_id)
+        position = self._node_position(n_id)
+        self._node_chunks.invalidate(position, position + 1)
+        self._changed()
+        self._emit("update", "nodes", node)
+
+    @_mutation
+    def remove_node(self, n_id):
+        """
+        Remove a node and every edge attached to it.
+
+        :param n_id: The id of the node
+        :type n_id: str or int
+        """
+        assert n_id in self.node_map, "non existent node '" + str(n_id) + "'"
+        position = self._node_position(n_id)
+        del self.node_map[n_id]
+        del self.nodes[position]
+        del self.node_ids[position]
+        positions = self._node_positions
+        del positions[n_id]
+        for i in range(position, len(self.node_ids)):
+            positions[self.node_ids[i]] = i
+        kept = []
+        for e in self.edges:
+            if e["from"] != n_id and e["to"] != n_id:
+                kept.append(e)
+            elif "id" in e:
+                self._emit("remove", "edges", e["id"])
+        self.edges = kept
+        self._edge_index = None
+        self._link_titles.discard(n_id)
+        self._node_chunks.invalidate(position)
+        self._edge_chunks.invalidate()
+        self._changed()
+        self._emit("remove", "nodes", n_id)
+
+    @_mutation
+    def mark_dirty(self):
+        """
+        Record changes made to node or edge dictionaries in place, which
+        the network can not see. The Network methods already do this.
+        """
+        self._link_titles = set(n["id"] for n in self.nodes if _has_link(n))
+        self._edge_index = None
+        self._node_chunks.invalidate()
+        self._edge_chunks.invalidate()
+        self._changed()
+        if self.live is not None:
+            self.live.reset()
+
+    def _changed(self):
+        """
+        Bump the version and drop everything cached for the old one.
+        """
+        self.version += 1
+        self._render_cache = None
+        self._filter_index_cache = None
+
+    def _emit(self, op, kind, item):
+        """
+        Hand a mutation to the live server, if any.
+        """
+        if self.live is not None:
+            self.live.publish(op, kind, item)
+
+    def _mutating(self):
+        """
+        The lock of the live server, or a context doing nothing without
+        one.
+        """
+        if self.live is not None:
+            return self.live.lock
+        return contextlib.nullcontext()
+
+    def _node_position(self, n_id):
+        """
+        Position of the node `n_id` in the node list, from a map built
+        again when the node list changed outside the Network methods.
+        """
+        positions = self._node_positions
+        position = None if positions is None else positions.get(n_id)
+        if (position is None or len(positions) != len(self.node_ids) or
+                position >= len(self.node_ids) or self.node_ids[position] != n_id):
+            positions = self._node_positions = {
+                node_id: i for i, node_id in enumerate(self.node_ids)}
+            position = positions[n_id]
+        return position
+
+    def _edge_lookup(self):
+        """
+        The :py:class:`pyvis.edge.EdgeIndex` of the edges, built again when
+        the edge list changed outside the Network methods.
+        """
+        index = self._edge_index
+        if (index is None or index.edges is not self.edges or
+                index.directed != self.directed or len(index) != len(self.edges)):
+            index = self._edge_index = EdgeIndex(self.edges, self.directed)
+        return index
 
     def add_nodes(self, nodes, **kwargs):
         """
@@ -314,6 +596,7 @@ class Network(object):
         """
         return len(self.edges)
 
+    @_mutation
     def add_edge(self, source, to, **options):
         """
 
@@ -363,43 +646,59 @@ class Network(object):
         :type value: num
         :type width: num
         """
-        edge_exists = False
-
         # verify nodes exists
-        assert source in self.get_nodes(), \
+        assert source in self.node_map, \
             "non existent node '" + str(source) + "'"
 
-        assert to in self.get_nodes(), \
+        assert to in self.node_map, \
             "non existent node '" + str(to) + "'"
 
+        index = self._edge_lookup()
         # we only check existing edge for undirected graphs
-        if not self.directed:
-            for e in self.edges:
-                frm = e['from']
-                dest = e['to']
-                if (
-                        (source == dest and to == frm) or
-                        (source == frm and to == dest)
-                ):
-                    # edge already exists
-                    edge_exists = True
+        edge_exists = not self.directed and index.find(source, to) is not None
 
         if not edge_exists:
             e = Edge(source, to, self.directed, **options)
             self.edges.append(e.options)
+            index.append(e.options)
+            self._edge_chunks.invalidate(len(self.edges) - 1)
+            self._changed()
+            self._emit("update", "edges", e.options)
 
-    def add_edges(self, edges):
+    def add_edges(self, edges, aggregate=None, attribute="value"):
         """
         This method serves to add multiple edges between existing nodes
         in the network instance. Adding of the edges is done based off
         of the IDs of the nodes. Order does not matter unless dealing with a
         directed graph.
 
+        By default repeated edges are dropped in undirected graphs and all
+        drawn in directed graphs. When `aggregate` is set, repeated edges
+        between the same pair of nodes are instead merged into one edge
+        carrying their count, sum, min or max weight (the optional third
+        tuple element, 1 when absent). Edges added to a pair that already
+        has an edge are merged into it, also across calls; an edge added
+        otherwise counts as a single edge of its weight.
+
+        >>> net.add_edges([(0, 1, 5), (0, 1, 3), (1, 2)], aggregate="sum")
+
         :param edges: A list of tuples, each tuple consists of source of edge,
                       edge destination and and optional width.
+        :param aggregate: one of 'count', 'sum', 'min' or 'max'
+        :param attribute: the edge attribute receiving the aggregate
 
         :type arrowStrikethrough: list of tuples
-        """
+        :type aggregate: str
+        :type attribute: str
+        """
+        if aggregate is not None:
+            weighted = [
+                {"from": e[0], "to": e[1], "weight": e[2] if len(e) == 3 else 1}
+                for e in edges]
+            assert aggregate in AGGREGATES, "aggregate not in %s" % list(AGGREGATES)
+            self._add_merged_edges(edge_groups(weighted, self.directed, weight="weight"),
+                                   aggregate, attribute)
+            return
         for edge in edges:
             # if incoming tuple contains a weight
             if len(edge) == 3:
@@ -407,6 +706,138 @@ class Network(object):
             else:
                 self.add_edge(edge[0], edge[1])
 
+    @_mutation
+    @_mutation
+    def _add_merged_edges(self, groups, aggregate, attribute):
+        """
+        Add the grouped edges of :py:func:`pyvis.algorithms.edge_groups`,
+        merging every group into the edge already joining its pair, if any.
+        The count, sum, min and max of the edges merged so far are kept per
+        pair, for the edge they were written to.
+        """
+        # checked upfront so a bad edge leaves the network untouched
+        for first, _ in groups.values():
+            for node in (first["from"], first["to"]):
+                if node not in self.node_map:
+                    raise ValueError("non existent node '%s'" % (node,))
+        index = self._edge_lookup()
+        for key, (first, stats) in groups.items():
+            source, dest = first["from"], first["to"]
+            position = index.find(source, dest)
+            if position is None:
+                options = aggregate_edge(first, stats, "weight", aggregate, attribute)
+                del options["from"], options["to"]
+                edge = Edge(source, dest, self.directed, **options).options
+                self.edges.append(edge)
+                index.append(edge)
+                self._edge_chunks.invalidate(len(self.edges) - 1)
+            else:
+                edge = self.edges[position]
+                merged, before = self._edge_aggregates.get(key, (None, None))
+                if merged is not edge:
+                    w = edge_weight(edge, attribute if attribute in edge else None)
+                    before = (1, w, w, w)
+                stats = combine_stats(before, stats)
+                edge[attribute] = aggregate_value(stats, aggregate)
+                edge["title"] = aggregate_title(stats)
+                self._edge_chunks.invalidate(position, position + 1)
+            self._edge_aggregates[key] = (edge, stats)
+            self._emit("update", "edges", edge)
+        self._changed()
+
+    def _edge_id(self, edge):
+        """
+        Give `edge` an id when it has none. The live server and the
+        notebook views update and remove edges by id. Generated ids start
+        with the reserved "pyvis:" prefix so they never match the ids
+        given to other edges, like "e0".
+        """
+        if "id" not in edge:
+            edge["id"] = "pyvis:e%d" % self._edge_counter
+            self._edge_counter += 1
+        return edge["id"]
+
+    def _ensure_edge_ids(self):
+        """
+        Give every edge an id, recording the change when one was missing.
+        """
+        missing = [e for e in self.edges if "id" not in e]
+        for edge in missing:
+            self._edge_id(edge)
+        if missing:
+            self.mark_dirty()
+
+    def _edge_position(self, source, to):
+        """
+        Position of the first edge from `source` to `to`, in either
+        direction for undirected networks.
+        """
+        position = self._edge_lookup().find(source, to)
+        if position is None:
+            raise AssertionError("non existent edge '%s' - '%s'" % (source, to))
+        return position
+
+    @_mutation
+    def update_edge(self, source, to, **options):
+        """
+        Update the properties of an existing edge.
+
+        >>> nt.update_edge(0, 1, color="red", width=4)
+
+        :param source: The id of the node the edge starts from
+        :param to: The id of the node the edge points to
+        """
+        position = self._edge_position(source, to)
+        edge = self.edges[position]
+        edge.update(options)
+        self._edge_chunks.invalidate(position, position + 1)
+        self._changed()
+        self._emit("update", "edges", edge)
+
+    @_mutation
+    def remove_edge(self, source, to):
+        """
+        Remove an existing edge.
+
+        :param source: The id of the node the edge starts from
+        :param to: The id of the node the edge points to
+        """
+        position = self._edge_position(source, to)
+        edge = self.edges.pop(position)
+        self._edge_index.remove(source, to)
+        self._edge_chunks.invalidate(position)
+        self._changed()
+        if "id" in edge:
+            self._emit("remove", "edges", edge["id"])
+
+    def merge_parallel_edges(self, aggregate="sum", weight=None,
+                             attribute="value", title=True):
+        """
+        Return a copy of the network in which parallel edges between the
+        same pair of nodes are collapsed into a single weighted edge. This
+        mostly applies to directed networks, where every added edge is kept.
+
+        >>> merged = net.merge_parallel_edges(aggregate="count", attribute="width")
+
+        :param aggregate: one of 'count', 'sum', 'min' or 'max'
+        :param weight: name of the edge attribute holding the edge weight.
+                       Defaults to the first of value, width or weight.
+        :param attribute: the edge attribute receiving the aggregate
+        :param title: whether to summarize the merged edges in the title
+
+        :type aggregate: str
+        :type weight: str
+        :type attribute: str
+        :type title: bool
+
+        :returns: :py:class:`Network`
+        """
+        return self._derive(
+            [dict(n) for n in self.nodes],
+            aggregate_edges(self.edges, self.directed, weight=weight,
+                            aggregate=aggregate, attribute=attribute,
+                            title=title))
+
     def get_network_data(self):
         """
         Extract relevant information about this network in order to inject into
@@ -421,8 +852,10 @@ class Network(object):
         >>> nodes, edges, heading, height, width, options = net.get_network_data()
         """
         if isinstance(self.options, dict):
+            options = dict(self.options)
+            options.pop("idle", None)
             return (self.nodes, self.edges, self.heading, self.height,
-                    self.width, json.dumps(self.options))
+                    self.width, json.dumps(options))
         else:
             return (self.nodes, self.edges, self.heading, self.height,
                     self.width, self.options.to_json())
@@ -437,28 +870,52 @@ class Network(object):
         check_html(name)
         self.write_html(name)
 
-    def generate_html(self, name="index.html", local=True, notebook=False):
+    def generate_html(self, name="index.html", local=True, notebook=False,
+                      data_files=None, view=None, encoding="json", backend="vis",
+                      expand=None, live=None):
         """
         This method gets the data structures supporting the nodes, edges,
         and options and updates the template to write the HTML holding
         the visualization.
         :type name_html: str
+        :param data_files: urls of the nodes, edges and options JSON files
+                           the page fetches instead of holding the data
+        :type data_files: dict
+        :param view: overrides applied once the page is drawn, see
+                     :py:func:`pyvis.export.write_views`
+        :type view: dict
+        :param encoding: "json", or "binary" to embed the numeric node and
+                         edge properties as base64 typed array buffers
+        :type encoding: str
+        :param backend: "vis", or "webgl" to draw the nodes at their
+                        precomputed x and y positions with WebGL, see
+                        :py:meth:`write_html`
+        :type backend: str
+        :param expand: url, hops and limit of the neighbourhood requests sent
+                       on double click, see :py:meth:`serve`
+        :type expand: dict
+        :param live: url of the event stream the page follows, and the
+                     sequence number of the last batch already in the page,
+                     see :py:meth:`serve_live`
+        :type live: dict
         """
         check_html(name)
-        # here, check if an href is present in the hover data
-        use_link_template = False
-        for n in self.nodes:
-            title = n.get("title", None)
-            if title:
-                if "href" in title:
-                    """
-                    this tells the template to override default hover
-                    mechanic, as the tooltip would move with the mouse
-                    cursor which made interacting with hover data useless.
-                    """
-                    use_link_template = True
-                    break
-        if not notebook:
+        assert encoding in ("json", "binary"), "encoding not in ['json', 'binary']."
+        if backend != "vis":
+            assert not self.use_DOT, "DOT networks are drawn with the vis backend"
+            assert _has_positions(self.nodes), \
+                "the %s backend needs precomputed x and y positions on every node" % backend
+        # here, check if an href is present in the hover data. this tells
+        # the template to override default hover mechanic, as the tooltip
+        # would move with the mouse cursor which made interacting with
+        # hover data useless. the cache tracks links as nodes are added.
+        if self.render_cache:
+            use_link_template = bool(self._link_titles)
+        else:
+            use_link_template = any(_has_link(n) for n in self.nodes)
+        if backend != "vis":
+            template = _backend_template(backend)
+        elif not notebook:
             # with open(self.path) as html:
             #     content = html.read()
             template = self.templateEnv.get_template(self.path)  # Template(content)
@@ -466,6 +923,22 @@ class Network(object):
             template = self.template
 
         nodes, edges, heading, height, width, options = self.get_network_data()
+        idle = self.get_idle_governor()
+        # DOT networks are parsed by vis in one go
+        progressive = None if self.use_DOT else self.progressive
+        if self.render_cache:
+            key = self._render_key(template, options, idle, notebook, name,
+                                   data_files, view, encoding, backend, expand,
+                                   live)
+            if self._render_cache is not None and self._render_cache[0] == key:
+                self.html = self._render_cache[1]
+                return self.html
+            policies = template.environment.policies
+            if (policies["json.dumps_function"] is dumps and encoding == "json"
+                    and not progressive):
+                # only the chunks changed since the last render are encoded
+                nodes = self._node_chunks.encode(nodes, **policies["json.dumps_kwargs"])
+                edges = self._edge_chunks.encode(edges, **policies["json.dumps_kwargs"])
 
         # check if physics is enabled
         if isinstance(self.options, dict):
@@ -476,6 +949,25 @@ class Network(object):
         else:
             physics_enabled = self.options.physics.enabled
 
+        if progressive and not data_files:
+            nodes, edges = progressive_order(nodes, edges)
+        if encoding == "binary" and not data_files:
+            nodes, node_columns = pack_columns(nodes, NUMERIC_COLUMNS["nodes"])
+            edges, edge_columns = pack_columns(edges, NUMERIC_COLUMNS["edges"])
+            columns = {"nodes": inline_columns(node_columns),
+                       "edges": inline_columns(edge_columns)}
+        else:
+            columns = None
+
+        if self.cdn_resources == "local":
+            assets = self.get_asset_store(name).urls(name)
+        else:
+            assets = None
+
+        if self.filter_menu:
+            index = self.get_filter_index()
+        else:
+            index = None
         self.html = template.render(height=height,
                                     width=width,
                                     nodes=nodes,
@@ -491,52 +983,331 @@ class Network(object):
                                     tooltip_link=use_link_template,
                                     neighborhood_highlight=self.neighborhood_highlight,
                                     select_menu=self.select_menu,
+                                    select_nodes=[n["id"] for n in self.nodes] if self.select_menu else None,
                                     filter_menu=self.filter_menu,
+                                    filter_index=index,
+                                    cluster_data=self.cluster_data,
+                                    directed=self.directed,
+                                    idle=idle.__dict__ if idle.enabled() else None,
                                     notebook=notebook,
-                                    cdn_resources=self.cdn_resources
+                                    cdn_resources=self.cdn_resources,
+                                    assets=assets,
+                                    data_files=data_files,
+                                    view=view,
+                                    columns=columns,
+                                    progressive=progressive,
+                                    node_count=len(self.nodes),
+                                    expand=expand,
+                                    live=live,
+                                    worker=self.worker_decoding and not self.use_DOT
                                     )
+        if self.render_cache:
+            self._render_cache = (key, self.html)
         return self.html
 
-    def write_html(self, name, local=True, notebook=False,open_browser=False):
+    def _render_key(self, template, options, idle, notebook, name, data_files,
+                    view, encoding, backend, expand, live):
+        """
+        Everything besides the nodes and edges the generated HTML depends
+        on, paired with the version standing in for the nodes and edges.
+        """
+        return (self.version, id(template), options, name, encoding, backend,
+                data_files and json.dumps(data_files, sort_keys=True),
+                view and json.dumps(view, sort_keys=True),
+                expand and json.dumps(expand, sort_keys=True),
+                live and json.dumps(live, sort_keys=True),
+                tuple(sorted(idle.__dict__.items())), notebook,
+                self.height, self.width, self.heading, self.bgcolor,
+                self.conf, self.use_DOT, self.dot_lang, self.widget,
+                self.neighborhood_highlight, self.select_menu,
+                self.filter_menu, self.filter_max_values,
+                self.progressive and tuple(sorted(self.progressive.items())),
+                self.worker_decoding,
+                id(self.cluster_data), self.directed, self.cdn_resources,
+                self.assets and self.assets.directory)
+
+    def write_data_files(self, name="index.html", encoding="json"):
+        """
+        Write the nodes, edges and options to content hashed JSON files in
+        the data directory next to the page `name`. With the "binary"
+        encoding the numeric node and edge properties are written to
+        little endian .bin files instead, see
+        :py:func:`pyvis.payload.pack_columns`.
+
+        :returns: dict with the url of every file relative to the page
+        """
+        assert not self.use_DOT, "external data is not supported for DOT networks"
+        assert encoding in ("json", "binary"), "encoding not in ['json', 'binary']."
+        nodes, edges, _, _, _, options = self.get_network_data()
+        if self.progressive:
+            nodes, edges = progressive_order(nodes, edges)
+        page_dir = os.path.dirname(os.path.abspath(name))
+        directory = os.path.join(page_dir, "data")
+
+        def url(path):
+            return os.path.relpath(path, page_dir).replace(os.sep, "/")
+
+        files = {}
+        if encoding == "binary":
+            files["columns"] = {}
+            for kind, items in (("nodes", nodes), ("edges", edges)):
+                items, columns = pack_columns(items, NUMERIC_COLUMNS[kind])
+                files[kind] = url(write_data_file(
+                    directory, kind, json.dumps(items, sort_keys=True)))
+                files["columns"][kind] = {
+                    column: {"dtype": dtype,
+                             "url": url(write_data_file(directory, column, data, "bin"))}
+                    for column, (dtype, data) in columns.items()}
+        else:
+            if self.render_cache and not self.progressive:
+                nodes = self._node_chunks.encode(nodes, sort_keys=True).text
+                edges = self._edge_chunks.encode(edges, sort_keys=True).text
+            else:
+                nodes = json.dumps(nodes, sort_keys=True)
+                edges = json.dumps(edges, sort_keys=True)
+            files["nodes"] = url(write_data_file(directory, "nodes", nodes))
+            files["edges"] = url(write_data_file(directory, "edges", edges))
+        files["options"] = url(write_data_file(directory, "options", options))
+        return files
+
+    def write_tiles(self, name="index.html"):
+        """
+        Write the quadtree tiles of the laid out network to content hashed
+        JSON files in the data directory next to the page `name`, along
+        with a manifest listing them, see
+        :py:func:`pyvis.tiles.build_tiles` and :py:meth:`set_tiling`.
+
+        :returns: dict with the url of the manifest relative to the page
+        """
+        assert not self.use_DOT, "tiles are not supported for DOT networks"
+        assert _has_positions(self.nodes), \
+            "tiles need precomputed x and y positions on every node"
+        nodes, edges = self.get_network_data()[:2]
+        manifest, tiles = build_tiles(nodes, edges, **(self.tiling or {}))
+        page_dir = os.path.dirname(os.path.abspath(name))
+        directory = os.path.join(page_dir, "data")
+        for key, tile in tiles.items():
+            # urls relative to the manifest, which sits next to the tiles
+            manifest["tiles"][key]["url"] = os.path.basename(write_data_file(
+                directory, "tile-" + key.replace("/", "-"),
+                json.dumps(tile, sort_keys=True)))
+        path = write_data_file(directory, "tiles", json.dumps(manifest, sort_keys=True))
+        return {"tiles": os.path.relpath(path, page_dir).replace(os.sep, "/")}
+
+    def _custom_template(self):
+        """
+        Whether pages are rendered from a template other than the one
+        shipped with pyvis.
+        """
+        shipped = os.path.join(os.path.dirname(__file__), "templates")
+        return (self.path != "template.html" or
+                os.path.abspath(self.template_dir) != os.path.abspath(shipped))
+
+    def get_asset_store(self, name="index.html"):
+        """
+        The :py:class:`pyvis.assets.AssetStore` the page written to `name`
+        references with cdn_resources="local".
+
+        :returns: :py:class:`pyvis.assets.AssetStore`
+        """
+        return self.assets if self.assets is not None else default_store(name)
+
+    def get_filter_index(self):
+        """
+        The inverted index behind the filter menu, mapping property values
+        to node ids. Reused while the network is unchanged when the render
+        cache is enabled.
+
+        :returns: dict, see :py:func:`pyvis.payload.filter_index`
+        """
+        key = (self.version, self.filter_max_values)
+        if self._filter_index_cache is not None and self._filter_index_cache[0] == key:
+            return self._filter_index_cache[1]
+        index = filter_index(self.nodes, self.edges, self.filter_max_values)
+        if self.render_cache:
+            self._filter_index_cache = (key, index)
+        return index
+
+    def write_html(self, name, local=True, notebook=False,open_browser=False,
+                   cache=False, data="inline", encoding="json", backend="vis"):
         """
         This method gets the data structures supporting the nodes, edges,
         and options and updates the template to write the HTML holding
         the visualization.
 
+        With cdn_resources="local" the scripts and stylesheets are written
+        under content hashed names, see get_asset_store. Pages rendered
+        from a custom template also get the lib/bindings, lib/tom-select
+        and lib/vis-9.1.2 directories next to them, which templates written
+        for earlier versions reference.
+
         To work with the old local methods local is being depricated, but not removed.
         :type name_html: str
         @param name: name of the file to save the graph as.
         @param local: Depricated parameter. Used to be used to determine how the graph needs deploy. Has been removed in favor of using the class cdn_resources instead.
         @param notebook: If true, this object will return the iframe document for use in juptyer notebook.
         @param open_browser: If true, will open a web browser with the generated graph.
+        @param cache: If true, or a pyvis.cache.DiskCache, the page is only rendered and written when the digest of its inputs differs from the one embedded in the existing file. net.html is not updated when the file is kept.
+        @param data: "inline" to embed the nodes, edges and options in the page, or "external" to write them to content hashed JSON files in a data directory next to the page, fetched by the page once loaded. "tiles" writes the laid out network as quadtree tiles instead, and the page only fetches the tiles intersecting the viewport, aggregated when zoomed out and in full detail when zoomed in, see set_tiling. Tiles are drawn with the webgl backend. External data and tiles have to be served over http(s), browsers do not fetch files from file:// pages.
+        @param encoding: "json", or "binary" to pack numeric node and edge properties like x, y, size and width into little endian typed array buffers, base64 encoded in the page or written to .bin files with external data.
+        @param backend: "vis" to draw the network with vis-network, or "webgl" for a lightweight WebGL renderer shipped with pyvis that handles networks with hundreds of thousands of nodes. The webgl backend draws every node at its x and y, which have to be precomputed, e.g. with a networkx layout, and supports panning, zooming, selecting and hovering. Labels, arrows, physics and the menus are not drawn.
         """
         getcwd_name = name
         check_html(getcwd_name)
-        self.html = self.generate_html(notebook=notebook)
+        assert data in ("inline", "external", "tiles"), \
+            "data not in ['inline', 'external', 'tiles']."
+        assert data != "tiles" or backend == "webgl", \
+            "tiles are drawn with the webgl backend"
+        if cache is True:
+            cache = default_cache
+        if cache:
+            digest = render_digest(self, notebook=notebook, data=data,
+                                   encoding=encoding, backend=backend)
+            write = not cache.lookup(getcwd_name, digest)
+        else:
+            write = True
+        if write:
+            if data == "external":
+                data_files = self.write_data_files(getcwd_name, encoding=encoding)
+            elif data == "tiles":
+                data_files = self.write_tiles(getcwd_name)
+            else:
+                data_files = None
+            self.html = self.generate_html(name=getcwd_name, notebook=notebook,
+                                           data_files=data_files,
+                                           encoding=encoding, backend=backend)
 
         if self.cdn_resources == "local":
-            if not os.path.exists("lib"):
-                os.makedirs("lib")
-            if not os.path.exists("lib/bindings"):
-                shutil.copytree(f"{os.path.dirname(__file__)}/templates/lib/bindings", "lib/bindings")
-            if not os.path.exists(os.getcwd()+"/lib/tom-select"):
-                shutil.copytree(f"{os.path.dirname(__file__)}/templates/lib/tom-select", "lib/tom-select")
-            if not os.path.exists(os.getcwd()+"/lib/vis-9.1.2"):
-                shutil.copytree(f"{os.path.dirname(__file__)}/templates/lib/vis-9.1.2", "lib/vis-9.1.2")
-            with open(getcwd_name, "w+") as out:
-                out.write(self.html)
-        elif self.cdn_resources == "in_line" or self.cdn_resources == "remote":
-            with open(getcwd_name, "w+") as out:
-                out.write(self.html)
-        else:
+            self.get_asset_store(getcwd_name).publish()
+            if self._custom_template():
+                publish_legacy(getcwd_name)
+        elif self.cdn_resources != "in_line" and self.cdn_resources != "remote":
             assert "cdn_resources is not in ['in_line','remote','local']."
+        if write:
+            with open(getcwd_name, "w+") as out:
+                out.write(embed_digest(self.html, digest) if cache else self.html)
         if open_browser: # open the saved file in a new browser window.
             webbrowser.open(getcwd_name)
 
 
+    def serve(self, port=8000, seeds=None, hops=1, limit=500,
+              host="127.0.0.1", open_browser=False, block=True):
+        """
+        Explore the network from a local server instead of shipping it
+        whole. The network and its adjacency index stay in memory, the
+        page starts with the neighbourhood of the seed nodes, and double
+        clicking a node fetches its neighbourhood on demand, so the
+        browser only holds what was explored.
+
+        >>> net.serve(port=8000, seeds=["root"], hops=2)
+
+        :param port: port of the server, 0 for any free port
+        :param seeds: ids of the nodes the page starts from, the node with
+                      the highest degree when None
+        :param hops: number of edges followed from the seeds and from a
+                     double clicked node
+        :param limit: largest number of nodes sent per request
+        :param host: address the server listens on
+        :param open_browser: open the page in a web browser
+        :param block: serve until interrupted with Ctrl-C, otherwise serve
+                      from a background thread and return right away
+
+        :type port: int
+        :type seeds: list
+        :type hops: int
+        :type limit: int
+        :type host: str
+        :type open_browser: bool
+        :type block: bool
+
+        :returns: :py:class:`pyvis.server.ExpansionServer`
+        """
+        server = ExpansionServer(self, seeds=seeds, hops=hops, limit=limit,
+                                 host=host, port=port)
+        print(server.url)
+        if open_browser:
+            webbrowser.open(server.url)
+        if block:
+            server.serve_forever()
+        else:
+            server.start()
+        return server
+
+    def serve_live(self, port=8000, host="127.0.0.1", interval=0.05,
+                   open_browser=False):
+        """
+        Serve the network from a local server streaming its changes to the
+        open pages, which apply them without reloading, keeping the camera
+        and the physics state. Nodes and edges added, updated or removed
+        with add_node, update_node, remove_node, add_edge, update_edge and
+        remove_edge are coalesced and sent every `interval` seconds. Call
+        :py:meth:`mark_dirty` after changing node or edge dicts in place.
+
+        >>> server = net.serve_live(port=8000)
+        >>> while True:
+        ...     for host, load in poll():
+        ...         net.update_node(host, value=load)
+        ...     time.sleep(1)
+
+        The server runs on background threads until ``server.shutdown()``.
+        Edges without an id are given one, the pages remove and update
+        edges by id.
+
+        :param port: port of the server, 0 for any free port
+        :param host: address the server listens on
+        :param interval: seconds between two batches of changes
+        :param open_browser: open the page in a web browser
+
+        :type port: int
+        :type host: str
+        :type interval: float
+        :type open_browser: bool
+
+        :returns: :py:class:`pyvis.live.LiveServer`
+        """
+        assert self.live is None, "the network is already served live"
+        server = LiveServer(self, host=host, port=port, interval=interval)
+        self.live = server
+        server.start()
+        print(server.url)
+        if open_browser:
+            webbrowser.open(server.url)
+        return server
+
+    def display(self, update=True):
+        """
+        Display the network in a Jupyter notebook without writing any file.
+        The first call returns the page in an in memory ``srcdoc`` iframe.
+        Later calls return only the nodes, edges and options that changed
+        since, which are applied to that view in place, keeping its camera
+        and without loading vis again. Networks using local resources are
+        displayed with in_line resources.
+
+        >>> net.display()
+        >>> net.update_node(0, color="red")
+        >>> net.display()
+
+        The returned objects are displayed when they are the last
+        expression of a cell, otherwise pass them to
+        ``IPython.display.display``.
+
+        :param update: send the changes to the view displayed last, or
+                       display a new view when False, e.g. after changing
+                       the heading or the size of the network
+
+        :type update: bool
+
+        :returns: IPython display object
+        """
+        if self.notebook_view is None or not update:
+            self.notebook_view = NotebookView(self)
+            return self.notebook_view.frame()
+        return self.notebook_view.changes()
+
     def show(self, name, local=True,notebook=True):
         """
         Writes a static HTML file and saves it locally before opening.
+        In a notebook :py:meth:`display` avoids the file altogether.
 
         :param: name: the name of the html file to save as
         :type name: str
@@ -589,7 +1360,7 @@ class Network(object):
         """
         self.path = template_file
         self.template_dir = template_directory
-        self.templateEnv = Environment(loader=FileSystemLoader(self.template_dir))
+        self.templateEnv = _shared_environment(self.template_dir)
 
     def from_DOT(self, dot):
         """
@@ -643,6 +1414,20 @@ class Network(object):
                     a_list[dest].add(source)
         return a_list
 
+    def get_adjacency_index(self, weight=None):
+        """
+        Build an integer indexed, undirected adjacency structure of the
+        network in a single pass over the nodes and edges. This is the
+        structure the clustering and reduction methods run on.
+
+        :param weight: name of the edge attribute holding the edge weight.
+                       Defaults to the first of value, width or weight.
+        :type weight: str
+
+        :returns: :py:class:`pyvis.algorithms.AdjacencyIndex`
+        """
+        return AdjacencyIndex(self.nodes, self.edges, weight=weight)
+
     def neighbors(self, node):
         """
         Given a node id, return the set of neighbors of this particular node.
@@ -654,7 +1439,7 @@ class Network(object):
         """
         assert (isinstance(node, str) or isinstance(node, int)
                 ), "error: expected int or str for node but got %s" % type(node)
-        assert (node in self.node_ids), "error: %s node not in network" % node
+        assert (node in self.node_map), "error: %s node not in network" % node
         return self.get_adj_list()[node]
 
     def from_nx(self, nx_graph, node_size_transf=(lambda x: x), edge_weight_transf=(lambda x: x),
@@ -719,6 +1504,201 @@ class Network(object):
                 nodes[node]['size'] = default_node_size
             self.add_node(node, **nodes[node])
 
+    def cluster(self, method="louvain", min_size=2, weight=None, seed=None,
+                **kwargs):
+        """
+        Detect communities in Python and return a coarse network in which
+        every community is collapsed into a single cluster node, sized by
+        its number of members. Edges between clusters are aggregated into
+        one edge per cluster pair.
+
+        The members of each cluster are embedded in the generated page and
+        a cluster is expanded in place by double clicking it, so the
+        browser only holds the coarse view plus the clusters the user
+        opened.
+
+        >>> coarse = net.cluster(method="label_propagation")
+        >>> coarse.show("clusters.html")
+
+        :param method: the community detection method, either 'louvain' or
+                       'label_propagation'
+        :param min_size: communities smaller than this keep their nodes
+        :param weight: name of the edge attribute holding the edge weight
+        :param seed: random seed for reproducible communities
+        :param kwargs: passed through to the community detection method
+
+        :type method: str
+        :type min_size: int
+        :type weight: str
+        :type seed: int
+
+        :returns: :py:class:`Network`
+        """
+        assert method in COMMUNITY_METHODS, \
+            "method not in %s" % list(COMMUNITY_METHODS)
+        index = self.get_adjacency_index(weight=weight)
+        labels = COMMUNITY_METHODS[method](index, seed=seed, **kwargs)
+        nodes, edges, cluster_data = cluster_graph(
+            self.nodes, self.edges, labels, min_size=min_size,
+            directed=self.directed)
+        net = self._derive(nodes, edges)
+        net.cluster_data = cluster_data
+        return net
+
+    def subgraph(self, nodes):
+        """
+        Return a new network holding the given nodes and every edge between
+        them. Node and edge properties are copied and all other settings of
+        this network are kept. This runs in O(N + E).
+
+        :param nodes: the ids of the nodes to keep
+        :type nodes: iterable
+
+        :returns: :py:class:`Network`
+        """
+        keep = set(nodes)
+        return self._derive(
+            [dict(n) for n in self.nodes if n["id"] in keep],
+            [dict(e) for e in self.edges
+             if e["from"] in keep and e["to"] in keep])
+
+    def k_core(self, k):
+        """
+        Return the k-core of the network, the largest subgraph in which every
+        node is connected to at least `k` other nodes of the subgraph.
+
+        >>> core = net.k_core(3)
+
+        :param k: the minimum degree inside the core
+        :type k: int
+
+        :returns: :py:class:`Network`
+        """
+        index = self.get_adjacency_index()
+        return self._subgraph_at(index, algorithms.k_core(index, k))
+
+    def top_k(self, k, by="degree", weight=None):
+        """
+        Return the subgraph induced by the `k` most connected nodes.
+
+        >>> hubs = net.top_k(100, by="weight")
+
+        :param k: the number of nodes to keep
+        :param by: rank nodes by 'degree' or by summed edge 'weight'
+        :param weight: name of the edge attribute holding the edge weight
+
+        :type k: int
+        :type by: str
+        :type weight: str
+
+        :returns: :py:class:`Network`
+        """
+        index = self.get_adjacency_index(weight=weight)
+        return self._subgraph_at(index, algorithms.top_k(index, k, by=by))
+
+    def sample(self, budget, method="forest_fire", seed=None, **kwargs):
+        """
+        Return the subgraph induced by a sample of at most `budget` nodes.
+        Both sampling methods follow edges, so the sample keeps much more
+        of the local structure than picking nodes uniformly.
+
+        >>> small = net.sample(2000, method="random_walk", seed=42)
+
+        :param budget: the maximum number of nodes in the sample
+        :param method: either 'forest_fire' or 'random_walk'
+        :param seed: random seed for a reproducible sample
+        :param kwargs: passed through to the sampling method, `forward` for
+                       forest fire and `restart` for the random walk
+
+        :type budget: int
+        :type method: str
+        :type seed: int
+
+        :returns: :py:class:`Network`
+        """
+        assert method in SAMPLING_METHODS, \
+            "method not in %s" % list(SAMPLING_METHODS)
+        index = self.get_adjacency_index()
+        positions = SAMPLING_METHODS[method](index, budget, seed=seed, **kwargs)
+        return self._subgraph_at(index, positions)
+
+    def drop_isolates(self):
+        """
+        Return a copy of the network without the nodes that have no edges.
+
+        :returns: :py:class:`Network`
+        """
+        index = self.get_adjacency_index()
+        return self._subgraph_at(
+            index, [i for i in range(len(index)) if index.degree(i)])
+
+    def sparsify(self, method="top_k", weight=None, **kwargs):
+        """
+        Return a copy of the network with only the structurally important
+        edges. Every node is kept, only edges are dropped, which typically
+        removes the large majority of edges of dense similarity graphs.
+        The selection is vectorized with numpy over the edge arrays.
+
+        >>> backbone = net.sparsify("disparity", alpha=0.01)
+        >>> light = net.sparsify("spanning_forest", k=2)
+
+        :param method: 'top_k' keeps the k heaviest edges of every node,
+                       'disparity' keeps the disparity filter backbone at
+                       significance alpha and 'spanning_forest' keeps a
+                       maximum spanning forest plus the k heaviest edges
+                       of every node.
+        :param weight: name of the edge attribute holding the edge weight.
+                       Defaults to the first of value, width or weight.
+        :param k: number of edges kept per node by 'top_k' and
+                  'spanning_forest'
+        :param alpha: significance level of the 'disparity' filter
+
+        :type method: str
+        :type weight: str
+        :type k: int
+        :type alpha: float
+
+        :returns: :py:class:`Network`
+        """
+        assert method in SPARSIFY_METHODS, \
+            "method not in %s" % list(SPARSIFY_METHODS)
+        keep = SPARSIFY_METHODS[method](
+            *edge_arrays(self.nodes, self.edges, weight=weight), **kwargs)
+        return self._derive(
+            [dict(n) for n in self.nodes],
+            [dict(e) for e, kept in zip(self.edges, keep.tolist()) if kept])
+
+    def _subgraph_at(self, index, positions):
+        """
+        Subgraph induced by node positions of an adjacency index.
+        """
+        return self.subgraph(index.ids[i] for i in positions)
+
+    def _derive(self, nodes, edges):
+        """
+        Return a copy of this network holding the given nodes and edges but
+        sharing every other setting.
+        """
+        net = copy.copy(self)
+        net.nodes = nodes
+        net.edges = edges
+        net.node_ids = [n["id"] for n in nodes]
+        net.node_map = {n["id"]: n for n in nodes}
+        net._node_positions = None
+        net.options = copy.deepcopy(self.options)
+        net.cluster_data = {}
+        net.html = ""
+        net._render_cache = None
+        net._filter_index_cache = None
+        net._link_titles = set(n["id"] for n in nodes if _has_link(n))
+        net._node_chunks = ChunkedJSON(self._node_chunks.chunk_size)
+        net._edge_chunks = ChunkedJSON(self._edge_chunks.chunk_size)
+        net.live = None
+        net.notebook_view = None
+        net._edge_index = None
+        net._edge_aggregates = {}
+        return net
+
     def get_nodes(self):
         """
         This method returns an iterable list of node ids
@@ -900,6 +1880,106 @@ class Network(object):
         self.options.edges.smooth.enabled = True
         self.options.edges.smooth.type = smooth_type
 
+    def bundle_edges(self, method="fdeb", **kwargs):
+        """
+        Compute static edge curves in Python and switch the global smooth
+        type away from 'dynamic'. Dynamic smooth edges add an invisible
+        support node per edge to the physics simulation, static curves do
+        not, so the browser only simulates the real nodes.
+
+        The 'fdeb' method runs force directed edge bundling over the x and
+        y positions of the nodes and bends every edge towards its bundle.
+        The 'parallel' method only fans out parallel edges between the same
+        pair of nodes and needs no positions.
+
+        >>> net.bundle_edges("fdeb", cycles=4)
+
+        :param method: either 'fdeb' or 'parallel'
+        :param kwargs: passed through to the bundling method, see
+                       :py:mod:`pyvis.bundling`
+
+        :type method: str
+        """
+        assert method in BUNDLING_METHODS, \
+            "method not in %s" % list(BUNDLING_METHODS)
+        smooth = BUNDLING_METHODS[method](self.nodes, self.edges, **kwargs)
+        with self._mutating():
+            for e, setting in zip(self.edges, smooth):
+                if setting is not None:
+                    e["smooth"] = setting
+            self._edge_chunks.invalidate()
+            self._changed()
+            if self.live is not None:
+                self.live.reset()
+        if isinstance(self.options, dict):
+            self.options.setdefault("edges", {}).setdefault("smooth", {})
+            self.options["edges"]["smooth"]["type"] = "continuous"
+        else:
+            self.options.edges.smooth.type = "continuous"
+
+    def optimize_for_scale(self, profile=None):
+        """
+        Apply a documented performance profile to the options, picked from
+        the size and degree distribution of the network unless given.
+
+        - interactive: up to 1000 nodes and 5000 edges. Only replaces
+          dynamic smooth edges, which add a physics support node per edge.
+        - large: up to 20000 nodes and 100000 edges, or a hub with more
+          than 500 edges. Straight edges, edges hidden on drag, no O(n^2)
+          improvedLayout, 400 stabilization iterations and labels only
+          drawn once they are readable. The O(n^2) repulsion solver is
+          replaced by barnesHut; any other solver is left alone.
+        - huge: anything bigger. Additionally hides nodes on drag, uses an
+          adaptive timestep and stabilizes for 150 iterations.
+
+        Dense networks (average degree above 20) also hide edges on drag
+        regardless of the profile.
+
+        Every changed option is recorded in `scale_overrides` as
+        ``{path: (previous value, new value)}``.
+
+        >>> net.optimize_for_scale()
+        'large'
+        >>> net.scale_overrides["layout.improvedLayout"]
+        (True, False)
+
+        :param profile: one of 'interactive', 'large' or 'huge'
+        :type profile: str
+
+        :returns: the name of the applied profile
+        """
+        n, m = self.num_nodes(), self.num_edges()
+        degree = defaultdict(int)
+        for e in self.edges:
+            degree[e["from"]] += 1
+            degree[e["to"]] += 1
+        max_degree = max(degree.values()) if degree else 0
+        mean_degree = 2.0 * m / n if n else 0
+        if profile is None:
+            if n > 20000 or m > 100000:
+                profile = "huge"
+            elif n > 1000 or m > 5000 or max_degree > 500:
+                profile = "large"
+            else:
+                profile = "interactive"
+        assert profile in SCALE_PROFILES, \
+            "profile not in %s" % list(SCALE_PROFILES)
+
+        settings = dict(SCALE_PROFILES[profile])
+        if mean_degree > 20:
+            settings["interaction.hideEdgesOnDrag"] = True
+        if profile != "interactive" and \
+                get_option(self.options, "physics.solver") == "repulsion":
+            settings["physics.solver"] = "barnesHut"
+        overrides = {}
+        for path in sorted(settings):
+            previous = set_option(self.options, path, settings[path])
+            if previous != settings[path]:
+                overrides[path] = (previous, settings[path])
+        self.scale_profile = profile
+        self.scale_overrides = overrides
+        return profile
+
     def toggle_hide_edges_on_drag(self, status):
         """
         Displays or hides edges while dragging the network. This makes
@@ -993,6 +2073,87 @@ class Network(object):
         """
         self.options.physics.toggle_stabilization(status)
 
+    def set_progressive_loading(self, first=2000, chunk=5000):
+        """
+        Draw the page with the `first` nodes of highest degree and the
+        edges between them, then add the remaining nodes and edges in
+        chunks of `chunk` nodes while the browser is idle, reporting the
+        progress in the loading bar. The first paint of large networks
+        no longer waits for every node.
+
+        >>> net.set_progressive_loading(first=1000)
+
+        :param first: number of nodes drawn right away
+        :param chunk: number of nodes added per idle callback
+
+        :type first: int
+        :type chunk: int
+        """
+        assert first > 0 and chunk > 0
+        assert not self.use_DOT, "progressive loading is not supported for DOT networks"
+        self.progressive = {"first": first, "chunk": chunk}
+
+    def set_tiling(self, max_nodes=5000, resolution=32, max_depth=12):
+        """
+        Settings of the tiles written by ``write_html(data="tiles")``. The
+        laid out network is split into quadtree tiles of at most
+        `max_nodes` nodes, and the page only loads the tiles intersecting
+        the viewport as the user pans and zooms. Zoomed out, the tiles
+        that were split are drawn as `resolution` x `resolution` cells of
+        merged nodes, so memory and load time depend on what is visible
+        rather than on the size of the network.
+
+        >>> net.set_tiling(max_nodes=2000)
+        >>> net.write_html("graph.html", backend="webgl", data="tiles")
+
+        :param max_nodes: largest number of nodes of a tile in full detail
+        :param resolution: cells per side of a merged tile, a power of two
+        :param max_depth: deepest level of the quadtree
+
+        :type max_nodes: int
+        :type resolution: int
+        :type max_depth: int
+        """
+        assert max_nodes > 0
+        assert resolution > 0 and resolution & (resolution - 1) == 0, \
+            "resolution has to be a power of two"
+        self.tiling = {"max_nodes": max_nodes, "resolution": resolution,
+                       "max_depth": max_depth}
+
+    def set_idle_governor(self, freeze_physics=True, pause_hidden=True,
+                          max_fps=None):
+        """
+        Limit the CPU a page uses once it is idle, e.g. for dashboards that
+        stay open for days. Stored in the `idle` section of the options.
+
+        >>> net.set_idle_governor(max_fps=20)
+
+        :param freeze_physics: turn physics off once the network stabilized,
+                               it is turned back on while dragging nodes
+        :param pause_hidden: stop the simulation and throttle redraws to one
+                             frame per second in background tabs
+        :param max_fps: cap the redraw rate of the page, None for no cap
+
+        :type freeze_physics: bool
+        :type pause_hidden: bool
+        :type max_fps: int
+        """
+        idle = Idle(freeze_physics, pause_hidden, max_fps)
+        if isinstance(self.options, dict):
+            self.options["idle"] = idle.__dict__
+        else:
+            self.options.idle = idle
+
+    def get_idle_governor(self):
+        """
+        Return the idle governor settings of the options.
+
+        :returns: :py:class:`pyvis.options.Idle`
+        """
+        if isinstance(self.options, dict):
+            return Idle(**self.options.get("idle", {}))
+        return getattr(self.options, "idle", Idle())
+
     def set_options(self, options):
         """
         Overrides the default options object passed to the VisJS framework.
@@ -0,0 +1,113 @@
+# displaying networks in jupyter notebooks from memory
+import html
+import json
+import uuid
+
+from IPython.display import HTML, Javascript
+
+
+class NotebookView(object):
+    """
+    A network displayed in a notebook as an in memory ``srcdoc`` iframe,
+    along with the nodes, edges and options it currently shows, so later
+    changes can be sent to it as a diff instead of a new page. The diff is
+    applied by the applyLiveBatch function of the page, as for the batches
+    of the live server.
+
+    Usually created by :py:meth:`pyvis.network.Network.display`.
+    """
+
+    def __init__(self, net):
+        self.net = net
+        self.id = "pyvis-" + uuid.uuid4().hex[:12]
+        self.nodes = {}
+        self.edges = {}
+        self.options = None
+
+    def frame(self):
+        """
+        The iframe holding the whole page.
+
+        :returns: IPython.display.HTML
+        """
+        net = self.net
+        net._ensure_edge_ids()
+        previous = net.cdn_resources
+        if previous == "local":
+            # relative asset urls do not resolve inside a srcdoc frame
+            net.cdn_resources = "in_line"
+        try:
+            page = net.generate_html()
+        finally:
+            net.cdn_resources = previous
+        self.nodes, self.edges, self.options = self._state()
+        return HTML(
+            '<div><iframe id="%s" srcdoc="%s" width="%s" height="%s" '
+            'style="border: none;"></iframe></div>' % (
+                self.id, html.escape(page, quote=True),
+                html.escape(net.width, quote=True),
+                html.escape(net.height, quote=True)))
+
+    def diff(self):
+        """
+        The changes since the view was last updated, in the format of the
+        live server batches, and remembered as displayed.
+
+        :returns: dict, empty when nothing changed
+        """
+        self.net._ensure_edge_ids()
+        nodes, edges, options = self._state()
+        batch = {}
+        for kind, old, new in (("nodes", self.nodes, nodes),
+                               ("edges", self.edges, edges)):
+            update = [json.loads(text) for key, text in new.items()
+                      if old.get(key) != text]
+            remove = [json.loads(key) for key in old if key not in new]
+            if update or remove:
+                batch[kind] = {"update": update, "remove": remove}
+        if options != self.options:
+            batch["options"] = json.loads(options)
+        self.nodes, self.edges, self.options = nodes, edges, options
+        return batch
+
+    def changes(self):
+        """
+        Script applying the changes to the displayed view once its page
+        is loaded. Views of an earlier session of the notebook are gone,
+        the script then does nothing.
+
+        :returns: IPython.display.Javascript
+        """
+        batch = self.diff()
+        return Javascript("""
+(function () {
+  var frame = document.getElementById(%s);
+  var batch = %s;
+  if (!frame || !Object.keys(batch).length) {
+    return;
+  }
+  function apply() {
+    var page = frame.contentWindow;
+    page.applyLiveBatch(batch);
+    if (batch.options) {
+      page.network.setOptions(batch.options);
+    }
+  }
+  if (frame.contentWindow && frame.contentWindow.network) {
+    apply();
+  } else {
+    frame.addEventListener("load", apply);
+  }
+})();
+""" % (json.dumps(self.id), json.dumps(batch, default=str)))
+
+    def _state(self):
+        """
+        The nodes and edges as JSON text keyed by their JSON encoded id,
+        and the options.
+        """
+        def encode(items):
+            return {json.dumps(item["id"]): json.dumps(item, sort_keys=True, default=str)
+                    for item in items}
+        return (encode(self.net.nodes), encode(self.net.edges),
+                self.net.get_network_data()[5])
@@ -107,6 +107,33 @@ class Configure(object):
         return self.__dict__[item]
 
 
+class Idle(object):
+    """
+    Keeps long running pages from burning CPU once the network has
+    settled. Applied by the page template rather than passed to VisJS.
+
+    - freeze_physics: turn physics off once the network stabilized and
+      back on while the user drags nodes.
+    - pause_hidden: stop the simulation and throttle redraws to one frame
+      per second while the page is in a background tab.
+    - max_fps: cap the redraw rate of the page.
+    """
+
+    def __repr__(self):
+        return str(self.__dict__)
+
+    def __init__(self, freeze_physics=False, pause_hidden=False, max_fps=None):
+        self.freeze_physics = freeze_physics
+        self.pause_hidden = pause_hidden
+        self.max_fps = max_fps
+
+    def __getitem__(self, item):
+        return self.__dict__[item]
+
+    def enabled(self):
+        return bool(self.freeze_physics or self.pause_hidden or self.max_fps)
+
+
 class Layout(object):
     """
     Acts as the camera that looks on the canvas.
@@ -173,6 +200,97 @@ class Layout(object):
 
     
 
+# Option overrides applied by Network.optimize_for_scale, keyed by profile.
+# Every key is a dotted path into the vis options object.
+SCALE_PROFILES = {
+    # up to ~1000 nodes: keep the look, only drop the per edge support nodes
+    "interactive": {
+        "edges.smooth.type": "continuous",
+    },
+    # up to ~20000 nodes: straight edges, no O(n^2) initial layout, fewer
+    # stabilization iterations and labels only when readable
+    "large": {
+        "edges.smooth.enabled": False,
+        "interaction.hideEdgesOnDrag": True,
+        "layout.improvedLayout": False,
+        "physics.stabilization.iterations": 400,
+        "physics.stabilization.updateInterval": 100,
+        "nodes.scaling.label.drawThreshold": 8,
+        "edges.scaling.label.drawThreshold": 8,
+    },
+    # beyond that: hide everything while dragging and stabilize briefly
+    "huge": {
+        "edges.smooth.enabled": False,
+        "interaction.hideEdgesOnDrag": True,
+        "interaction.hideNodesOnDrag": True,
+        "layout.improvedLayout": False,
+        "physics.adaptiveTimestep": True,
+        "physics.stabilization.iterations": 150,
+        "physics.stabilization.updateInterval": 200,
+        "nodes.scaling.label.drawThreshold": 12,
+        "edges.scaling.label.drawThreshold": 12,
+    },
+}
+
+
+def get_option(options, path, default=None):
+    """
+    Read the option at the dotted `path` from either an :class:`Options`
+    instance or a plain options dictionary.
+
+    :param options: the options object to read
+    :param path: dotted option path, e.g. 'physics.solver'
+    :param default: returned when the option is not set
+
+    :returns: the option value or `default`
+    """
+    current = options
+    for key in path.split("."):
+        if isinstance(current, dict):
+            if key not in current:
+                return default
+            current = current[key]
+        elif hasattr(current, key):
+            current = getattr(current, key)
+        else:
+            return default
+    return current
+
+
+def set_option(options, path, value):
+    """
+    Set the option at the dotted `path` on either an :class:`Options`
+    instance or a plain options dictionary, creating missing levels.
+
+    :param options: the options object to change
+    :param path: dotted option path, e.g. 'physics.stabilization.iterations'
+    :param value: the new value
+
+    :returns: the previous value, None if the option was not set
+    """
+    keys = path.split(".")
+    current = options
+    for key in keys[:-1]:
+        if isinstance(current, dict):
+            current = current.setdefault(key, {})
+        else:
+            if not hasattr(current, key):
+                if key == "layout":
+                    layout = Layout()
+                    layout.hierarchical.enabled = False
+                    setattr(current, key, layout)
+                else:
+                    setattr(current, key, {})
+            current = getattr(current, key)
+    if isinstance(current, dict):
+        previous = current.get(keys[-1])
+        current[keys[-1]] = value
+    else:
+        previous = getattr(current, keys[-1], None)
+        setattr(current, keys[-1], value)
+    return previous
+
+
 class Options(object):
     """
     Represents the global options of the network.
@@ -183,6 +301,8 @@ class Options(object):
         - interaction
         - physics
         - edges
+
+    as well as the idle governor applied by the page template.
     
     The JSON representation of this object is directly passed
     in to the VisJS framework.
@@ -202,6 +322,7 @@ class Options(object):
         self.configure = Configure()
         self.physics = Physics()
         self.edges = EdgeOptions()
+        self.idle = Idle()
 
     def set(self, new_options):
         """
@@ -226,6 +347,9 @@ class Options(object):
         
 
     def to_json(self):
+        options = dict(self.__dict__)
+        # the idle governor is applied by the template, VisJS does not know it
+        options.pop("idle", None)
         return json.dumps(
-            self, default=lambda o: o.__dict__,
+            options, default=lambda o: o.__dict__,
             sort_keys=True, indent=4)
@@ -0,0 +1,265 @@
+# preparation of the data structures embedded in the generated pages
+import base64
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from array import array
+from collections import Counter, defaultdict
+
+# node properties managed by the page itself, not offered for filtering
+HIDDEN_NODE_PROPERTIES = ("hidden", "savedLabel", "hiddenLabel")
+
+
+def filter_key(value):
+    """
+    The string a property value is shown and matched as in the filter
+    menu, identical to JavaScript's ``value.toString()`` for scalars.
+    Returns None for values that can not be filtered on, like dicts.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    return None
+
+
+def filter_index(nodes, edges, max_values=500):
+    """
+    Build the inverted index behind the filter menu: for nodes and edges,
+    every property maps each of its values to the ids of the nodes it
+    selects. Values of edge properties select both endpoints.
+
+    Properties with more than `max_values` distinct values only keep their
+    most frequent values, so a unique property like `id` or `title` does
+    not inflate the page.
+
+    :param nodes: node dictionaries of the network
+    :param edges: edge dictionaries of the network
+    :param max_values: cap on the distinct values listed per property
+
+    :returns: dict of the form ``{"node": {prop: {value: [ids]}},
+              "edge": {prop: {value: [ids]}}}``
+    """
+    index = {"node": defaultdict(lambda: defaultdict(list)),
+             "edge": defaultdict(lambda: defaultdict(list))}
+    for n in nodes:
+        for prop, value in n.items():
+            key = filter_key(value)
+            if key is not None and prop not in HIDDEN_NODE_PROPERTIES:
+                index["node"][prop][key].append(n["id"])
+    for e in edges:
+        for prop, value in e.items():
+            key = filter_key(value)
+            if key is not None:
+                selected = index["edge"][prop][key]
+                selected.append(e["from"])
+                selected.append(e["to"])
+
+    result = {}
+    for item, properties in index.items():
+        result[item] = {}
+        for prop, values in properties.items():
+            if item == "edge":
+                values = {key: list(dict.fromkeys(ids))
+                          for key, ids in values.items()}
+            if len(values) > max_values:
+                counts = Counter({key: len(ids) for key, ids in values.items()})
+                values = {key: values[key]
+                          for key, _ in counts.most_common(max_values)}
+            result[item][prop] = dict(values)
+    return result
+
+
+class EncodedJSON(object):
+    """
+    A list already encoded as JSON text. Templates rendered with
+    :py:func:`dumps` as their json.dumps_function splice the text in as is
+    through the `tojson` filter, while `length` still counts the items.
+    """
+
+    def __init__(self, text, length):
+        self.text = text
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+
+def dumps(obj, **kwargs):
+    """
+    Drop in replacement for :py:func:`json.dumps` that passes
+    :py:class:`EncodedJSON` through unchanged.
+    """
+    if isinstance(obj, EncodedJSON):
+        return obj.text
+    return json.dumps(obj, **kwargs)
+
+
+class ChunkedJSON(object):
+    """
+    JSON encoding of a list kept in fixed size chunks of items. Changes
+    mark the chunks holding the changed positions dirty, and only dirty
+    chunks are encoded again, the others are spliced in from the cache.
+    """
+
+    def __init__(self, chunk_size=10000):
+        """
+        :param chunk_size: number of items encoded together
+        :type chunk_size: int
+        """
+        assert chunk_size > 0
+        self.chunk_size = chunk_size
+        # encoded text and item count of every chunk, None when dirty
+        self.chunks = []
+
+    def invalidate(self, start=0, stop=None):
+        """
+        Mark the chunks holding the items from `start` up to `stop` dirty.
+        Without `stop` every chunk from `start` on is dropped, as needed
+        when items are appended, removed or reordered.
+        """
+        first = start // self.chunk_size
+        if stop is None:
+            del self.chunks[first:]
+            return
+        last = (max(stop, start + 1) - 1) // self.chunk_size
+        for c in range(first, min(last + 1, len(self.chunks))):
+            self.chunks[c] = None
+
+    def encode(self, items, **kwargs):
+        """
+        Encode `items` with :py:func:`json.dumps`, reusing every clean
+        chunk. The text is identical to encoding the whole list at once.
+
+        :param items: the list to encode
+        :param kwargs: passed to :py:func:`json.dumps`
+
+        :returns: :py:class:`EncodedJSON`
+        """
+        size = self.chunk_size
+        count = (len(items) + size - 1) // size
+        del self.chunks[count:]
+        self.chunks.extend([None] * (count - len(self.chunks)))
+        for c in range(count):
+            length = min(size, len(items) - c * size)
+            # a chunk whose item count changed unnoticed is stale as well
+            if self.chunks[c] is None or self.chunks[c][1] != length:
+                part = items[c * size:c * size + length]
+                self.chunks[c] = (json.dumps(part, **kwargs)[1:-1], length)
+        text = "[" + ", ".join(chunk for chunk, _ in self.chunks) + "]"
+        return EncodedJSON(text, len(items))
+
+
+def write_data_file(directory, kind, content, ext="json"):
+    """
+    Write `content` to `directory` under a name carrying a hash of the
+    content, like ``nodes.<digest>.json``. Pages holding the same data
+    share the file and an existing file is never rewritten.
+
+    :param directory: where the data files are kept
+    :param kind: prefix of the file name, e.g. 'nodes'
+    :param content: encoded JSON text, or bytes
+    :param ext: extension of the file name
+
+    :returns: path of the file
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    path = os.path.join(directory, "%s.%s.%s" % (kind, digest, ext))
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    return path
+
+
+# numeric properties packed into typed arrays by the binary encoding
+NUMERIC_COLUMNS = {
+    "nodes": ("x", "y", "size", "value", "mass", "level"),
+    "edges": ("width", "value"),
+}
+
+# dtype -> array typecode of the little endian buffers
+COLUMN_TYPES = {"float32": "f", "int32": "i"}
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def pack_columns(items, names):
+    """
+    Pack the numeric properties `names` of `items` into little endian
+    buffers the browser reads as Float32Array or Int32Array views. A
+    property set to integers on every item becomes an int32 column, any
+    other numeric property a float32 column with NaN for items lacking it.
+    Properties holding anything but numbers are left in the items.
+
+    >>> items, columns = pack_columns(net.nodes, ("x", "y"))
+
+    :param items: node or edge dictionaries
+    :param names: the properties to pack
+
+    :returns: the items without the packed properties, and a dict mapping
+              every packed property to its dtype and buffer
+    """
+    columns = {}
+    for name in names:
+        values = [item.get(name) for item in items]
+        present = [v for v in values if v is not None]
+        if not present or not all(_is_number(v) for v in present):
+            continue
+        if len(present) == len(values) and all(
+                isinstance(v, int) and -2 ** 31 <= v < 2 ** 31 for v in values):
+            dtype = "int32"
+        else:
+            dtype = "float32"
+            values = [float("nan") if v is None else v for v in values]
+        packed = array(COLUMN_TYPES[dtype], values)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        columns[name] = (dtype, packed.tobytes())
+    if columns:
+        items = [{k: v for k, v in item.items() if k not in columns}
+                 for item in items]
+    return items, columns
+
+
+def inline_columns(columns):
+    """
+    Column descriptions embedding the buffers of :py:func:`pack_columns`
+    as base64 text.
+    """
+    return {name: {"dtype": dtype, "base64": base64.b64encode(data).decode("ascii")}
+            for name, (dtype, data) in columns.items()}
+
+
+def progressive_order(nodes, edges):
+    """
+    Order nodes by decreasing degree and edges by the position of their
+    later endpoint in that order, so a page loading the nodes chunk by
+    chunk shows the hubs first and can add every edge together with the
+    chunk completing it.
+
+    :param nodes: node dictionaries
+    :param edges: edge dictionaries
+
+    :returns: the reordered nodes and edges, as new lists
+    """
+    degree = Counter()
+    for e in edges:
+        degree[e["from"]] += 1
+        degree[e["to"]] += 1
+    nodes = sorted(nodes, key=lambda n: -degree[n["id"]])
+    position = {n["id"]: i for i, n in enumerate(nodes)}
+    last = len(nodes)
+    edges = sorted(edges, key=lambda e: max(position.get(e["from"], last),
+                                            position.get(e["to"], last)))
+    return nodes, edges
@@ -0,0 +1,231 @@
+# exploring networks too large to ship whole from a local server
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .algorithms import neighborhood, top_k
+from .assets import package_files
+
+
+class ExpansionServer(object):
+    """
+    Local http server keeping a network and its adjacency index in memory.
+    The page it serves starts with the neighbourhood of the seed nodes, and
+    double clicking a node fetches the neighbourhood of that node from
+    ``/expand?node=<id>&hops=<k>&limit=<n>``, which the page merges into
+    its data sets. The browser only ever holds what was explored.
+
+    The index is rebuilt on the next request whenever the version of the
+    network changed, so nodes and edges added or removed with the Network
+    methods are picked up. Direct changes to ``net.nodes`` or
+    ``net.edges`` need :py:meth:`pyvis.network.Network.mark_dirty`. The
+    network is read with the lock of its live server held, when one is
+    attached, so the page and the live view can share a network. Edges
+    without an "id" are given one, as the page tells them apart by id.
+
+    Usually started with :py:meth:`pyvis.network.Network.serve`.
+
+    >>> server = ExpansionServer(net, seeds=["root"], port=8000)
+    >>> server.serve_forever()
+    """
+
+    def __init__(self, net, seeds=None, hops=1, limit=500,
+                 host="127.0.0.1", port=8000):
+        """
+        :param net: the network to explore
+        :param seeds: ids of the nodes the page starts from, the node with
+                      the highest degree when None
+        :param hops: number of edges followed from a node by default
+        :param limit: largest number of nodes returned per request
+        :param host: address the server listens on
+        :param port: port the server listens on, 0 for any free port
+
+        :type seeds: list
+        :type hops: int
+        :type limit: int
+        :type host: str
+        :type port: int
+        """
+        assert not net.use_DOT, "DOT networks can not be served"
+        assert seeds is None or all(n_id in net.node_map for n_id in seeds), \
+            "non existent seed node"
+        self.net = net
+        self.seed_ids = seeds
+        self.hops = hops
+        self.limit = limit
+        # requests are served from several threads, always taking the lock
+        # of the network first
+        self.lock = threading.RLock()
+        self.version = None
+        self._sync()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+
+    def _sync(self):
+        """
+        Rebuild the index, and drop the rendered page, when the network
+        changed since they were built.
+        """
+        with self.net._mutating(), self.lock:
+            if self.version == self.net.version:
+                return
+            # ids survive removals, positions in the edge list do not
+            self.net._ensure_edge_ids()
+            self.index = self.net.get_adjacency_index()
+            # query parameters arrive as strings
+            self.ids = {str(n_id): i for i, n_id in enumerate(self.index.ids)}
+            if self.seed_ids is None:
+                # start from the best connected node
+                self.seeds = top_k(self.index, 1)
+            else:
+                self.seeds = [self.index.position[n_id] for n_id in self.seed_ids
+                              if n_id in self.index.position]
+            self.html = None
+            self.version = self.net.version
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return "http://%s:%d/" % (host, port)
+
+    def expand(self, positions, hops=None, limit=None, known=()):
+        """
+        The nodes within `hops` edges of `positions`, at most `limit` of
+        them, and the edges between them or to the `known` nodes the page
+        already holds, as JSON ready dicts. Every edge carries its "id",
+        so the page never adds one twice.
+
+        :param known: positions of the nodes already drawn
+
+        :returns: dict with the nodes and edges
+        """
+        hops = self.hops if hops is None else hops
+        limit = self.limit if limit is None else limit
+        with self.net._mutating(), self.lock:
+            self._sync()
+            found = neighborhood(self.index, positions, hops, limit)
+            kept = set(found).union(known)
+            edge_ids = set()
+            for u in found:
+                for v, k in zip(self.index.neighbors[u], self.index.edge_ids[u]):
+                    if v in kept:
+                        edge_ids.add(k)
+            edges = [self.net.edges[k] for k in sorted(edge_ids)]
+            return {"nodes": [self.net.nodes[i] for i in found], "edges": edges}
+
+    def expand_node(self, node, hops=None, limit=None, known=()):
+        """
+        :py:meth:`expand` for a node id and known node ids as received by
+        the handler, as strings or JSON values.
+
+        :returns: dict with the nodes and edges, None for an unknown node
+        """
+        with self.net._mutating(), self.lock:
+            self._sync()
+            if str(node) not in self.ids:
+                return None
+            known = [self.ids[str(n_id)] for n_id in known if str(n_id) in self.ids]
+            return self.expand([self.ids[str(node)]], hops, limit, known)
+
+    def page(self):
+        """
+        The page holding the neighbourhood of the seeds, rendered once per
+        version of the network.
+        """
+        with self.net._mutating(), self.lock:
+            self._sync()
+            if self.html is None:
+                data = self.expand(self.seeds)
+                seed = self.net._derive([dict(n) for n in data["nodes"]],
+                                        [dict(e) for e in data["edges"]])
+                # the assets are served from the package, see _handler
+                seed.assets = None
+                self.html = seed.generate_html(
+                    expand={"url": "expand", "hops": self.hops, "limit": self.limit})
+            return self.html
+
+    def _handler(self):
+        server = self
+        assets = {"/lib/" + name: path for name, path in package_files().items()}
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path in ("/", "/index.html"):
+                    self._send(server.page().encode("utf-8"), "text/html")
+                elif url.path == "/expand":
+                    self._expand(query, ())
+                elif url.path in assets:
+                    with open(assets[url.path], "rb") as f:
+                        content = f.read()
+                    kind = "text/css" if url.path.endswith(".css") else "text/javascript"
+                    self._send(content, kind)
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                # the page posts the ids of the nodes it already holds
+                url = urlparse(self.path)
+                if url.path != "/expand":
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    known = json.loads(self.rfile.read(length) or b"{}").get("known", [])
+                except (ValueError, AttributeError):
+                    known = None
+                if not isinstance(known, list):
+                    self.send_error(400, "expected a JSON object with a known list")
+                    return
+                self._expand(parse_qs(url.query), known)
+
+            def _expand(self, query, known):
+                try:
+                    hops = int(query.get("hops", [server.hops])[0])
+                    limit = int(query.get("limit", [server.limit])[0])
+                except ValueError:
+                    self.send_error(400, "hops and limit have to be integers")
+                    return
+                data = server.expand_node(query.get("node", [None])[0], hops,
+                                          min(limit, server.limit), known)
+                if data is None:
+                    self.send_error(404, "unknown node")
+                    return
+                self._send(json.dumps(data).encode("utf-8"), "application/json")
+
+            def _send(self, content, kind):
+                self.send_response(200)
+                self.send_header("Content-Type", kind + "; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve_forever(self):
+        """
+        Serve until interrupted with Ctrl-C.
+        """
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.httpd.server_close()
+
+    def start(self):
+        """
+        Serve from a daemon thread and return right away.
+        """
+        thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
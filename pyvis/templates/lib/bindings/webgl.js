@@ -0,0 +1,574 @@
+// Minimal WebGL renderer for networks with precomputed positions. Nodes are
+// drawn as round points and edges as lines, both straight from typed
+// arrays, so hundreds of thousands of nodes and millions of edges stay
+// interactive. Supports pan, zoom, selecting a node with its neighbours and
+// hover tooltips showing the node title.
+
+var webglVertexShader = [
+  "attribute vec2 a_position;",
+  "attribute vec4 a_color;",
+  "attribute float a_size;",
+  "uniform vec2 u_translate;",
+  "uniform float u_scale;",
+  "uniform vec2 u_resolution;",
+  "uniform float u_pixelRatio;",
+  "varying vec4 v_color;",
+  "void main() {",
+  "  vec2 screen = a_position * u_scale + u_translate;",
+  "  gl_Position = vec4((screen / u_resolution * 2.0 - 1.0) * vec2(1.0, -1.0), 0.0, 1.0);",
+  "  gl_PointSize = max(2.0, 2.0 * a_size * u_scale) * u_pixelRatio;",
+  "  v_color = a_color;",
+  "}",
+].join("\n");
+
+var webglFragmentShader = [
+  "precision mediump float;",
+  "uniform bool u_round;",
+  "varying vec4 v_color;",
+  "void main() {",
+  "  if (u_round && length(gl_PointCoord - 0.5) > 0.5) {",
+  "    discard;",
+  "  }",
+  "  gl_FragColor = v_color;",
+  "}",
+].join("\n");
+
+function webglColorParser() {
+  // css color -> [r, g, b, a] in 0..255, using a canvas to normalize names
+  var context = document.createElement("canvas").getContext("2d");
+  var cache = new Map();
+  return function (color, fallback) {
+    if (color && typeof color === "object") {
+      color = color.background || color.color;
+    }
+    if (typeof color !== "string") {
+      color = fallback;
+    }
+    if (cache.has(color)) {
+      return cache.get(color);
+    }
+    context.fillStyle = "#000000";
+    context.fillStyle = color;
+    var value = context.fillStyle;
+    var rgba;
+    if (value[0] === "#") {
+      rgba = [parseInt(value.slice(1, 3), 16), parseInt(value.slice(3, 5), 16),
+              parseInt(value.slice(5, 7), 16), 255];
+    } else {
+      var parts = value.slice(value.indexOf("(") + 1, -1).split(",");
+      rgba = [Number(parts[0]), Number(parts[1]), Number(parts[2]),
+              Math.round(255 * (parts.length > 3 ? Number(parts[3]) : 1))];
+    }
+    cache.set(color, rgba);
+    return rgba;
+  };
+}
+
+function webglProgram(gl) {
+  function compile(type, source) {
+    var shader = gl.createShader(type);
+    gl.shaderSource(shader, source);
+    gl.compileShader(shader);
+    if (!gl.getShaderParameter(shader, gl.COMPILE_STATUS)) {
+      throw new Error(gl.getShaderInfoLog(shader));
+    }
+    return shader;
+  }
+  var program = gl.createProgram();
+  gl.attachShader(program, compile(gl.VERTEX_SHADER, webglVertexShader));
+  gl.attachShader(program, compile(gl.FRAGMENT_SHADER, webglFragmentShader));
+  gl.linkProgram(program);
+  if (!gl.getProgramParameter(program, gl.LINK_STATUS)) {
+    throw new Error(gl.getProgramInfoLog(program));
+  }
+  return program;
+}
+
+function drawWebGL(container, nodeItems, edgeItems, settings) {
+  settings = settings || {};
+  var canvas = document.createElement("canvas");
+  canvas.style.width = "100%";
+  canvas.style.height = "100%";
+  canvas.style.display = "block";
+  container.appendChild(canvas);
+  var tooltip = document.createElement("div");
+  tooltip.className = "webgl-tooltip";
+  tooltip.style.display = "none";
+  container.appendChild(tooltip);
+
+  var gl = canvas.getContext("webgl", { antialias: true, alpha: false });
+  if (!gl) {
+    container.textContent = "WebGL is not available in this browser.";
+    return null;
+  }
+  var parseColor = webglColorParser();
+  var background = parseColor(settings.background, "#ffffff");
+
+  var items, count, index, positions, sizes, baseColors, nodeColors;
+  var edgeCount, ends, edgePositions, edgeBaseColors, edgeColors, degree, adjacency;
+  var minX, minY, maxX, maxY, maxSize, cell, grid;
+
+  function load(nodeItems, edgeItems) {
+    // node attributes, kept in typed arrays
+    items = nodeItems;
+    count = nodeItems.length;
+    index = new Map();
+    positions = new Float32Array(count * 2);
+    sizes = new Float32Array(count);
+    baseColors = new Uint8Array(count * 4);
+    for (let i = 0; i < count; i++) {
+      let node = nodeItems[i];
+      index.set(node.id, i);
+      positions[2 * i] = node.x;
+      positions[2 * i + 1] = node.y;
+      sizes[i] = node.size !== undefined ? node.size : 25;
+      baseColors.set(parseColor(node.color, "#97c2fc"), 4 * i);
+    }
+    nodeColors = new Uint8Array(baseColors);
+
+    // edges as line segments, and adjacency lists for the selection
+    edgeCount = 0;
+    ends = new Int32Array(edgeItems.length * 2);
+    var kept = new Int32Array(edgeItems.length);
+    for (let i = 0; i < edgeItems.length; i++) {
+      let from = index.get(edgeItems[i].from);
+      let to = index.get(edgeItems[i].to);
+      if (from !== undefined && to !== undefined) {
+        ends[2 * edgeCount] = from;
+        ends[2 * edgeCount + 1] = to;
+        kept[edgeCount] = i;
+        edgeCount++;
+      }
+    }
+    edgePositions = new Float32Array(edgeCount * 4);
+    edgeBaseColors = new Uint8Array(edgeCount * 8);
+    degree = new Int32Array(count + 1);
+    for (let e = 0; e < edgeCount; e++) {
+      let a = ends[2 * e];
+      let b = ends[2 * e + 1];
+      edgePositions.set([positions[2 * a], positions[2 * a + 1],
+                         positions[2 * b], positions[2 * b + 1]], 4 * e);
+      let color = parseColor(edgeItems[kept[e]].color, "#848484");
+      edgeBaseColors.set(color, 8 * e);
+      edgeBaseColors.set(color, 8 * e + 4);
+      degree[a + 1]++;
+      degree[b + 1]++;
+    }
+    edgeColors = new Uint8Array(edgeBaseColors);
+    for (let i = 0; i < count; i++) {
+      degree[i + 1] += degree[i];
+    }
+    adjacency = new Int32Array(2 * edgeCount);
+    var fill = degree.slice(0, count);
+    for (let e = 0; e < edgeCount; e++) {
+      adjacency[fill[ends[2 * e]]++] = ends[2 * e + 1];
+      adjacency[fill[ends[2 * e + 1]]++] = ends[2 * e];
+    }
+
+    // uniform grid over the positions for picking the node under the cursor
+    minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+    maxSize = 1;
+    for (let i = 0; i < count; i++) {
+      minX = Math.min(minX, positions[2 * i]);
+      maxX = Math.max(maxX, positions[2 * i]);
+      minY = Math.min(minY, positions[2 * i + 1]);
+      maxY = Math.max(maxY, positions[2 * i + 1]);
+      maxSize = Math.max(maxSize, sizes[i]);
+    }
+    if (settings.bounds) {
+      // the extent of the whole layout when only part of it is loaded
+      minX = settings.bounds.x0;
+      minY = settings.bounds.y0;
+      maxX = settings.bounds.x1;
+      maxY = settings.bounds.y1;
+    } else if (count === 0) {
+      minX = minY = -1;
+      maxX = maxY = 1;
+    }
+    cell = Math.max(2 * maxSize, Math.sqrt((maxX - minX + 1) * (maxY - minY + 1) / Math.max(count, 1)));
+    grid = new Map();
+    for (let i = 0; i < count; i++) {
+      let key = Math.floor(positions[2 * i] / cell) + ":" + Math.floor(positions[2 * i + 1] / cell);
+      if (!grid.has(key)) {
+        grid.set(key, []);
+      }
+      grid.get(key).push(i);
+    }
+  }
+  load(nodeItems, edgeItems);
+
+  var program = webglProgram(gl);
+  var attributes = {
+    position: gl.getAttribLocation(program, "a_position"),
+    color: gl.getAttribLocation(program, "a_color"),
+    size: gl.getAttribLocation(program, "a_size"),
+  };
+  var uniforms = {};
+  ["u_translate", "u_scale", "u_resolution", "u_pixelRatio", "u_round"].forEach(function (name) {
+    uniforms[name] = gl.getUniformLocation(program, name);
+  });
+  var buffers = {};
+  function upload() {
+    var data = {
+      nodePositions: positions,
+      nodeColors: nodeColors,
+      nodeSizes: sizes,
+      edgePositions: edgePositions,
+      edgeColors: edgeColors,
+    };
+    for (let name in data) {
+      if (!buffers[name]) {
+        buffers[name] = gl.createBuffer();
+      }
+      gl.bindBuffer(gl.ARRAY_BUFFER, buffers[name]);
+      gl.bufferData(gl.ARRAY_BUFFER, data[name], gl.STATIC_DRAW);
+    }
+  }
+  upload();
+
+  var camera = { x: (minX + maxX) / 2, y: (minY + maxY) / 2, scale: 1 };
+  var pending = false;
+
+  function resize() {
+    var ratio = window.devicePixelRatio || 1;
+    canvas.width = Math.max(1, Math.round(canvas.clientWidth * ratio));
+    canvas.height = Math.max(1, Math.round(canvas.clientHeight * ratio));
+  }
+
+  function fit() {
+    resize();
+    var ratio = window.devicePixelRatio || 1;
+    var width = canvas.width / ratio;
+    var height = canvas.height / ratio;
+    camera.x = (minX + maxX) / 2;
+    camera.y = (minY + maxY) / 2;
+    camera.scale = 0.9 * Math.min(width / (maxX - minX + 2 * maxSize),
+                                  height / (maxY - minY + 2 * maxSize));
+    redraw();
+  }
+
+  function translate() {
+    var ratio = window.devicePixelRatio || 1;
+    return [canvas.width / ratio / 2 - camera.x * camera.scale,
+            canvas.height / ratio / 2 - camera.y * camera.scale];
+  }
+
+  function attribute(location, b, size, type, normalized) {
+    if (location < 0) {
+      return;
+    }
+    gl.bindBuffer(gl.ARRAY_BUFFER, b);
+    gl.enableVertexAttribArray(location);
+    gl.vertexAttribPointer(location, size, type, normalized, 0, 0);
+  }
+
+  function render() {
+    pending = false;
+    var ratio = window.devicePixelRatio || 1;
+    gl.viewport(0, 0, canvas.width, canvas.height);
+    gl.clearColor(background[0] / 255, background[1] / 255, background[2] / 255, 1);
+    gl.clear(gl.COLOR_BUFFER_BIT);
+    gl.enable(gl.BLEND);
+    gl.blendFunc(gl.SRC_ALPHA, gl.ONE_MINUS_SRC_ALPHA);
+    gl.useProgram(program);
+    gl.uniform2fv(uniforms.u_translate, translate());
+    gl.uniform1f(uniforms.u_scale, camera.scale);
+    gl.uniform2f(uniforms.u_resolution, canvas.width / ratio, canvas.height / ratio);
+    gl.uniform1f(uniforms.u_pixelRatio, ratio);
+
+    gl.uniform1i(uniforms.u_round, 0);
+    attribute(attributes.position, buffers.edgePositions, 2, gl.FLOAT, false);
+    attribute(attributes.color, buffers.edgeColors, 4, gl.UNSIGNED_BYTE, true);
+    if (attributes.size >= 0) {
+      gl.disableVertexAttribArray(attributes.size);
+      gl.vertexAttrib1f(attributes.size, 1);
+    }
+    gl.drawArrays(gl.LINES, 0, edgeCount * 2);
+
+    gl.uniform1i(uniforms.u_round, 1);
+    attribute(attributes.position, buffers.nodePositions, 2, gl.FLOAT, false);
+    attribute(attributes.color, buffers.nodeColors, 4, gl.UNSIGNED_BYTE, true);
+    attribute(attributes.size, buffers.nodeSizes, 1, gl.FLOAT, false);
+    gl.drawArrays(gl.POINTS, 0, count);
+    if (settings.onView) {
+      settings.onView(view());
+    }
+  }
+
+  function view() {
+    // the part of the layout on screen
+    var t = translate();
+    return {
+      x0: -t[0] / camera.scale,
+      y0: -t[1] / camera.scale,
+      x1: (canvas.width / ratio() - t[0]) / camera.scale,
+      y1: (canvas.height / ratio() - t[1]) / camera.scale,
+      scale: camera.scale,
+    };
+  }
+
+  function ratio() {
+    return window.devicePixelRatio || 1;
+  }
+
+  function redraw() {
+    if (!pending) {
+      pending = true;
+      window.requestAnimationFrame(render);
+    }
+  }
+
+  function toWorld(event) {
+    var rect = canvas.getBoundingClientRect();
+    var t = translate();
+    return [(event.clientX - rect.left - t[0]) / camera.scale,
+            (event.clientY - rect.top - t[1]) / camera.scale];
+  }
+
+  function nodeAt(event) {
+    // the closest node whose disc contains the cursor
+    var point = toWorld(event);
+    var cx = Math.floor(point[0] / cell);
+    var cy = Math.floor(point[1] / cell);
+    var best = -1;
+    var bestDistance = Infinity;
+    for (let dx = -1; dx <= 1; dx++) {
+      for (let dy = -1; dy <= 1; dy++) {
+        let members = grid.get((cx + dx) + ":" + (cy + dy)) || [];
+        for (let k = 0; k < members.length; k++) {
+          let i = members[k];
+          let distance = Math.hypot(positions[2 * i] - point[0], positions[2 * i + 1] - point[1]);
+          let radius = Math.max(sizes[i], 2 / camera.scale);
+          if (distance <= radius && distance < bestDistance) {
+            best = i;
+            bestDistance = distance;
+          }
+        }
+      }
+    }
+    return best;
+  }
+
+  function select(i) {
+    // dim everything but the selected node and its neighbours
+    if (i < 0) {
+      nodeColors.set(baseColors);
+      edgeColors.set(edgeBaseColors);
+    } else {
+      let keep = new Uint8Array(count);
+      keep[i] = 1;
+      for (let k = degree[i]; k < degree[i + 1]; k++) {
+        keep[adjacency[k]] = 1;
+      }
+      for (let n = 0; n < count; n++) {
+        for (let c = 0; c < 3; c++) {
+          nodeColors[4 * n + c] = keep[n] ? baseColors[4 * n + c] : 200;
+        }
+        nodeColors[4 * n + 3] = keep[n] ? baseColors[4 * n + 3] : 128;
+      }
+      for (let e = 0; e < edgeCount; e++) {
+        let on = ends[2 * e] === i || ends[2 * e + 1] === i;
+        edgeColors[8 * e + 3] = on ? edgeBaseColors[8 * e + 3] : 40;
+        edgeColors[8 * e + 7] = on ? edgeBaseColors[8 * e + 7] : 40;
+      }
+    }
+    gl.bindBuffer(gl.ARRAY_BUFFER, buffers.nodeColors);
+    gl.bufferSubData(gl.ARRAY_BUFFER, 0, nodeColors);
+    gl.bindBuffer(gl.ARRAY_BUFFER, buffers.edgeColors);
+    gl.bufferSubData(gl.ARRAY_BUFFER, 0, edgeColors);
+    redraw();
+  }
+
+  var drag = null;
+  canvas.addEventListener("mousedown", function (event) {
+    drag = { x: event.clientX, y: event.clientY, moved: false };
+  });
+  window.addEventListener("mouseup", function (event) {
+    if (drag && !drag.moved && event.target === canvas) {
+      select(nodeAt(event));
+    }
+    drag = null;
+  });
+  var hoverPending = false;
+  canvas.addEventListener("mousemove", function (event) {
+    if (drag) {
+      let dx = event.clientX - drag.x;
+      let dy = event.clientY - drag.y;
+      if (Math.abs(dx) + Math.abs(dy) > 2) {
+        drag.moved = true;
+      }
+      camera.x -= dx / camera.scale;
+      camera.y -= dy / camera.scale;
+      drag.x = event.clientX;
+      drag.y = event.clientY;
+      tooltip.style.display = "none";
+      redraw();
+      return;
+    }
+    if (hoverPending) {
+      return;
+    }
+    hoverPending = true;
+    window.requestAnimationFrame(function () {
+      hoverPending = false;
+      var i = nodeAt(event);
+      var title = i >= 0 ? items[i].title : undefined;
+      if (title === undefined || title === null) {
+        tooltip.style.display = "none";
+        return;
+      }
+      var rect = container.getBoundingClientRect();
+      tooltip.innerHTML = title;
+      tooltip.style.left = (event.clientX - rect.left + 10) + "px";
+      tooltip.style.top = (event.clientY - rect.top + 10) + "px";
+      tooltip.style.display = "block";
+    });
+  });
+  canvas.addEventListener("wheel", function (event) {
+    // zoom around the cursor
+    event.preventDefault();
+    var before = toWorld(event);
+    camera.scale *= Math.exp(-event.deltaY * 0.001);
+    var after = toWorld(event);
+    camera.x += before[0] - after[0];
+    camera.y += before[1] - after[1];
+    redraw();
+  }, { passive: false });
+  window.addEventListener("resize", function () {
+    resize();
+    redraw();
+  });
+
+  fit();
+  return {
+    fit: fit,
+    redraw: redraw,
+    selectNode: function (id) {
+      select(index.has(id) ? index.get(id) : -1);
+    },
+    getScale: function () {
+      return camera.scale;
+    },
+    getView: view,
+    setData: function (nodeItems, edgeItems) {
+      // replace the drawn nodes and edges, keeping the camera
+      load(nodeItems, edgeItems);
+      upload();
+      redraw();
+    },
+    moveTo: function (position, scale) {
+      camera.x = position.x;
+      camera.y = position.y;
+      if (scale !== undefined) {
+        camera.scale = scale;
+      }
+      redraw();
+    },
+  };
+}
+
+// draws the quadtree tiles written by write_html(data="tiles"), loading
+// only the tiles intersecting the viewport. A tile that was split is drawn
+// merged until its cells grow larger than a few pixels on screen, then it
+// is replaced by its children, down to the leaves holding every node.
+function drawTiles(container, url, settings) {
+  var base = new URL(url, document.baseURI);
+  return fetchData(base.href, "json").then(function (manifest) {
+    var side = manifest.bounds[2];
+    var detail = 8 * manifest.resolution;
+    var cache = new Map();
+    var wanted = [];
+    var timer = null;
+    var network;
+
+    function tileBounds(z, x, y) {
+      var size = side / Math.pow(2, z);
+      return [manifest.bounds[0] + x * size, manifest.bounds[1] + y * size, size];
+    }
+
+    function visible(view) {
+      var keys = [];
+      var stack = [[0, 0, 0]];
+      while (stack.length) {
+        let [z, x, y] = stack.pop();
+        let key = z + "/" + x + "/" + y;
+        let tile = manifest.tiles[key];
+        if (!tile) {
+          continue;
+        }
+        let [tx, ty, size] = tileBounds(z, x, y);
+        if (tx > view.x1 || tx + size < view.x0 || ty > view.y1 || ty + size < view.y0) {
+          continue;
+        }
+        if (tile.leaf || size * view.scale <= detail) {
+          keys.push(key);
+          continue;
+        }
+        for (let dx = 0; dx < 2; dx++) {
+          for (let dy = 0; dy < 2; dy++) {
+            stack.push([z + 1, 2 * x + dx, 2 * y + dy]);
+          }
+        }
+      }
+      return keys.sort();
+    }
+
+    function fetchTile(key) {
+      if (!cache.has(key)) {
+        cache.set(key, fetchData(new URL(manifest.tiles[key].url, base).href, "json"));
+      }
+      // most recently used last, the oldest tiles are dropped first
+      var tile = cache.get(key);
+      cache.delete(key);
+      cache.set(key, tile);
+      return tile;
+    }
+
+    function update(view) {
+      var keys = visible(view);
+      if (keys.join() === wanted.join()) {
+        return;
+      }
+      wanted = keys;
+      Promise.all(keys.map(fetchTile)).then(function (tiles) {
+        if (keys !== wanted) {
+          return;
+        }
+        var nodeItems = [];
+        var edgeItems = [];
+        var seen = new Set();
+        tiles.forEach(function (tile) {
+          nodeItems.push.apply(nodeItems, tile.nodes);
+          tile.edges.forEach(function (edge) {
+            if (!seen.has(edge.id)) {
+              seen.add(edge.id);
+              edgeItems.push(edge);
+            }
+          });
+        });
+        while (cache.size > Math.max(256, 2 * keys.length)) {
+          cache.delete(cache.keys().next().value);
+        }
+        network.setData(nodeItems, edgeItems);
+      });
+    }
+
+    settings = Object.assign({}, settings, {
+      bounds: {
+        x0: manifest.bounds[0],
+        y0: manifest.bounds[1],
+        x1: manifest.bounds[0] + side,
+        y1: manifest.bounds[1] + side,
+      },
+      onView: function (view) {
+        // wait for panning and zooming to settle
+        clearTimeout(timer);
+        timer = setTimeout(function () {
+          update(view);
+        }, 100);
+      },
+    });
+    network = drawWebGL(container, [], [], settings);
+    return network;
+  });
+}
@@ -1,3 +1,4 @@
+import json
 import os
 import unittest
 
@@ -348,3 +349,1300 @@ class LayoutTestCase(unittest.TestCase):
         
 
     
+
+
+class ClusterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # two 5-cliques joined by a single bridge edge
+        self.g = Network()
+        self.g.add_nodes(range(10))
+        for offset in (0, 5):
+            for i in range(offset, offset + 5):
+                for j in range(i + 1, offset + 5):
+                    self.g.add_edge(i, j)
+        self.g.add_edge(4, 5)
+
+    def test_louvain_clusters(self):
+        coarse = self.g.cluster(method="louvain", seed=1)
+        self.assertEqual(coarse.num_nodes(), 2)
+        self.assertEqual(coarse.num_edges(), 1)
+        self.assertEqual(coarse.edges[0]["title"], "1 edge")
+        self.assertTrue(all(n["id"].startswith("pyvis:cluster:") for n in coarse.nodes))
+        sizes = sorted(n["value"] for n in coarse.nodes)
+        self.assertEqual(sizes, [5, 5])
+        for data in coarse.cluster_data.values():
+            self.assertEqual(len(data["nodes"]), 5)
+            self.assertEqual(len(data["edges"]), 10)
+            self.assertEqual(len(data["links"]), 1)
+        # the original network is left untouched
+        self.assertEqual(self.g.num_nodes(), 10)
+
+    def test_label_propagation_clusters(self):
+        coarse = self.g.cluster(method="label_propagation", seed=1)
+        members = sorted(sorted(n["id"] for n in data["nodes"])
+                         for data in coarse.cluster_data.values())
+        self.assertEqual(members, [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]])
+
+    def test_min_size_keeps_small_communities(self):
+        self.g.add_node(10)
+        coarse = self.g.cluster(seed=1)
+        self.assertTrue(10 in coarse.get_nodes())
+        self.assertEqual(coarse.num_nodes(), 3)
+
+    def test_directed_meta_edges(self):
+        g = Network(directed=True)
+        g.add_nodes(range(10))
+        for offset in (0, 5):
+            for i in range(offset, offset + 5):
+                for j in range(i + 1, offset + 5):
+                    g.add_edge(i, j)
+        g.add_edge(4, 5)
+        g.add_edge(6, 1)
+        g.add_edge(7, 2)
+        coarse = g.cluster(seed=1)
+        self.assertEqual(coarse.num_edges(), 2)
+        by_dir = {(e["from"], e["to"]): e for e in coarse.edges}
+        owner = {n["id"]: cid for cid, data in coarse.cluster_data.items()
+                 for n in data["nodes"]}
+        forward = by_dir[(owner[4], owner[5])]
+        backward = by_dir[(owner[5], owner[4])]
+        self.assertEqual(forward["title"], "1 edge")
+        self.assertEqual(backward["title"], "2 edges")
+        self.assertEqual(forward["arrows"], "to")
+
+    def test_cluster_html(self):
+        html = self.g.cluster(seed=1).generate_html()
+        self.assertTrue("indexClusters(clusterData)" in html)
+        self.assertTrue("expandCluster(params.nodes[0], false)" in html)
+        self.assertFalse("indexClusters(clusterData)" in self.g.generate_html())
+
+
+class ReductionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # a 4-clique (0-3) with a tail 3-4-5 and an isolated node 6
+        self.g = Network()
+        self.g.add_nodes(range(7))
+        for i in range(4):
+            for j in range(i + 1, 4):
+                self.g.add_edge(i, j, width=1)
+        self.g.add_edge(3, 4, width=10)
+        self.g.add_edge(4, 5, width=10)
+
+    def test_k_core(self):
+        core = self.g.k_core(3)
+        self.assertEqual(sorted(core.get_nodes()), [0, 1, 2, 3])
+        self.assertEqual(core.num_edges(), 6)
+        self.assertEqual(sorted(self.g.k_core(1).get_nodes()),
+                         [0, 1, 2, 3, 4, 5])
+
+    def test_top_k(self):
+        self.assertEqual(self.g.top_k(1).get_nodes(), [3])
+        self.assertEqual(sorted(self.g.top_k(2, by="weight").get_nodes()),
+                         [3, 4])
+
+    def test_sample(self):
+        for method in ("forest_fire", "random_walk"):
+            sampled = self.g.sample(4, method=method, seed=3)
+            self.assertEqual(sampled.num_nodes(), 4)
+            for e in sampled.edges:
+                self.assertTrue(e["from"] in sampled.get_nodes())
+                self.assertTrue(e["to"] in sampled.get_nodes())
+
+    def test_drop_isolates(self):
+        reduced = self.g.drop_isolates()
+        self.assertFalse(6 in reduced.get_nodes())
+        self.assertEqual(reduced.num_edges(), self.g.num_edges())
+
+    def test_reduction_copies_nodes(self):
+        reduced = self.g.drop_isolates()
+        reduced.get_node(0)["color"] = "red"
+        self.assertNotEqual(self.g.get_node(0)["color"], "red")
+
+
+class SparsifyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # star around node 0 with one heavy spoke plus a light triangle 1-2-3
+        self.g = Network()
+        self.g.add_nodes(range(6))
+        self.g.add_edge(0, 1, width=100)
+        for i in range(2, 6):
+            self.g.add_edge(0, i, width=1)
+        self.g.add_edge(1, 2, width=1)
+        self.g.add_edge(2, 3, width=1)
+        self.g.add_edge(1, 3, width=1)
+
+    def test_top_k_keeps_nodes(self):
+        sparse = self.g.sparsify("top_k", k=1)
+        self.assertEqual(sparse.num_nodes(), self.g.num_nodes())
+        self.assertTrue(sparse.num_edges() < self.g.num_edges())
+        self.assertTrue({"from": 0, "to": 1, "width": 100} in sparse.edges)
+
+    def test_disparity_filter(self):
+        backbone = self.g.sparsify("disparity", alpha=0.05)
+        self.assertTrue({"from": 0, "to": 1, "width": 100} in backbone.edges)
+        self.assertFalse({"from": 1, "to": 2, "width": 1} in backbone.edges)
+
+    def test_spanning_forest(self):
+        forest = self.g.sparsify("spanning_forest")
+        self.assertEqual(forest.num_edges(), self.g.num_nodes() - 1)
+        self.assertTrue({"from": 0, "to": 1, "width": 100} in forest.edges)
+        extra = self.g.sparsify("spanning_forest", k=2)
+        self.assertTrue(extra.num_edges() > forest.num_edges())
+
+
+class MergeEdgesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network()
+        self.g.add_nodes([0, 1, 2])
+
+    def test_add_edges_aggregate(self):
+        self.g.add_edges([(0, 1, 5), (1, 0, 3), (0, 1, 4), (1, 2)],
+                         aggregate="sum")
+        self.assertEqual(self.g.num_edges(), 2)
+        self.assertEqual(self.g.edges[0]["value"], 12)
+        self.assertEqual(self.g.edges[0]["title"],
+                         "3 edges, sum 12, min 3, max 5")
+        self.assertEqual(self.g.edges[1]["value"], 1)
+
+    def test_add_edges_aggregate_directed(self):
+        g = Network(directed=True)
+        g.add_nodes([0, 1])
+        g.add_edges([(0, 1, 2), (1, 0, 7), (0, 1, 1)], aggregate="max",
+                    attribute="width")
+        self.assertEqual(g.num_edges(), 2)
+        self.assertEqual([e["width"] for e in g.edges], [2, 7])
+        self.assertTrue(all(e["arrows"] == "to" for e in g.edges))
+
+    def test_add_edges_aggregate_across_calls(self):
+        g = Network(directed=True)
+        g.add_nodes([0, 1])
+        g.add_edges([(0, 1, 3), (0, 1, 5)], aggregate="sum")
+        g.add_edges([(0, 1, 10)], aggregate="sum")
+        self.assertEqual(g.num_edges(), 1)
+        self.assertEqual(g.edges[0]["value"], 18)
+        self.assertEqual(g.edges[0]["title"], "3 edges, sum 18, min 3, max 10")
+        # an edge added otherwise counts as a single edge
+        g.add_edge(1, 0, value=2)
+        g.add_edges([(1, 0, 4)], aggregate="max")
+        self.assertEqual(g.edges[1]["value"], 4)
+        self.assertEqual(g.edges[1]["title"], "2 edges, sum 6, min 2, max 4")
+        g.add_edges([(1, 0, 1)], aggregate="count")
+        self.assertEqual(g.edges[1]["value"], 3)
+
+    def test_single_edge_title(self):
+        self.g.add_edges([(0, 1, 5)], aggregate="sum")
+        self.assertEqual(self.g.edges[0]["title"], "1 edge, sum 5, min 5, max 5")
+
+    def test_add_edges_aggregate_unknown_node(self):
+        self.g.add_edges([(0, 1)])
+        self.assertRaises(ValueError, self.g.add_edges,
+                          [(1, 2, 3), (0, "missing", 1)], aggregate="sum")
+        self.assertEqual(self.g.num_edges(), 1)
+
+    def test_merge_parallel_edges(self):
+        g = Network(directed=True)
+        g.add_nodes([0, 1])
+        for w in (1, 2, 3):
+            g.add_edge(0, 1, value=w)
+        merged = g.merge_parallel_edges(aggregate="count", attribute="width")
+        self.assertEqual(merged.num_edges(), 1)
+        self.assertEqual(merged.edges[0]["width"], 3)
+        self.assertFalse("value" in merged.edges[0])
+        self.assertEqual(g.num_edges(), 3)
+
+
+class BundleEdgesTestCase(unittest.TestCase):
+
+    def test_fdeb_bends_parallel_lanes_together(self):
+        # two long horizontal edges close to each other bundle together
+        g = Network()
+        g.add_node(0, x=0, y=0)
+        g.add_node(1, x=1000, y=0)
+        g.add_node(2, x=0, y=100)
+        g.add_node(3, x=1000, y=100)
+        g.add_edge(0, 1)
+        g.add_edge(2, 3)
+        g.bundle_edges("fdeb", cycles=3)
+        self.assertEqual(g.options.edges.smooth.type, "continuous")
+        top, bottom = g.edges
+        self.assertTrue(top["smooth"]["enabled"])
+        self.assertTrue(bottom["smooth"]["enabled"])
+        # the upper edge bends down and the lower edge bends up
+        self.assertEqual(top["smooth"]["type"], "curvedCCW")
+        self.assertEqual(bottom["smooth"]["type"], "curvedCW")
+
+    def test_fdeb_requires_positions(self):
+        g = Network()
+        g.add_nodes([0, 1])
+        g.add_edge(0, 1)
+        self.assertRaises(AssertionError, g.bundle_edges, "fdeb")
+
+    def test_parallel(self):
+        g = Network(directed=True)
+        g.add_nodes([0, 1, 2])
+        g.add_edge(0, 1)
+        g.add_edge(0, 1)
+        g.add_edge(1, 0)
+        g.add_edge(1, 2)
+        g.bundle_edges("parallel")
+        self.assertEqual(g.edges[0]["smooth"], {"enabled": False})
+        self.assertEqual(g.edges[1]["smooth"]["type"], "curvedCW")
+        # the reversed edge bends the other way in its own frame
+        self.assertEqual(g.edges[2]["smooth"]["type"], "curvedCW")
+        self.assertFalse("smooth" in g.edges[3])
+
+    def test_compatible_pairs_match_all_pairs(self):
+        import numpy as np
+        from ..bundling import _compatibility
+        rng = np.random.RandomState(0)
+        starts = rng.uniform(0, 1, (300, 2))
+        ends = starts + rng.normal(0, 0.05, (300, 2))
+        rows, cols, weights, _ = _compatibility(starts, ends, 0.6,
+                                                max_candidates=300, block=16)
+        # every pair against every other, as in the paper
+        v = ends - starts
+        length = np.hypot(v[:, 0], v[:, 1])
+        mid = (starts + ends) / 2
+        average = (length[:, None] + length[None, :]) / 2
+        score = (np.abs(v @ v.T) / np.outer(length, length) *
+                 2 / (average / np.minimum.outer(length, length) +
+                      np.maximum.outer(length, length) / average) *
+                 average / (average + np.hypot(*(mid[:, None] - mid[None]).T).T))
+        np.fill_diagonal(score, 0)
+        expected = set(zip(*np.nonzero(score >= 0.6)))
+        self.assertEqual(set(zip(rows.tolist(), cols.tolist())), expected)
+        capped = _compatibility(starts, ends, 0.6, max_candidates=3)[0]
+        self.assertTrue(np.bincount(capped).max() <= 3)
+
+    def test_roundness_inverts_vis_geometry(self):
+        import numpy as np
+        from ..bundling import roundness_for_offset
+        f = np.array([0.1, 0.5, 0.9])
+        offset = (f / 2 + 0.5) * np.sin(f * np.pi / 2) * 100 / 2
+        np.testing.assert_allclose(roundness_for_offset(offset, 100.0), f,
+                                   atol=1e-6)
+
+
+class ScaleProfileTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network()
+        self.g.add_nodes(range(10))
+        self.g.add_edges([(i, i + 1) for i in range(9)])
+
+    def test_interactive_profile(self):
+        self.assertEqual(self.g.optimize_for_scale(), "interactive")
+        self.assertEqual(self.g.scale_overrides,
+                         {"edges.smooth.type": ("dynamic", "continuous")})
+        self.assertEqual(self.g.options.edges.smooth.type, "continuous")
+
+    def test_large_profile_by_size(self):
+        g = Network()
+        g.add_nodes(range(1500))
+        self.assertEqual(g.optimize_for_scale(), "large")
+        self.assertEqual(g.scale_overrides["layout.improvedLayout"],
+                         (True, False))
+        self.assertFalse(g.options.layout.hierarchical.enabled)
+        self.assertEqual(g.options.physics.stabilization.iterations, 400)
+        options = json.loads(g.options.to_json())
+        self.assertEqual(options["nodes"]["scaling"]["label"]["drawThreshold"], 8)
+
+    def test_explicit_huge_profile(self):
+        self.g.optimize_for_scale("huge")
+        self.assertEqual(self.g.scale_profile, "huge")
+        self.assertTrue(self.g.options.interaction.hideNodesOnDrag)
+        self.assertEqual(self.g.scale_overrides["interaction.hideNodesOnDrag"],
+                         (False, True))
+
+    def test_profile_on_dict_options(self):
+        self.g.set_options(
+            'var options = {"physics": {"solver": "repulsion"}}')
+        self.g.optimize_for_scale("large")
+        self.assertEqual(self.g.options["physics"]["solver"], "barnesHut")
+        self.assertEqual(self.g.scale_overrides["physics.solver"],
+                         ("repulsion", "barnesHut"))
+
+    def test_profile_keeps_chosen_solver(self):
+        self.g.force_atlas_2based()
+        self.g.optimize_for_scale("huge")
+        self.assertEqual(self.g.options.physics.solver, "forceAtlas2Based")
+        self.assertFalse("physics.solver" in self.g.scale_overrides)
+
+    def test_profile_keeps_default_solver(self):
+        self.g.set_options('var options = {"physics": {"enabled": true}}')
+        self.g.optimize_for_scale("large")
+        self.assertFalse("solver" in self.g.options["physics"])
+
+
+class IdleGovernorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network()
+        self.g.add_nodes([0, 1])
+
+    def test_disabled_by_default(self):
+        self.assertFalse(self.g.get_idle_governor().enabled())
+        self.assertFalse("governFrames(" in self.g.generate_html())
+
+    def test_set_idle_governor(self):
+        self.g.set_idle_governor(max_fps=20)
+        html = self.g.generate_html()
+        self.assertTrue("governFrames(20, true)" in html)
+        self.assertTrue("governIdle(network, true, true)" in html)
+        # the governor is not part of the options handed to vis
+        self.assertFalse("idle" in json.loads(self.g.options.to_json()))
+
+    def test_idle_governor_dict_options(self):
+        self.g.set_options('var options = {"physics": {"enabled": true}}')
+        self.g.set_idle_governor(pause_hidden=False)
+        self.assertTrue(self.g.get_idle_governor().freeze_physics)
+        self.assertFalse("idle" in json.loads(self.g.get_network_data()[5]))
+        self.assertTrue("governIdle(network, true, false)" in
+                        self.g.generate_html())
+
+
+class FilterIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network(filter_menu=True)
+        self.g.add_node(0, group=1, shape="dot")
+        self.g.add_node(1, group=1, shape="box")
+        self.g.add_node(2, group=2.0, shape="box")
+        self.g.add_edge(0, 1, weight=True)
+        self.g.add_edge(1, 2, weight=True)
+
+    def test_filter_index(self):
+        from ..payload import filter_index
+        index = filter_index(self.g.nodes, self.g.edges)
+        self.assertEqual(index["node"]["group"], {"1": [0, 1], "2": [2]})
+        self.assertEqual(index["node"]["shape"]["box"], [1, 2])
+        # edge values select both endpoints once
+        self.assertEqual(index["edge"]["weight"], {"true": [0, 1, 2]})
+
+    def test_filter_index_max_values(self):
+        from ..payload import filter_index
+        index = filter_index(self.g.nodes, self.g.edges, max_values=1)
+        self.assertEqual(index["node"]["group"], {"1": [0, 1]})
+        self.assertEqual(len(index["node"]["id"]), 1)
+
+    def test_filter_index_in_html(self):
+        html = self.g.generate_html()
+        self.assertTrue('filterIndex = {"edge": ' in html)
+        self.g.filter_menu = False
+        self.assertFalse("filterIndex = {" in self.g.generate_html())
+
+
+class RenderCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network(render_cache=True)
+        self.g.add_nodes([0, 1, 2])
+        self.g.add_edge(0, 1)
+
+    def test_version(self):
+        version = self.g.version
+        self.g.add_node(0)
+        self.assertEqual(self.g.version, version)
+        self.g.add_edge(1, 2)
+        self.g.update_node(2, color="red")
+        self.assertEqual(self.g.version, version + 2)
+
+    def test_cached_html(self):
+        html = self.g.generate_html()
+        self.assertTrue(self.g.generate_html() is html)
+        self.g.update_node(1, label="changed")
+        self.assertTrue('"label": "changed"' in self.g.generate_html())
+        # option changes are picked up without touching the version
+        self.g.toggle_physics(False)
+        self.assertTrue('"enabled": false' in self.g.generate_html())
+
+    def test_tooltip_link(self):
+        self.g.generate_html()
+        self.assertFalse(self.g._link_titles)
+        self.g.add_node(3, title='<a href="https://example.org">link</a>')
+        self.assertEqual(self.g._link_titles, {3})
+        self.g.remove_node(3)
+        self.assertFalse(self.g._link_titles)
+
+    def test_mark_dirty(self):
+        html = self.g.generate_html()
+        self.g.nodes[0]["title"] = '<a href="#">link</a>'
+        self.assertTrue(self.g.generate_html() is html)
+        self.g.mark_dirty()
+        self.assertFalse(self.g.generate_html() is html)
+        self.assertEqual(self.g._link_titles, {0})
+
+    def test_select_menu(self):
+        self.g.select_menu = True
+        plain = Network(select_menu=True)
+        plain.add_nodes([0, 1, 2])
+        plain.add_edge(0, 1)
+        html = self.g.generate_html()
+        self.assertTrue('<option value="2">2</option>' in html)
+        self.assertEqual(html, plain.generate_html())
+
+    def test_remove_node(self):
+        self.g.remove_node(1)
+        self.assertEqual(self.g.get_nodes(), [0, 2])
+        self.assertEqual(self.g.num_edges(), 0)
+
+    def test_node_positions(self):
+        self.g.add_nodes([3, 4])
+        self.g.update_node(4, label="four")
+        self.g.remove_node(1)
+        self.g.update_node(3, label="three")
+        self.assertEqual(self.g._node_positions, {0: 0, 2: 1, 3: 2, 4: 3})
+        self.assertEqual(self.g.nodes[2]["label"], "three")
+        # nodes removed behind the network's back
+        del self.g.node_ids[0], self.g.nodes[0], self.g.node_map[0]
+        self.g.update_node(4, label="4")
+        self.assertEqual(self.g.nodes[2]["label"], "4")
+
+
+class ChunkedJSONTestCase(unittest.TestCase):
+
+    def test_encode(self):
+        from ..payload import ChunkedJSON
+        items = [{"id": i, "b": [i], "a": "<%d>" % i} for i in range(10)]
+        chunks = ChunkedJSON(chunk_size=3)
+        encoded = chunks.encode(items, sort_keys=True)
+        self.assertEqual(encoded.text, json.dumps(items, sort_keys=True))
+        self.assertEqual(len(encoded), 10)
+        self.assertEqual(ChunkedJSON().encode([]).text, "[]")
+
+    def test_only_dirty_chunks_encoded(self):
+        from ..payload import ChunkedJSON
+        items = [{"id": i} for i in range(10)]
+        chunks = ChunkedJSON(chunk_size=3)
+        chunks.encode(items)
+        clean = list(chunks.chunks)
+        items[4]["id"] = "changed"
+        chunks.invalidate(4, 5)
+        self.assertEqual(chunks.chunks[1], None)
+        self.assertEqual(chunks.encode(items).text, json.dumps(items))
+        self.assertTrue(chunks.chunks[0] is clean[0])
+        self.assertTrue(chunks.chunks[2] is clean[2])
+        items.append({"id": 10})
+        chunks.invalidate(10)
+        self.assertEqual(chunks.encode(items).text, json.dumps(items))
+
+    def test_network_html_unchanged(self):
+        cached = Network(render_cache=True)
+        plain = Network()
+        for g in (cached, plain):
+            g.add_nodes(range(5), title=["<b>%d</b>" % i for i in range(5)])
+            g.add_edge(0, 1)
+        cached._node_chunks.chunk_size = 2
+        self.assertEqual(cached.generate_html(), plain.generate_html())
+        for g in (cached, plain):
+            g.update_node(3, label="three")
+            g.add_node(5)
+            g.remove_node(1)
+        self.assertEqual(cached.generate_html(), plain.generate_html())
+
+
+class DiskCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from ..cache import DiskCache
+        self.cache = DiskCache()
+        self.g = Network(cdn_resources="remote")
+        self.g.add_nodes([0, 1])
+        self.g.add_edge(0, 1)
+        self.name = "cached_graph.html"
+
+    def tearDown(self):
+        if os.path.exists(self.name):
+            os.remove(self.name)
+
+    def test_skip_unchanged(self):
+        self.g.write_html(self.name, cache=self.cache)
+        mtime = os.stat(self.name).st_mtime_ns
+        self.g.write_html(self.name, cache=self.cache)
+        self.assertEqual(os.stat(self.name).st_mtime_ns, mtime)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_rewrite_changed(self):
+        self.g.write_html(self.name, cache=self.cache)
+        self.g.toggle_physics(False)
+        self.g.write_html(self.name, cache=self.cache)
+        self.g.nodes[0]["label"] = "changed"
+        self.g.write_html(self.name, cache=self.cache)
+        self.assertEqual(self.cache.stats(), {"hits": 0, "misses": 3})
+        with open(self.name) as f:
+            self.assertTrue('"label": "changed"' in f.read())
+
+    def test_digest(self):
+        from ..cache import read_digest, render_digest
+        self.g.write_html(self.name, cache=self.cache)
+        self.assertEqual(read_digest(self.name), render_digest(self.g))
+        self.g.write_html(self.name)
+        self.assertEqual(read_digest(self.name), None)
+
+
+class AssetStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.g = Network(filter_menu=True)
+        self.g.add_nodes([0, 1])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_assets_next_to_page(self):
+        from ..assets import hashed_name
+        page = os.path.join(self.dir, "out", "graph.html")
+        os.makedirs(os.path.dirname(page))
+        self.g.write_html(page)
+        lib = os.listdir(os.path.join(self.dir, "out", "lib"))
+        self.assertTrue(hashed_name("vis-network.min.js") in lib)
+        with open(page) as f:
+            html = f.read()
+        self.assertTrue('src="lib/%s"' % hashed_name("utils.js") in html)
+
+    def test_legacy_paths_for_custom_templates(self):
+        page = os.path.join(self.dir, "graph.html")
+        self.g.write_html(page)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "lib", "vis-9.1.2")))
+        templates = os.path.join(self.dir, "templates")
+        os.makedirs(templates)
+        with open(os.path.join(templates, "old.html"), "w") as f:
+            f.write('<script src="lib/vis-9.1.2/vis-network.min.js"></script>'
+                    '{{ nodes }}')
+        self.g.set_template_dir(templates, "old.html")
+        self.g.write_html(page)
+        for path in ("vis-9.1.2/vis-network.min.js", "bindings/utils.js",
+                     "tom-select/tom-select.css"):
+            self.assertTrue(os.path.exists(os.path.join(self.dir, "lib", path)))
+
+    def test_shared_store(self):
+        from ..assets import AssetStore, hashed_name
+        self.g.assets = AssetStore(os.path.join(self.dir, "lib"), link=True)
+        page = os.path.join(self.dir, "a", "b", "graph.html")
+        os.makedirs(os.path.dirname(page))
+        self.g.write_html(page)
+        with open(page) as f:
+            html = f.read()
+        self.assertTrue('"../../lib/%s"' % hashed_name("tom-select.css") in html)
+        self.assertEqual(len(os.listdir(os.path.join(self.dir, "lib"))), 6)
+
+    def test_write_bundle(self):
+        from ..export import write_bundle
+        other = Network()
+        other.add_node(0)
+        paths = write_bundle({"one.html": self.g, "sub/two.html": other},
+                             self.dir)
+        self.assertTrue(all(os.path.exists(p) for p in paths))
+        self.assertEqual(len(os.listdir(os.path.join(self.dir, "lib"))), 6)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "sub", "lib")))
+        self.assertTrue(self.g.assets is None)
+
+
+class ExternalDataTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.page = os.path.join(self.tmp.name, "graph.html")
+        self.g = Network(cdn_resources="remote")
+        self.g.add_nodes([0, 1], title=["<b>0</b>", "<b>1</b>"])
+        self.g.add_edge(0, 1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_external(self):
+        self.g.write_html(self.page, data="external")
+        data_dir = os.path.join(self.tmp.name, "data")
+        files = sorted(os.listdir(data_dir))
+        self.assertEqual([f.split(".")[0] for f in files],
+                         ["edges", "nodes", "options"])
+        with open(os.path.join(data_dir, files[1])) as f:
+            self.assertEqual(json.load(f), self.g.nodes)
+        with open(self.page) as f:
+            html = f.read()
+        self.assertTrue("loadGraphData(" in html)
+        self.assertTrue('"data/%s"' % files[1] in html)
+        self.assertFalse("<b>0</b>" in html)
+
+    def test_shared_data_files(self):
+        self.g.write_html(self.page, data="external")
+        self.g.toggle_physics(False)
+        self.g.write_html(os.path.join(self.tmp.name, "other.html"),
+                          data="external")
+        # the nodes and edges are shared, only the options differ
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp.name, "data"))), 4)
+
+    def test_inline_default(self):
+        self.g.write_html(self.page)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "data")))
+        self.assertRaises(AssertionError, self.g.write_html, self.page,
+                          data="remote")
+
+
+class ViewsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.g = Network()
+        self.g.add_nodes(range(5), title=["node %d" % i for i in range(5)])
+        self.g.add_edges([(0, 1), (1, 2), (3, 4)])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_views(self):
+        from ..export import write_views
+        paths = write_views(self.g, {
+            "a.html": {"highlight": [0, 1], "focus": 0},
+            "sub/b.html": {"hidden": [4], "camera": {"scale": 2}},
+        }, self.tmp.name)
+        data = os.listdir(os.path.join(self.tmp.name, "data"))
+        self.assertEqual(len(data), 3)
+        with open(paths[0]) as f:
+            html = f.read()
+        self.assertTrue('applyView({"focus": 0, "highlight": [0, 1]})' in html)
+        self.assertFalse("node 3" in html)
+        with open(paths[1]) as f:
+            html = f.read()
+        self.assertTrue('"../data/nodes.' in html)
+        self.assertTrue('"../lib/utils.' in html)
+
+    def test_unknown_view_key(self):
+        from ..export import write_views
+        self.assertRaises(AssertionError, write_views, self.g,
+                          {"a.html": {"zoom": 2}}, self.tmp.name)
+
+
+class BinaryEncodingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network(cdn_resources="remote")
+        self.g.add_node(0, x=1.5, y=-2.0, level=1)
+        self.g.add_node(1, x=3, y=4, level=2)
+        self.g.add_node(2, level=3)
+        self.g.add_edge(0, 1, width=2)
+
+    def test_pack_columns(self):
+        import struct
+        from ..payload import NUMERIC_COLUMNS, pack_columns
+        items, columns = pack_columns(self.g.nodes, NUMERIC_COLUMNS["nodes"])
+        self.assertEqual(sorted(columns), ["level", "x", "y"])
+        self.assertEqual(columns["level"],
+                         ("int32", struct.pack("<3i", 1, 2, 3)))
+        dtype, data = columns["x"]
+        self.assertEqual(dtype, "float32")
+        x = struct.unpack("<3f", data)
+        self.assertEqual(x[:2], (1.5, 3.0))
+        self.assertTrue(x[2] != x[2])
+        self.assertFalse("x" in items[0])
+        self.assertEqual(items[0]["label"], 0)
+        # the network itself is left alone
+        self.assertEqual(self.g.nodes[0]["x"], 1.5)
+
+    def test_inline_binary(self):
+        html = self.g.generate_html(encoding="binary")
+        self.assertTrue("zipColumns(" in html)
+        self.assertFalse('"x": 1.5' in html)
+        self.assertTrue('"x": 1.5' in self.g.generate_html())
+
+    def test_external_binary(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            page = os.path.join(tmp, "graph.html")
+            self.g.write_html(page, data="external", encoding="binary")
+            files = os.listdir(os.path.join(tmp, "data"))
+            self.assertTrue(any(f.startswith("x.") and f.endswith(".bin")
+                                for f in files))
+            self.assertTrue(any(f.startswith("width.") for f in files))
+            with open(page) as f:
+                self.assertTrue('"columns": {"edges": {"width": {"dtype": "int32"' in f.read())
+
+
+class ProgressiveLoadingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network(cdn_resources="remote")
+        self.g.add_nodes(range(5))
+        self.g.add_edges([(4, 3), (4, 2), (4, 1), (3, 2), (0, 1)])
+
+    def test_progressive_order(self):
+        from ..payload import progressive_order
+        nodes, edges = progressive_order(self.g.nodes, self.g.edges)
+        self.assertEqual([n["id"] for n in nodes], [4, 1, 2, 3, 0])
+        position = {n["id"]: i for i, n in enumerate(nodes)}
+        later = [max(position[e["from"]], position[e["to"]]) for e in edges]
+        self.assertEqual(later, sorted(later))
+        # the network keeps its own order
+        self.assertEqual(self.g.get_nodes(), [0, 1, 2, 3, 4])
+
+    def test_progressive_html(self):
+        self.assertFalse("var chunks = splitChunks(" in self.g.generate_html())
+        self.assertFalse('id="loadingBar"' in self.g.generate_html())
+        self.g.set_progressive_loading(first=2, chunk=1)
+        html = self.g.generate_html()
+        self.assertTrue("splitChunks(nodeItems, edgeItems, 2, 1)" in html)
+        self.assertTrue("addChunks(chunks)" in html)
+        self.assertTrue('id="loadingBar"' in html)
+        self.assertTrue(html.index('"id": 4') < html.index('"id": 0'))
+
+    def test_loading_bar_driven_by_chunks(self):
+        self.g.render_cache = True
+        self.g.add_nodes(range(5, 150))
+        html = self.g.generate_html()
+        self.assertTrue('network.on("stabilizationProgress"' in html)
+        self.g.set_progressive_loading(first=2, chunk=1)
+        html = self.g.generate_html()
+        self.assertFalse('network.on("stabilizationProgress"' in html)
+        self.assertTrue("addChunks(chunks)" in html)
+
+    def test_dot_is_not_progressive(self):
+        self.g.set_progressive_loading(first=2, chunk=1)
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.dot")
+            with open(path, "w") as f:
+                f.write("digraph { a -> b; b -> c }")
+            self.g.from_DOT(path)
+        html = self.g.generate_html()
+        self.assertFalse("addChunks(chunks);" in html)
+        self.assertFalse('id="loadingBar"' in html)
+        self.assertRaises(AssertionError, self.g.set_progressive_loading)
+
+
+class WorkerDecodingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network(cdn_resources="remote")
+        self.g.add_nodes([0, 1], title=["<b>0</b>", "it's"])
+        self.g.add_edge(0, 1)
+
+    def test_inline_payload(self):
+        self.g.worker_decoding = True
+        html = self.g.generate_html()
+        start = html.index('<script type="application/json" id="graphPayload">')
+        end = html.index("</script>", start)
+        payload = json.loads(html[html.index(">", start) + 1:end])
+        self.assertEqual(payload["nodes"], self.g.nodes)
+        self.assertTrue("nodeColors = graphData.nodeColors" in html)
+        self.assertTrue('text: document.getElementById("graphPayload")' in html)
+
+    def test_external_files(self):
+        import tempfile
+        self.g.worker_decoding = True
+        with tempfile.TemporaryDirectory() as tmp:
+            page = os.path.join(tmp, "graph.html")
+            self.g.write_html(page, data="external")
+            with open(page) as f:
+                html = f.read()
+        self.assertTrue("files: absoluteUrls(" in html)
+        self.assertFalse('id="graphPayload"' in html)
+
+    def test_disabled_by_default(self):
+        html = self.g.generate_html()
+        self.assertFalse('id="graphPayload"' in html)
+        self.assertFalse("decodeInWorker({" in html)
+
+
+class WebGLBackendTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network(cdn_resources="remote")
+        self.g.add_nodes([0, 1, 2], x=[0, 10, 20], y=[5, -5, 0])
+        self.g.add_edge(0, 1)
+
+    def test_webgl_page(self):
+        html = self.g.generate_html(backend="webgl")
+        self.assertTrue("network = drawWebGL(container, nodeItems, edgeItems" in html)
+        self.assertFalse("network = new vis.Network(container, data, options)" in html)
+
+    def test_needs_positions(self):
+        self.g.add_node(3)
+        self.assertRaises(AssertionError, self.g.generate_html, backend="webgl")
+        self.assertRaises(AssertionError, self.g.generate_html, backend="canvas")
+
+    def test_local_assets(self):
+        import tempfile
+        from ..assets import hashed_name
+        self.g.cdn_resources = "local"
+        with tempfile.TemporaryDirectory() as tmp:
+            page = os.path.join(tmp, "graph.html")
+            self.g.write_html(page, backend="webgl", encoding="binary")
+            with open(page) as f:
+                html = f.read()
+            self.assertTrue(os.path.exists(os.path.join(tmp, "lib", hashed_name("webgl.js"))))
+        self.assertTrue('src="lib/%s"' % hashed_name("webgl.js") in html)
+        self.assertTrue("zipColumns(" in html)
+
+
+class TilesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network(cdn_resources="remote")
+        ids = list(range(40))
+        self.g.add_nodes(ids, x=[i % 8 for i in ids], y=[i // 8 for i in ids],
+                         color=["red"] * 40)
+        for i in range(39):
+            self.g.add_edge(i, i + 1)
+
+    def test_quadtree(self):
+        from ..tiles import build_tiles
+        manifest, tiles = build_tiles(self.g.nodes, self.g.edges,
+                                      max_nodes=10, resolution=2)
+        self.assertEqual(manifest["bounds"], [0, 0, 7])
+        self.assertFalse(manifest["tiles"]["0/0/0"]["leaf"])
+        leaves = [k for k, t in manifest["tiles"].items() if t["leaf"]]
+        self.assertEqual(sum(len(tiles[k]["nodes"]) for k in leaves), 40)
+        self.assertTrue(all(len(tiles[k]["nodes"]) <= 10 for k in leaves))
+        # every edge reaches the tiles of both its ends
+        edges = set(e["id"] for k in leaves for e in tiles[k]["edges"])
+        self.assertEqual(edges, set(range(39)))
+        # the root is merged into at most 2 x 2 cells
+        root = tiles["0/0/0"]
+        self.assertTrue(len(root["nodes"]) <= 4)
+        self.assertEqual(sum(n["count"] for n in root["nodes"]), 40)
+        self.assertEqual(root["nodes"][0]["color"], "red")
+        self.assertTrue(root["edges"])
+
+    def test_write_tiles(self):
+        import tempfile
+        self.g.set_tiling(max_nodes=10)
+        with tempfile.TemporaryDirectory() as tmp:
+            page = os.path.join(tmp, "graph.html")
+            self.g.write_html(page, backend="webgl", data="tiles")
+            with open(page) as f:
+                html = f.read()
+            files = os.listdir(os.path.join(tmp, "data"))
+            manifest = [f for f in files if f.startswith("tiles.")]
+            with open(os.path.join(tmp, "data", manifest[0])) as f:
+                tiles = json.load(f)["tiles"]
+        self.assertEqual(len(files), len(tiles) + 1)
+        self.assertTrue(all(t["url"] in files for t in tiles.values()))
+        self.assertTrue('drawTiles(document.getElementById(\'mynetwork\'), "data/tiles.' in html)
+
+    def test_needs_webgl(self):
+        self.assertRaises(AssertionError, self.g.write_html, "graph.html", data="tiles")
+
+
+class ExpansionServerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network()
+        self.g.add_nodes(range(6))
+        for a, b in [(0, 1), (0, 2), (0, 3), (3, 4), (4, 5)]:
+            self.g.add_edge(a, b)
+        self.server = self.g.serve(port=0, hops=1, block=False)
+
+    def tearDown(self):
+        self.server.shutdown()
+
+    def fetch(self, path, body=None):
+        from urllib.request import urlopen
+        if body is not None:
+            body = json.dumps(body).encode("utf-8")
+        with urlopen(self.server.url + path, body) as response:
+            return response.read().decode("utf-8")
+
+    def test_seed_page(self):
+        html = self.fetch("")
+        self.assertTrue('expandNode(params.nodes[0], {"hops": 1, "limit": 500, "url": "expand"})' in html)
+        # the best connected node and its neighbours, nothing beyond
+        self.assertEqual(sorted(n["id"] for n in self.server.expand(self.server.seeds)["nodes"]),
+                         [0, 1, 2, 3])
+        self.assertFalse('"id": 4' in html)
+        start = html.index('src="lib/') + len('src="')
+        self.fetch(html[start:html.index('"', start)])
+
+    def test_expand(self):
+        data = json.loads(self.fetch("expand?node=4&hops=1&limit=10"))
+        self.assertEqual([n["id"] for n in data["nodes"]], [4, 3, 5])
+        # the edge from 3 to 0 only comes along once the page holds 0
+        self.assertEqual(sorted(e["id"] for e in data["edges"]),
+                         ["pyvis:e3", "pyvis:e4"])
+        data = json.loads(self.fetch("expand?node=4&hops=1&limit=10",
+                                     {"known": [0, 1, 42]}))
+        self.assertEqual(sorted(e["id"] for e in data["edges"]),
+                         ["pyvis:e2", "pyvis:e3", "pyvis:e4"])
+        data = json.loads(self.fetch("expand?node=0&hops=2&limit=2"))
+        self.assertEqual(len(data["nodes"]), 2)
+        self.assertEqual(len(data["edges"]), 1)
+
+    def test_neighborhood_stops_at_limit(self):
+        from ..algorithms import neighborhood
+
+        class Index(object):
+            # the neighbours of 1 are never needed with a limit of 3
+            neighbors = {0: [1, 2, 3, 4]}
+
+        self.assertEqual(neighborhood(Index(), [0], hops=2, limit=3), [0, 1, 2])
+
+    def test_follows_changes(self):
+        self.fetch("")
+        self.g.add_node(6)
+        self.g.add_edge(5, 6)
+        data = json.loads(self.fetch("expand?node=5&hops=1&limit=10"))
+        self.assertEqual([n["id"] for n in data["nodes"]], [5, 4, 6])
+        self.assertEqual(self.server.version, self.g.version)
+
+    def test_edge_ids_survive_removals(self):
+        self.fetch("expand?node=4&hops=1&limit=10")
+        self.g.remove_edge(0, 1)
+        data = json.loads(self.fetch("expand?node=4&hops=1&limit=10"))
+        self.assertEqual(sorted(e["id"] for e in data["edges"]),
+                         ["pyvis:e3", "pyvis:e4"])
+        # an edge added later gets a new id, never one of a removed edge
+        self.g.add_edge(5, 0)
+        data = json.loads(self.fetch("expand?node=5&hops=1&limit=10"))
+        self.assertTrue("pyvis:e5" in [e["id"] for e in data["edges"]])
+
+    def test_concurrent_changes(self):
+        import sys
+        import threading
+        self.g.add_nodes(range(6, 200))
+        self.g.add_edges([(i, i + 1) for i in range(5, 199)])
+        live = self.g.serve_live(port=0, interval=0.01)
+        errors = []
+
+        def change():
+            for i in range(2000):
+                self.g.add_edge(1, 100 + i % 50)
+                self.g.remove_edge(1, 100 + i % 50)
+
+        def expand():
+            try:
+                for _ in range(2000):
+                    self.server.expand_node(1, hops=3)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=change), threading.Thread(target=expand)]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+            live.shutdown()
+        self.assertEqual(errors, [])
+
+    def test_unknown_node(self):
+        from urllib.error import HTTPError
+        self.assertRaises(HTTPError, self.fetch, "expand?node=42")
+
+
+class LiveServerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network()
+        self.g.add_nodes([0, 1, 2])
+        self.g.add_edge(0, 1)
+        self.server = self.g.serve_live(port=0, interval=0.01)
+
+    def tearDown(self):
+        self.server.shutdown()
+
+    def test_edge_ids(self):
+        self.assertEqual(self.g.edges[0]["id"], "pyvis:e0")
+        self.g.add_edge(1, 2)
+        self.assertEqual(self.g.edges[1]["id"], "pyvis:e1")
+
+    def test_coalesced_batch(self):
+        self.server.flush()
+        since = self.server.seq
+        self.g.add_node(3)
+        for size in range(1, 50):
+            self.g.update_node(3, size=size)
+        self.g.add_edge(2, 3)
+        self.g.update_edge(3, 2, width=3)
+        self.g.remove_node(0)
+        self.server.flush()
+        batches = self.server.events(since, timeout=0)
+        self.assertEqual(len(batches), 1)
+        batch = json.loads(batches[0][1])
+        self.assertEqual([n["size"] for n in batch["nodes"]["update"]], [49])
+        self.assertEqual(batch["nodes"]["remove"], [0])
+        self.assertEqual(batch["edges"]["update"][0]["width"], 3)
+        self.assertEqual(batch["edges"]["remove"], ["pyvis:e0"])
+
+    def test_missed_batches_replace(self):
+        self.server.batches.clear()
+        self.g.remove_edge(1, 0)
+        self.server.flush()
+        batch = json.loads(self.server.events(-5, timeout=0)[0][1])
+        self.assertEqual(batch["replace"]["edges"], [])
+        self.assertEqual(len(batch["replace"]["nodes"]), 3)
+
+    def test_stream(self):
+        from urllib.request import urlopen
+        html = urlopen(self.server.url).read().decode("utf-8")
+        self.assertTrue('followLive({"since": ' in html)
+        since = self.server.seq
+        with urlopen(self.server.url + "events?since=%d" % since) as stream:
+            self.g.update_node(1, color="red")
+            lines = [stream.readline(), stream.readline()]
+        self.assertEqual(lines[0].decode("utf-8"), "id: %d\n" % (since + 1))
+        self.assertTrue('"color": "red"' in lines[1].decode("utf-8"))
+
+    def test_detached(self):
+        self.server.shutdown()
+        self.assertTrue(self.g.live is None)
+        self.g.add_node(4)
+
+    def test_reads_during_changes(self):
+        import threading
+        errors = []
+        done = threading.Event()
+
+        def read():
+            while not done.is_set():
+                try:
+                    json.dumps(self.server.snapshot())
+                    self.server.page()
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        for i in range(3, 300):
+            self.g.add_node(i)
+            self.g.add_edge(i - 1, i)
+            self.g.update_node(i - 1, **{"p%d" % i: i})
+        done.set()
+        reader.join()
+        self.assertEqual(errors, [])
+
+    def test_flush_errors_are_logged(self):
+        import time
+        from ..live import log
+        flush = self.server.flush
+        calls = []
+
+        def failing():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ValueError("broken batch")
+            flush()
+
+        self.server.flush = failing
+        since = self.server.seq
+        with self.assertLogs(log, "ERROR"):
+            self.g.update_node(1, color="red")
+            while len(calls) < 2:
+                time.sleep(0.01)
+        self.g.update_node(2, color="blue")
+        self.assertTrue(self.server.events(since, timeout=5))
+
+
+class EdgeIndexTestCase(unittest.TestCase):
+
+    def test_matches_scan(self):
+        import random
+        from ..edge import EdgeIndex
+        rng = random.Random(0)
+        for directed in (False, True):
+            edges = []
+            index = EdgeIndex(edges, directed, rebuild_after=7)
+            for _ in range(2000):
+                a, b = rng.randrange(6), rng.randrange(6)
+                if rng.random() < 0.6:
+                    edges.append({"from": a, "to": b})
+                    index.append(edges[-1])
+                    continue
+                expected = next(
+                    (k for k, e in enumerate(edges)
+                     if (e["from"], e["to"]) == (a, b) or
+                     (not directed and (e["from"], e["to"]) == (b, a))), None)
+                self.assertEqual(index.find(a, b), expected)
+                if expected is not None:
+                    del edges[expected]
+                    index.remove(a, b)
+                self.assertEqual(len(index), len(edges))
+
+    def test_network_edges_changed_directly(self):
+        g = Network()
+        g.add_nodes([0, 1, 2])
+        g.add_edge(0, 1)
+        g.edges.insert(0, {"from": 1, "to": 2})
+        g.update_edge(2, 1, width=5)
+        self.assertEqual(g.edges[0]["width"], 5)
+        g.remove_edge(1, 0)
+        self.assertEqual(g.num_edges(), 1)
+
+
+class NotebookDisplayTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Network(cdn_resources="remote")
+        self.g.add_nodes([0, 1, 2])
+        self.g.add_edge(0, 1)
+
+    def test_srcdoc_frame(self):
+        import html
+        frame = self.g.display().data
+        self.assertTrue(frame.startswith('<div><iframe id="pyvis-'))
+        start = frame.index('srcdoc="') + len('srcdoc="')
+        page = html.unescape(frame[start:frame.index('"', start)])
+        self.assertTrue("new vis.Network(" in page)
+        self.assertTrue('"id": "pyvis:e0"' in page)
+        self.assertFalse(os.path.exists("index.html"))
+
+    def test_local_resources_inlined(self):
+        self.g.cdn_resources = "local"
+        frame = self.g.display().data
+        self.assertFalse("lib/vis-network.min" in frame)
+        self.assertEqual(self.g.cdn_resources, "local")
+
+    def test_diff(self):
+        view = self.g.display()
+        self.g.update_node(0, color="red")
+        self.g.remove_node(2)
+        self.g.add_node(3)
+        self.g.add_edge(1, 3)
+        self.g.toggle_physics(False)
+        batch = self.g.notebook_view.diff()
+        self.assertEqual(sorted(n["id"] for n in batch["nodes"]["update"]), [0, 3])
+        self.assertEqual(batch["nodes"]["remove"], [2])
+        self.assertEqual([e["id"] for e in batch["edges"]["update"]], ["pyvis:e1"])
+        self.assertFalse(batch["options"]["physics"]["enabled"])
+        self.assertEqual(self.g.notebook_view.diff(), {})
+
+    def test_user_edge_ids_kept_apart(self):
+        self.g.add_edge(1, 2, id="e0")
+        self.g.display()
+        self.assertEqual([e["id"] for e in self.g.edges], ["pyvis:e0", "e0"])
+        self.g.update_edge(0, 1, width=2)
+        self.g.remove_edge(1, 2)
+        batch = self.g.notebook_view.diff()
+        self.assertEqual([e["id"] for e in batch["edges"]["update"]], ["pyvis:e0"])
+        self.assertEqual(batch["edges"]["remove"], ["e0"])
+
+    def test_changes_script(self):
+        self.g.display()
+        self.g.update_node(1, label="one")
+        script = self.g.display().data
+        self.assertTrue("page.applyLiveBatch(batch)" in script)
+        self.assertTrue('"label": "one"' in script)
+        self.assertTrue(self.g.notebook_view.id in script)
+        self.assertTrue(self.g.display(update=False).data.startswith("<div><iframe"))
+
+
+class MultiNetworkPageTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.nets = []
+        for k in range(3):
+            net = Network(height="200px", width="300px", heading="graph %d" % k)
+            net.add_nodes([0, 1])
+            net.add_edge(0, 1)
+            self.nets.append(net)
+
+    def test_single_library_load(self):
+        from ..export import generate_page
+        html = generate_page(self.nets, cdn_resources="in_line")
+        self.assertEqual(html.count(" * https://visjs.github.io/vis-network/"), 1)
+        self.assertEqual(html.count("function drawWhenVisible("), 1)
+        self.assertEqual(html.count('class="pyvis-graph"'), 3)
+        self.assertFalse("var network;" in html)
+        start = html.index('<script type="application/json" id="pyvis-graph-2-data">')
+        end = html.index("</script>", start)
+        data = json.loads(html[html.index(">", start) + 1:end])
+        self.assertEqual(data["nodes"], self.nets[2].nodes)
+        self.assertTrue("<h3>graph 2</h3>" in html)
+
+    def test_write_local(self):
+        import tempfile
+        from ..assets import hashed_name
+        from ..export import write_page
+        with tempfile.TemporaryDirectory() as tmp:
+            page = write_page(self.nets, os.path.join(tmp, "dashboard.html"),
+                              cdn_resources="local")
+            with open(page) as f:
+                html = f.read()
+            self.assertTrue(os.path.exists(os.path.join(tmp, "lib", hashed_name("vis-network.min.js"))))
+        self.assertEqual(html.count('src="lib/%s"' % hashed_name("vis-network.min.js")), 1)
+
+
+def _batch_factory(n):
+    net = Network(cdn_resources="remote")
+    net.add_nodes(range(n))
+    return net
+
+
+def _failing_factory():
+    raise ValueError("broken network")
+
+
+def _crashing_factory():
+    os._exit(1)
+
+
+class RenderManyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_pickle_round_trip(self):
+        import pickle
+        from ..network import _shared_environment
+        net = _batch_factory(3)
+        net.prep_notebook()
+        net.render_cache = True
+        html = net.generate_html()
+        copy = pickle.loads(pickle.dumps(net))
+        self.assertEqual(copy.nodes, net.nodes)
+        self.assertTrue(copy.templateEnv is _shared_environment(net.template_dir))
+        self.assertTrue(copy.template is not None)
+        self.assertEqual(copy.generate_html(), html)
+
+    def test_process_pool(self):
+        from functools import partial
+        from .. import render_many
+        networks = {"a/%d.html" % n: partial(_batch_factory, n) for n in range(1, 6)}
+        networks["net.html"] = _batch_factory(2)
+        networks["broken.html"] = _failing_factory
+        networks["lambda.html"] = lambda: _batch_factory(1)
+        stats = render_many(networks, self.tmp.name, workers=2, chunksize=2)
+        self.assertEqual(stats["rendered"], 6)
+        self.assertEqual(stats["failed"], 2)
+        self.assertTrue("broken network" in stats["errors"]["broken.html"])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "a", "5.html")))
+        self.assertTrue(stats["per_second"] > 0)
+
+    def test_worker_crash(self):
+        from functools import partial
+        from .. import render_many
+        networks = {"%d.html" % n: partial(_batch_factory, n) for n in range(1, 8)}
+        networks["crash.html"] = _crashing_factory
+        stats = render_many(networks, self.tmp.name, workers=2, chunksize=2)
+        self.assertEqual((stats["rendered"], stats["failed"]), (7, 1))
+        self.assertTrue("worker process died" in stats["errors"]["crash.html"])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "7.html")))
+
+    def test_in_process(self):
+        from .. import render_many
+        stats = render_many([_batch_factory(2), _failing_factory],
+                            self.tmp.name, workers=1)
+        self.assertEqual((stats["rendered"], stats["failed"]), (1, 1))
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["0.html"])
+
+    def test_rate_counts_rendered_pages(self):
+        from .. import render_many
+        stats = render_many([_failing_factory] * 3, self.tmp.name, workers=1)
+        self.assertEqual(stats["per_second"], 0.0)
+        self.assertTrue(stats["items_per_second"] > 0)
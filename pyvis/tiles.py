@@ -0,0 +1,158 @@
+# splitting laid out networks into viewport tiles
+import math
+from collections import Counter, defaultdict
+
+
+def tile_key(z, x, y):
+    return "%d/%d/%d" % (z, x, y)
+
+
+def build_tiles(nodes, edges, max_nodes=5000, resolution=32, max_depth=12):
+    """
+    Quadtree over the x and y positions of `nodes`. The square around the
+    layout is tile "0/0/0", and every tile holding more than `max_nodes`
+    nodes is split into four children one level deeper, so dense regions
+    get small tiles and sparse ones stay large.
+
+    Leaf tiles carry their nodes in full detail along with every edge
+    touching them, edges between two tiles being part of both. The tiles
+    that were split carry an aggregate instead: their nodes merged into at
+    most `resolution` x `resolution` cells, each drawn as one node sized
+    by the number of nodes it stands for, and the edges inside the tile
+    merged between those cells.
+
+    :param nodes: nodes with numeric x and y
+    :param edges: edges between the nodes, given an "id" when they have none
+    :param max_nodes: largest number of nodes of a leaf tile
+    :param resolution: cells per side of the aggregate of a split tile,
+                       a power of two
+    :param max_depth: deepest level, which stays a leaf even with more than
+                      `max_nodes` nodes, e.g. when they share one position
+
+    :type max_nodes: int
+    :type resolution: int
+    :type max_depth: int
+
+    :returns: (manifest, tiles) where the manifest holds the bounds
+              [x, y, side] of the root tile, the resolution and, per tile
+              key "z/x/y", whether it is a leaf and its number of nodes;
+              tiles maps the keys to dicts with the nodes and edges
+    """
+    assert max_nodes > 0
+    assert resolution > 0 and resolution & (resolution - 1) == 0, \
+        "resolution has to be a power of two"
+    bits = resolution.bit_length() - 1
+    depth = max_depth + bits
+    if nodes:
+        xs = [n["x"] for n in nodes]
+        ys = [n["y"] for n in nodes]
+        min_x, min_y = min(xs), min(ys)
+        side = max(max(xs) - min_x, max(ys) - min_y) or 1.0
+    else:
+        min_x, min_y, side = 0.0, 0.0, 1.0
+    # integer coordinates at the finest level, the tile holding a node at
+    # level z being the coordinates shifted by depth - z
+    last = (1 << depth) - 1
+    scale = (1 << depth) / float(side)
+    cells = [(min(int((n["x"] - min_x) * scale), last),
+              min(int((n["y"] - min_y) * scale), last)) for n in nodes]
+    position = {n["id"]: i for i, n in enumerate(nodes)}
+
+    manifest = {"bounds": [min_x, min_y, side], "resolution": resolution,
+                "tiles": {}}
+    tiles = {}
+    # leaf tile of every node, and the split tiles as (z, x, y)
+    leaf_of = [None] * len(nodes)
+    split = {}
+    stack = [(0, 0, 0, list(range(len(nodes))))]
+    while stack:
+        z, x, y, members = stack.pop()
+        key = tile_key(z, x, y)
+        leaf = len(members) <= max_nodes or z == max_depth
+        manifest["tiles"][key] = {"leaf": leaf, "count": len(members)}
+        if leaf:
+            tiles[key] = {"nodes": [nodes[i] for i in members], "edges": []}
+            for i in members:
+                leaf_of[i] = key
+            continue
+        split[(z, x, y)] = members
+        shift = depth - z - 1
+        children = defaultdict(list)
+        for i in members:
+            cx, cy = cells[i]
+            children[(cx >> shift, cy >> shift)].append(i)
+        for (cx, cy), child in children.items():
+            stack.append((z + 1, cx, cy, child))
+
+    weights = defaultdict(Counter)
+    for e, edge in enumerate(edges):
+        if "id" not in edge:
+            edge = dict(edge, id=e)
+        a = position.get(edge["from"])
+        b = position.get(edge["to"])
+        if a is None or b is None:
+            for i in (a, b):
+                if i is not None:
+                    tiles[leaf_of[i]]["edges"].append(edge)
+            continue
+        tiles[leaf_of[a]]["edges"].append(edge)
+        if leaf_of[b] != leaf_of[a]:
+            tiles[leaf_of[b]]["edges"].append(edge)
+        # the split tiles holding both ends, merged between their cells
+        (ax, ay), (bx, by) = cells[a], cells[b]
+        for z in range(max_depth):
+            shift = depth - z
+            tile = (z, ax >> shift, ay >> shift)
+            if tile not in split or tile[1:] != (bx >> shift, by >> shift):
+                break
+            shift -= bits
+            ca = (ax >> shift, ay >> shift)
+            cb = (bx >> shift, by >> shift)
+            if ca != cb:
+                weights[tile][(ca, cb) if ca < cb else (cb, ca)] += 1
+
+    for (z, x, y), members in split.items():
+        key = tile_key(z, x, y)
+        tiles[key] = {
+            "nodes": _merge_nodes(nodes, members, cells, depth - z - bits, key),
+            "edges": [{"id": "%s-%s" % (_cell_id(key, ca), _cell_id(key, cb)),
+                       "from": _cell_id(key, ca), "to": _cell_id(key, cb),
+                       "value": count}
+                      for (ca, cb), count in sorted(weights[(z, x, y)].items())]}
+    return manifest, tiles
+
+
+def _cell_id(key, cell):
+    return "%s#%d,%d" % (key, cell[0], cell[1])
+
+
+def _merge_nodes(nodes, members, cells, shift, key):
+    """
+    The nodes `members` of the split tile `key` merged per cell of the
+    finest level shifted by `shift`.
+    """
+    groups = defaultdict(list)
+    for i in members:
+        cx, cy = cells[i]
+        groups[(cx >> shift, cy >> shift)].append(i)
+    merged = []
+    for cell, group in sorted(groups.items()):
+        x = y = 0.0
+        colors = Counter()
+        for i in group:
+            node = nodes[i]
+            x += node["x"]
+            y += node["y"]
+            color = node.get("color")
+            if isinstance(color, str):
+                colors[color] += 1
+        node = {"id": _cell_id(key, cell),
+                "x": x / len(group),
+                "y": y / len(group),
+                "size": 10 * math.sqrt(len(group)),
+                "title": "%d nodes" % len(group),
+                "count": len(group)}
+        if colors:
+            node["color"] = colors.most_common(1)[0][0]
+        merged.append(node)
+    return merged